@@ -0,0 +1,6 @@
+"""
+Benchmarks for the fields provided by ormar-postgres-extensions
+
+Run with `python -m benchmarks run` (or `invoke benchmark`). Results are written
+as JSON so that two runs can be compared with `python -m benchmarks compare`.
+"""
@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import sys
+from typing import (
+    List,
+    Optional,
+)
+
+from . import database
+from .database import (
+    create_database,
+    drop_database,
+)
+from .models import CASES
+from .runner import (
+    compare,
+    write_results,
+)
+from .suites import (
+    run_e2e,
+    run_hstore_codec,
+    run_inet_decode,
+    run_jsonb_codec,
+    run_micro,
+)
+
+DEFAULT_ROWS = "100,1000,10000"
+
+
+def run(args: argparse.Namespace) -> int:
+    cases = [case for case in CASES if not args.field or case.name in args.field]
+    database.USE_JSONB_CODEC = args.jsonb_codec
+    database.USE_INET_CODEC = args.inet_codec
+    results = run_micro(cases, repeat=args.repeat)
+    if any(case.name == "jsonb" for case in cases):
+        results.extend(run_jsonb_codec(repeat=args.repeat))
+        results.extend(run_hstore_codec(repeat=args.repeat))
+    if any(case.name.startswith("inet") for case in cases):
+        results.extend(run_inet_decode(repeat=args.repeat))
+
+    if not args.skip_db:
+        row_counts = [int(rows) for rows in args.rows.split(",")]
+        create_database()
+        try:
+            results.extend(asyncio.run(run_e2e(cases, row_counts, repeat=args.repeat)))
+        finally:
+            drop_database()
+
+    for result in results:
+        if result.memory is not None:
+            print(f"{result.label():<60} {result.memory:>14.2f} B/row")
+        else:
+            print(f"{result.label():<60} {result.median * 1e6:>14.2f} us")
+    write_results(args.output, results)
+    print(f"\nWrote {len(results)} results to {args.output}")
+    return 0
+
+
+def compare_results(args: argparse.Namespace) -> int:
+    regressions = compare(args.baseline, args.current, args.threshold)
+    for previous, current, change in regressions:
+        if current.memory is not None:
+            print(
+                f"{current.label():<60} {previous.memory:>12.2f} B/row -> "
+                f"{current.memory:>12.2f} B/row (+{change:.0%})"
+            )
+            continue
+        print(
+            f"{current.label():<60} {previous.median * 1e6:>12.2f} us -> "
+            f"{current.median * 1e6:>12.2f} us (+{change:.0%})"
+        )
+    if regressions:
+        print(
+            f"\n{len(regressions)} benchmark(s) regressed by more than "
+            f"{args.threshold:.0%}"
+        )
+        return 1
+    print("No regressions found")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument(
+        "-o", "--output", default="benchmark.json", help="JSON file to write"
+    )
+    run_parser.add_argument(
+        "--field",
+        action="append",
+        help="Only benchmark the given field (can be repeated)",
+    )
+    run_parser.add_argument(
+        "--rows",
+        default=DEFAULT_ROWS,
+        help="Comma separated table sizes for the database benchmarks",
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of timed repeats"
+    )
+    run_parser.add_argument(
+        "--skip-db",
+        action="store_true",
+        help="Only run the benchmarks that don't need a database",
+    )
+    run_parser.add_argument(
+        "--jsonb-codec",
+        action="store_true",
+        help="Decode JSONB with the connection codec in the database benchmarks",
+    )
+    run_parser.add_argument(
+        "--inet-codec",
+        action="store_true",
+        help="Keep inet/cidr values in binary with the connection codec in the "
+        "database benchmarks",
+    )
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two result files and report regressions"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown of the median before reporting, 0.1 is 10%%",
+    )
+    compare_parser.set_defaults(func=compare_results)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+import uuid
+from dataclasses import (
+    dataclass,
+    field,
+)
+from ipaddress import (
+    IPv4Address,
+    IPv4Interface,
+    ip_address,
+    ip_interface,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+    Type,
+)
+
+import ormar
+import sqlalchemy
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields import array as array_field
+from ormar_postgres_extensions.fields import inet as inet_field
+from ormar_postgres_extensions.fields import jsonb as jsonb_field
+from ormar_postgres_extensions.fields import macaddr as macaddr_field
+from ormar_postgres_extensions.fields import range as range_field
+from ormar_postgres_extensions.fields import tsvector as tsvector_field
+
+from .database import (
+    database,
+    metadata,
+)
+
+
+class ArrayBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String())
+
+
+class JSONBBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.JSONB()
+
+
+class InetBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: IPv4Address = ormar_pg_ext.INET()
+
+
+# The same column loaded as lazy and compact wrappers instead of ipaddress objects
+class LazyInetBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: ormar_pg_ext.LazyIPAddress = ormar_pg_ext.INET(ip_decode="lazy")
+
+
+class CompactInetBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: ormar_pg_ext.CompactIPAddress = ormar_pg_ext.INET(ip_decode="compact")
+
+
+class CidrBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: IPv4Interface = ormar_pg_ext.CIDR()
+
+
+class MacaddrBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: str = ormar_pg_ext.MACADDR()
+
+
+class Macaddr8BenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: str = ormar_pg_ext.MACADDR8()
+
+
+class RangeBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: ormar_pg_ext.Range = ormar_pg_ext.INT4RANGE()
+
+
+class MultirangeBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: list = ormar_pg_ext.INT4MULTIRANGE()
+
+
+class TSVectorBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: str = ormar_pg_ext.TSVECTOR(index="gin")
+
+
+class UUIDBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: uuid.UUID = ormar_pg_ext.UUID()
+
+
+# Wide rows with several UUID columns, e.g. a row with a few foreign keys, stored
+# with the default uuid format and with the native one
+class WideUUIDBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: uuid.UUID = ormar_pg_ext.UUID()
+    first: uuid.UUID = ormar_pg_ext.UUID(default=uuid.uuid4)
+    second: uuid.UUID = ormar_pg_ext.UUID(default=uuid.uuid4)
+    third: uuid.UUID = ormar_pg_ext.UUID(default=uuid.uuid4)
+    fourth: uuid.UUID = ormar_pg_ext.UUID(default=uuid.uuid4)
+
+
+class NativeWideUUIDBenchmarkModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: uuid.UUID = ormar_pg_ext.UUID(uuid_format="native")
+    first: uuid.UUID = ormar_pg_ext.UUID(default=uuid.uuid4, uuid_format="native")
+    second: uuid.UUID = ormar_pg_ext.UUID(default=uuid.uuid4, uuid_format="native")
+    third: uuid.UUID = ormar_pg_ext.UUID(default=uuid.uuid4, uuid_format="native")
+    fourth: uuid.UUID = ormar_pg_ext.UUID(default=uuid.uuid4, uuid_format="native")
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    Everything needed to benchmark one of the extension fields
+
+    `filter_values` must provide a value for every operator in the field module's
+    FIELD_ACCESSOR_MAP so that newly added operators can't be skipped silently.
+    """
+
+    name: str
+    model: Type[ormar.Model]
+    make_value: Callable[[int], Any]
+    filter_values: Dict[str, Any]
+    field_accessor_map: List[Tuple[str, Callable]] = field(default_factory=list)
+
+    def operators(self) -> List[Tuple[str, Any]]:
+        missing = [
+            name
+            for name, _ in self.field_accessor_map
+            if name not in self.filter_values
+        ]
+        if missing:
+            raise ValueError(
+                f"No benchmark filter value for {self.name} operators: {missing}"
+            )
+        return list(self.filter_values.items())
+
+
+def _ipv4(i: int) -> str:
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+CASES = [
+    BenchmarkCase(
+        name="array",
+        model=ArrayBenchmarkModel,
+        make_value=lambda i: [f"tag-{i % 10}", f"tag-{i % 7}", f"item-{i}"],
+        field_accessor_map=array_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": ["tag-1", "tag-1", "item-1"],
+            "array_contains": ["tag-1"],
+            "array_contained_by": ["tag-1", "tag-2", "tag-3"],
+            "array_overlap": ["tag-1", "tag-2"],
+            "array_any": "tag-1",
+            "array_cardinality": 3,
+            "array_cardinality_gt": 2,
+            "array_cardinality_gte": 3,
+            "array_cardinality_lt": 4,
+            "array_cardinality_lte": 3,
+        },
+    ),
+    BenchmarkCase(
+        name="jsonb",
+        model=JSONBBenchmarkModel,
+        make_value=lambda i: {
+            "group": i % 10,
+            "name": f"item-{i}",
+            "tags": ["a", "b", "c"],
+            "nested": {"value": i, "enabled": i % 2 == 0},
+        },
+        field_accessor_map=jsonb_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "jsonb_contained_by": {"group": 1, "name": "item-1"},
+            "jsonb_contains": {"group": 1},
+            "jsonb_has_all": ["group", "nested"],
+            "jsonb_has_any": ["group", "missing"],
+            "jsonb_has_key": "group",
+            "jsonb_path_exists": "$.nested ? (@.value > 10 && @.enabled == true)",
+            "jsonb_path_match": "$.group == 1",
+        },
+    ),
+    BenchmarkCase(
+        name="inet",
+        model=InetBenchmarkModel,
+        make_value=lambda i: ip_address(_ipv4(i)),
+        field_accessor_map=inet_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": ip_address("10.0.0.1"),
+            "contained_by": ip_interface("10.0.0.0/16"),
+            "contained_by_eq": ip_interface("10.0.0.0/16"),
+            "contains_subnet": ip_address("10.0.0.1"),
+            "contains_subnet_eq": ip_address("10.0.0.1"),
+            "contains_or_eq": ip_interface("10.0.0.0/24"),
+        },
+    ),
+    BenchmarkCase(
+        name="inet_lazy",
+        model=LazyInetBenchmarkModel,
+        make_value=lambda i: ip_address(_ipv4(i)),
+        field_accessor_map=inet_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": ip_address("10.0.0.1"),
+            "contained_by": ip_interface("10.0.0.0/16"),
+            "contained_by_eq": ip_interface("10.0.0.0/16"),
+            "contains_subnet": ip_address("10.0.0.1"),
+            "contains_subnet_eq": ip_address("10.0.0.1"),
+            "contains_or_eq": ip_interface("10.0.0.0/24"),
+        },
+    ),
+    BenchmarkCase(
+        name="inet_compact",
+        model=CompactInetBenchmarkModel,
+        make_value=lambda i: ip_address(_ipv4(i)),
+        field_accessor_map=inet_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": ip_address("10.0.0.1"),
+            "contained_by": ip_interface("10.0.0.0/16"),
+            "contained_by_eq": ip_interface("10.0.0.0/16"),
+            "contains_subnet": ip_address("10.0.0.1"),
+            "contains_subnet_eq": ip_address("10.0.0.1"),
+            "contains_or_eq": ip_interface("10.0.0.0/24"),
+        },
+    ),
+    BenchmarkCase(
+        name="cidr",
+        model=CidrBenchmarkModel,
+        make_value=lambda i: ip_interface(f"{_ipv4(i << 8)}/24"),
+        # CIDR columns use the operators registered by the INET module
+        field_accessor_map=inet_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": ip_interface("10.0.1.0/24"),
+            "contained_by": ip_interface("10.0.0.0/16"),
+            "contained_by_eq": ip_interface("10.0.0.0/16"),
+            "contains_subnet": ip_address("10.0.1.1"),
+            "contains_subnet_eq": ip_address("10.0.1.1"),
+            "contains_or_eq": ip_interface("10.0.1.0/28"),
+        },
+    ),
+    BenchmarkCase(
+        name="macaddr",
+        model=MacaddrBenchmarkModel,
+        make_value=lambda i: "08:00:2b:{:02x}:{:02x}:{:02x}".format(
+            (i >> 16) & 255, (i >> 8) & 255, i & 255
+        ),
+        field_accessor_map=macaddr_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": "08:00:2b:00:00:01",
+            "macaddr_oui": "08:00:2b",
+            "macaddr_oui_in": ["08:00:2b", "00:1a:2b"],
+        },
+    ),
+    BenchmarkCase(
+        name="macaddr8",
+        model=Macaddr8BenchmarkModel,
+        make_value=lambda i: "08:00:2b:ff:fe:{:02x}:{:02x}:{:02x}".format(
+            (i >> 16) & 255, (i >> 8) & 255, i & 255
+        ),
+        field_accessor_map=macaddr_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": "08:00:2b:ff:fe:00:00:01",
+            "macaddr_oui": "08:00:2b",
+            "macaddr_oui_in": ["08:00:2b", "00:1a:2b"],
+        },
+    ),
+    BenchmarkCase(
+        name="int4range",
+        model=RangeBenchmarkModel,
+        make_value=lambda i: ormar_pg_ext.Range(i * 10, i * 10 + 15),
+        field_accessor_map=range_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": ormar_pg_ext.Range(10, 25),
+            "range_overlap": ormar_pg_ext.Range(100, 120),
+            "range_contains": 105,
+            "range_contained_by": ormar_pg_ext.Range(0, 1000),
+            "range_adjacent": ormar_pg_ext.Range(25, 30),
+        },
+    ),
+    BenchmarkCase(
+        name="int4multirange",
+        model=MultirangeBenchmarkModel,
+        make_value=lambda i: [
+            ormar_pg_ext.Range(i * 10, i * 10 + 5),
+            ormar_pg_ext.Range(i * 10 + 7, i * 10 + 15),
+        ],
+        field_accessor_map=range_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": [ormar_pg_ext.Range(10, 15), ormar_pg_ext.Range(17, 25)],
+            "range_overlap": ormar_pg_ext.Range(100, 120),
+            "range_contains": 105,
+            "range_contained_by": ormar_pg_ext.Range(0, 1000),
+            "range_adjacent": ormar_pg_ext.Range(25, 30),
+        },
+    ),
+    BenchmarkCase(
+        name="tsvector",
+        model=TSVectorBenchmarkModel,
+        make_value=lambda i: f"'item{i}':1 'tag{i % 10}':2",
+        field_accessor_map=tsvector_field.FIELD_ACCESSOR_MAP,
+        filter_values={
+            "exact": "'item1':1 'tag1':2",
+            "tsvector_match": "tag1 -item1",
+            "tsvector_match_plain": "item1 tag1",
+        },
+    ),
+    BenchmarkCase(
+        name="uuid",
+        model=UUIDBenchmarkModel,
+        make_value=lambda i: uuid.UUID(int=i + 1),
+        filter_values={"exact": uuid.UUID(int=2)},
+    ),
+    BenchmarkCase(
+        name="uuid_wide",
+        model=WideUUIDBenchmarkModel,
+        make_value=lambda i: uuid.UUID(int=i + 1),
+        filter_values={"exact": uuid.UUID(int=2)},
+    ),
+    BenchmarkCase(
+        name="uuid_wide_native",
+        model=NativeWideUUIDBenchmarkModel,
+        make_value=lambda i: uuid.UUID(int=i + 1),
+        filter_values={"exact": uuid.UUID(int=2)},
+    ),
+]
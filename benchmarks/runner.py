@@ -0,0 +1,188 @@
+import json
+import platform
+import statistics
+import time
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+try:
+    from importlib.metadata import (
+        PackageNotFoundError,
+        version,
+    )
+except ImportError:  # pragma: no-cover
+    from importlib_metadata import (  # type: ignore
+        PackageNotFoundError,
+        version,
+    )
+
+# Minimum time a single repeat of a micro benchmark should take. The loop count
+# is scaled up until this is reached to reduce timer noise.
+MIN_REPEAT_TIME = 0.05
+
+
+@dataclass
+class BenchmarkResult:
+    suite: str
+    field: str
+    benchmark: str
+    operator: Optional[str]
+    rows: Optional[int]
+    loops: int
+    repeat: int
+    # All timings are in seconds per single call
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    # Bytes kept in memory per row by the memory benchmarks, which have no timings
+    memory: Optional[float] = None
+
+    @property
+    def key(self) -> Tuple[Any, ...]:
+        return (self.suite, self.field, self.benchmark, self.operator, self.rows)
+
+    def label(self) -> str:
+        parts = [self.suite, self.field, self.benchmark]
+        if self.operator:
+            parts.append(self.operator)
+        if self.rows is not None:
+            parts.append(f"rows={self.rows}")
+        return ".".join(parts)
+
+
+def summarize(timings: List[float], loops: int, **kwargs: Any) -> BenchmarkResult:
+    per_call = [t / loops for t in timings]
+    return BenchmarkResult(
+        loops=loops,
+        repeat=len(per_call),
+        min=min(per_call),
+        median=statistics.median(per_call),
+        mean=statistics.mean(per_call),
+        stdev=statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        **kwargs,
+    )
+
+
+def time_sync(func: Callable[[], Any], repeat: int, **kwargs: Any) -> BenchmarkResult:
+    """
+    Time a synchronous callable, calibrating the loop count like `timeit` does
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= MIN_REPEAT_TIME or loops >= 1_000_000:
+            break
+        loops *= 10
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings, loops, **kwargs)
+
+
+async def time_async(
+    func: Callable[[], Awaitable[Any]], repeat: int, **kwargs: Any
+) -> BenchmarkResult:
+    """
+    Time a coroutine function. Each call is a database round trip so no loop
+    calibration is done, the call is warmed up once and then repeated.
+    """
+    await func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings, 1, **kwargs)
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "packages": {
+            name: _package_version(name)
+            for name in (
+                "ormar-postgres-extensions",
+                "ormar",
+                "sqlalchemy",
+                "databases",
+                "asyncpg",
+                "pydantic",
+            )
+        },
+    }
+
+
+def write_results(path: str, results: List[BenchmarkResult]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "environment": environment(),
+                "results": [asdict(result) for result in results],
+            },
+            f,
+            indent=2,
+        )
+
+
+def read_results(path: str) -> Dict[Tuple[Any, ...], BenchmarkResult]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    results = (BenchmarkResult(**result) for result in data["results"])
+    return {result.key: result for result in results}
+
+
+def compare(
+    baseline_path: str, current_path: str, threshold: float
+) -> List[Tuple[BenchmarkResult, BenchmarkResult, float]]:
+    """
+    Compare two result files and return every benchmark whose median got slower
+    by more than `threshold` (e.g. 0.1 for 10%), or whose memory per row grew by
+    more than that for the memory benchmarks
+    """
+    baseline = read_results(baseline_path)
+    current = read_results(current_path)
+
+    regressions = []
+    for key, result in current.items():
+        previous = baseline.get(key)
+        if previous is not None and previous.memory and result.memory is not None:
+            change = result.memory / previous.memory - 1
+        elif previous is None or previous.median == 0:
+            continue
+        else:
+            change = result.median / previous.median - 1
+        if change > threshold:
+            regressions.append((previous, result, change))
+    return regressions
@@ -0,0 +1,387 @@
+import time
+import tracemalloc
+from ipaddress import ip_interface
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+import ormar
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import pypostgresql
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields.hstore import PostgresHstoreType
+from ormar_postgres_extensions.fields.inet import (
+    decode_inet_binary,
+    encode_inet_binary,
+)
+from ormar_postgres_extensions.fields.jsonb import (
+    PostgresJSONBType,
+    _decode_jsonb_binary,
+    get_json_codec,
+)
+
+from .database import database
+from .models import (
+    BenchmarkCase,
+    CompactInetBenchmarkModel,
+    InetBenchmarkModel,
+    LazyInetBenchmarkModel,
+    _ipv4,
+)
+from .runner import (
+    BenchmarkResult,
+    summarize,
+    time_async,
+    time_sync,
+)
+
+# Same dialect setup used by the databases asyncpg backend to compile queries and
+# process bind/result values
+DIALECT = pypostgresql.dialect(paramstyle="pyformat")
+
+INSERT_CHUNK_SIZE = 1000
+
+INET_DECODE_ROWS = 10000
+
+
+def _column_processors(model: ormar.Model, name: str) -> Any:
+    column_type = model.Meta.table.columns[name].type
+    return (
+        column_type._cached_bind_processor(DIALECT),
+        column_type._cached_result_processor(DIALECT, None),
+    )
+
+
+def _encode(case: BenchmarkCase, instance: ormar.Model) -> Dict[str, Any]:
+    bind_processor, _ = _column_processors(case.model, "data")
+    values = instance.prepare_model_to_save(instance.dict())
+    if bind_processor is not None:
+        values["data"] = bind_processor(values["data"])
+    return values
+
+
+def _decode(case: BenchmarkCase, values: Dict[str, Any]) -> ormar.Model:
+    _, result_processor = _column_processors(case.model, "data")
+    row = dict(values)
+    if result_processor is not None:
+        row["data"] = result_processor(row["data"])
+    return case.model.from_row(row, source_model=case.model)
+
+
+def _compile_filter(case: BenchmarkCase, operator: str, value: Any) -> Any:
+    queryset = case.model.objects.filter(**{f"data__{operator}": value})
+    return queryset.build_select_expression().compile(dialect=DIALECT)
+
+
+def run_micro(cases: Sequence[BenchmarkCase], repeat: int) -> List[BenchmarkResult]:
+    """
+    Benchmarks that don't need a database connection
+    """
+    results = []
+    for case in cases:
+        value = case.make_value(1)
+        instance = case.model(id=1, data=value)
+        encoded = _encode(case, instance)
+        common = dict(suite="micro", field=case.name, rows=None)
+
+        results.append(
+            time_sync(
+                lambda: case.model(id=1, data=value),
+                repeat,
+                benchmark="construct",
+                operator=None,
+                **common,
+            )
+        )
+        results.append(
+            time_sync(
+                lambda: _encode(case, instance),
+                repeat,
+                benchmark="encode",
+                operator=None,
+                **common,
+            )
+        )
+        results.append(
+            time_sync(
+                lambda: _decode(case, encoded),
+                repeat,
+                benchmark="decode",
+                operator=None,
+                **common,
+            )
+        )
+        results.append(
+            time_sync(
+                lambda: _decode(case, _encode(case, instance)),
+                repeat,
+                benchmark="round_trip",
+                operator=None,
+                **common,
+            )
+        )
+        for operator, filter_value in case.operators():
+            results.append(
+                time_sync(
+                    lambda: _compile_filter(case, operator, filter_value),
+                    repeat,
+                    benchmark="filter_compile",
+                    operator=operator,
+                    **common,
+                )
+            )
+    return results
+
+
+def _large_document(size: int) -> dict:
+    return {
+        f"key-{i}": {"index": i, "name": f"item-{i}", "tags": ["a", "b"], "ok": True}
+        for i in range(size)
+    }
+
+
+def run_jsonb_codec(repeat: int) -> List[BenchmarkResult]:
+    """
+    Compare the ways a JSONB document can be decoded once it arrives from the
+    database: SQLAlchemy's default stdlib text path, the JSONB field codec on text
+    and the binary connection codec installed by `register_jsonb_codec`.
+    """
+    results = []
+    for size in (10, 1000):
+        document = _large_document(size)
+        text = get_json_codec().dumps(document)
+        text = text.decode("utf-8") if isinstance(text, bytes) else text
+        binary = b"\x01" + text.encode("utf-8")
+
+        default_processor = postgresql.JSONB().result_processor(DIALECT, None)
+        field_processor = PostgresJSONBType().result_processor(DIALECT, None)
+        paths = {
+            "sqlalchemy_text": lambda: default_processor(text),
+            "field_codec_text": lambda: field_processor(text),
+            "connection_codec": lambda: field_processor(_decode_jsonb_binary(binary)),
+        }
+        for name, func in paths.items():
+            results.append(
+                time_sync(
+                    func,
+                    repeat,
+                    suite="micro",
+                    field="jsonb",
+                    benchmark=f"document_decode_{name}",
+                    operator=None,
+                    rows=size,
+                )
+            )
+    return results
+
+
+def run_hstore_codec(repeat: int) -> List[BenchmarkResult]:
+    """
+    Compare encoding and decoding a flat map of strings as JSONB with the field
+    codec and as HSTORE, both with SQLAlchemy's text format and with the HSTORE
+    field which binds a text array and parses the text format with json. Only
+    the python side is measured, no table needs the hstore extension.
+    """
+    results = []
+    for size in (10, 1000):
+        document = {f"key-{i}": f"value {i}" for i in range(size)}
+        json_text = get_json_codec().dumps(document)
+        json_text = (
+            json_text.decode("utf-8") if isinstance(json_text, bytes) else json_text
+        )
+        hstore_type = PostgresHstoreType()
+        hstore_text = postgresql.HSTORE().bind_processor(DIALECT)(document)
+
+        jsonb_bind = PostgresJSONBType().bind_processor(DIALECT)
+        jsonb_result = PostgresJSONBType().result_processor(DIALECT, None)
+        sqlalchemy_bind = postgresql.HSTORE().bind_processor(DIALECT)
+        sqlalchemy_result = postgresql.HSTORE().result_processor(DIALECT, None)
+        field_bind = hstore_type.bind_processor(DIALECT)
+        field_result = hstore_type.result_processor(DIALECT, None)
+        paths = {
+            "encode_jsonb": lambda: jsonb_bind(document),
+            "encode_sqlalchemy_hstore": lambda: sqlalchemy_bind(document),
+            "encode_field_hstore": lambda: field_bind(document),
+            "decode_jsonb": lambda: jsonb_result(json_text),
+            "decode_sqlalchemy_hstore": lambda: sqlalchemy_result(hstore_text),
+            "decode_field_hstore": lambda: field_result(hstore_text),
+        }
+        for name, func in paths.items():
+            results.append(
+                time_sync(
+                    func,
+                    repeat,
+                    suite="micro",
+                    field="hstore",
+                    benchmark=name,
+                    operator=None,
+                    rows=size,
+                )
+            )
+    return results
+
+
+def _load_inet_rows(
+    model: ormar.Model, binary: List[bytes], driver_decode: Optional[Callable]
+) -> List[Any]:
+    _, result_processor = _column_processors(model, "data")
+    loaded = []
+    for i, value in enumerate(binary):
+        if driver_decode is not None:
+            value = driver_decode(value)
+        if result_processor is not None:
+            value = result_processor(value)
+        loaded.append(model.from_row({"id": i, "data": value}, source_model=model))
+    return loaded
+
+
+def run_inet_decode(repeat: int) -> List[BenchmarkResult]:
+    """
+    Compare loading inet values as ipaddress objects, the current behavior, with
+    the lazy and compact wrappers. Values arrive in the binary wire format and
+    are either turned into ipaddress objects like asyncpg does by default or
+    kept as they are like the `register_inet_codec` connection codec does.
+    Besides the time to load the models and to then use every value once, the
+    memory the loaded models keep is recorded per row.
+    """
+    binary = [
+        encode_inet_binary(ip_interface(f"{_ipv4(i)}/24"))
+        for i in range(INET_DECODE_ROWS)
+    ]
+    sources = {"driver": decode_inet_binary, "codec": None}
+    models = {
+        "inet": InetBenchmarkModel,
+        "inet_lazy": LazyInetBenchmarkModel,
+        "inet_compact": CompactInetBenchmarkModel,
+    }
+    results = []
+    for field_name, model in models.items():
+        for source, driver_decode in sources.items():
+            common = dict(
+                suite="micro", field=field_name, operator=None, rows=INET_DECODE_ROWS
+            )
+            results.append(
+                time_sync(
+                    lambda: _load_inet_rows(model, binary, driver_decode),
+                    repeat,
+                    benchmark=f"load_{source}",
+                    **common,
+                )
+            )
+
+            tracemalloc.start()
+            loaded = _load_inet_rows(model, binary, driver_decode)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            results.append(
+                summarize(
+                    [0.0],
+                    1,
+                    benchmark=f"memory_{source}",
+                    memory=memory / INET_DECODE_ROWS,
+                    **common,
+                )
+            )
+
+            results.append(
+                time_sync(
+                    lambda: [str(obj.data) for obj in loaded],
+                    repeat,
+                    benchmark=f"access_{source}",
+                    **common,
+                )
+            )
+    return results
+
+
+async def _load_rows(case: BenchmarkCase, rows: int) -> float:
+    await case.model.objects.delete(each=True)
+    start = time.perf_counter()
+    for offset in range(0, rows, INSERT_CHUNK_SIZE):
+        await case.model.objects.bulk_create(
+            [
+                case.model(data=case.make_value(i))
+                for i in range(offset, min(offset + INSERT_CHUNK_SIZE, rows))
+            ]
+        )
+    return time.perf_counter() - start
+
+
+async def _copy_rows(case: BenchmarkCase, rows: int) -> float:
+    await case.model.objects.delete(each=True)
+    start = time.perf_counter()
+    await ormar_pg_ext.bulk_copy(
+        case.model, (case.model(data=case.make_value(i)) for i in range(rows))
+    )
+    return time.perf_counter() - start
+
+
+async def _update_rows(case: BenchmarkCase) -> float:
+    objects = await case.model.objects.all()
+    for i, obj in enumerate(objects):
+        obj.data = case.make_value(i + 1)
+    start = time.perf_counter()
+    await case.model.objects.bulk_update(objects, columns=["data"])
+    return time.perf_counter() - start
+
+
+async def run_e2e(
+    cases: Sequence[BenchmarkCase], row_counts: Sequence[int], repeat: int
+) -> List[BenchmarkResult]:
+    """
+    Benchmarks that run queries against a real database at several table sizes
+    """
+    results = []
+    async with database:
+        for case in cases:
+            for rows in row_counts:
+                common = dict(suite="e2e", field=case.name, rows=rows)
+
+                elapsed = await _load_rows(case, rows)
+                results.append(
+                    summarize(
+                        [elapsed], 1, benchmark="bulk_create", operator=None, **common
+                    )
+                )
+                elapsed = await _copy_rows(case, rows)
+                results.append(
+                    summarize(
+                        [elapsed], 1, benchmark="bulk_copy", operator=None, **common
+                    )
+                )
+                elapsed = await _update_rows(case)
+                results.append(
+                    summarize(
+                        [elapsed], 1, benchmark="bulk_update", operator=None, **common
+                    )
+                )
+                results.append(
+                    await time_async(
+                        case.model.objects.all,
+                        repeat,
+                        benchmark="select_all",
+                        operator=None,
+                        **common,
+                    )
+                )
+                for operator, filter_value in case.operators():
+                    queryset = case.model.objects.filter(
+                        **{f"data__{operator}": filter_value}
+                    )
+                    results.append(
+                        await time_async(
+                            queryset.all,
+                            repeat,
+                            benchmark="filter",
+                            operator=operator,
+                            **common,
+                        )
+                    )
+            await case.model.objects.delete(each=True)
+    return results
@@ -22,6 +22,7 @@ test_requires = [
     "pytest",
     "pytest-asyncio",
 ]
+orjson_requires = ["orjson"]
 dev_requires = [
     "black",
     "flake8",
@@ -69,7 +70,11 @@ if __name__ in ["__main__", "builtins"]:
         package_data={"": ["VERSION"]},
         packages=find_packages("./src"),
         zip_safe=False,
-        extras_require={"dev": dev_requires, "test": test_requires},
+        extras_require={
+            "dev": dev_requires,
+            "orjson": orjson_requires,
+            "test": test_requires,
+        },
         install_requires=install_requires,
         setup_requires=setup_requires,
         python_requires=python_requires,
@@ -1,8 +1,196 @@
-from .fields import (  # noqa: F401
-    ARRAY,
-    CIDR,
-    INET,
-    JSONB,
-    MACADDR,
-    UUID,
+from importlib import import_module
+from typing import (
+    TYPE_CHECKING,
+    Any,
 )
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .advisor import (  # noqa: F401
+        IndexAdvice,
+        advise_indexes,
+    )
+    from .bulk import bulk_copy  # noqa: F401
+    from .clause_cache import (  # noqa: F401
+        clause_cache_info,
+        clear_clause_cache,
+        install_clause_cache,
+        remove_clause_cache,
+        set_clause_cache_size,
+    )
+    from .fields import (  # noqa: F401
+        ARRAY,
+        CIDR,
+        DATEMULTIRANGE,
+        DATERANGE,
+        HSTORE,
+        INET,
+        INT4MULTIRANGE,
+        INT4RANGE,
+        INT8MULTIRANGE,
+        INT8RANGE,
+        JSONB,
+        MACADDR,
+        MACADDR8,
+        NUMMULTIRANGE,
+        NUMRANGE,
+        TSMULTIRANGE,
+        TSRANGE,
+        TSTZMULTIRANGE,
+        TSTZRANGE,
+        TSVECTOR,
+        UUID,
+        String,
+        Text,
+    )
+    from .fields.array import (  # noqa: F401
+        array_append,
+        array_cat,
+        array_length,
+        array_position,
+        array_prepend,
+        array_remove,
+        array_union,
+        cardinality,
+    )
+    from .fields.hstore import register_hstore_codec  # noqa: F401
+    from .fields.inet import (  # noqa: F401
+        CompactIPAddress,
+        LazyIPAddress,
+        register_inet_codec,
+    )
+    from .fields.jsonb import (  # noqa: F401
+        jsonb_merge,
+        jsonb_path,
+        jsonb_path_query,
+        jsonb_path_query_array,
+        jsonb_path_query_first,
+        jsonb_remove,
+        jsonb_remove_path,
+        jsonb_set,
+        register_jsonb_codec,
+        set_json_codec,
+    )
+    from .fields.range import (  # noqa: F401
+        Range,
+        range_text,
+    )
+    from .fields.trgm import (  # noqa: F401
+        similarity,
+        trgm_distance,
+        word_similarity,
+    )
+    from .fields.tsvector import (  # noqa: F401
+        ts_rank,
+        tsvector_expression,
+    )
+    from .instrumentation import (  # noqa: F401
+        MetricEvent,
+        MetricsCollector,
+        set_metrics_callback,
+    )
+    from .network_cache import NetworkCache  # noqa: F401
+    from .operators import (  # noqa: F401
+        OperatorConflictError,
+        install_operators,
+        registered_operators,
+    )
+    from .query import (  # noqa: F401
+        fetch_deferred,
+        iterate_batches,
+        load_deferred,
+        lookup_networks,
+        nearest,
+        project,
+        search,
+    )
+
+# The modules are only imported when one of their names is first used, so that
+# using a single field doesn't load the code of all the others
+_EXPORTS = {
+    "IndexAdvice": ".advisor",
+    "advise_indexes": ".advisor",
+    "bulk_copy": ".bulk",
+    "clause_cache_info": ".clause_cache",
+    "clear_clause_cache": ".clause_cache",
+    "install_clause_cache": ".clause_cache",
+    "remove_clause_cache": ".clause_cache",
+    "set_clause_cache_size": ".clause_cache",
+    "ARRAY": ".fields.array",
+    "array_append": ".fields.array",
+    "array_cat": ".fields.array",
+    "array_length": ".fields.array",
+    "array_position": ".fields.array",
+    "array_prepend": ".fields.array",
+    "array_remove": ".fields.array",
+    "array_union": ".fields.array",
+    "cardinality": ".fields.array",
+    "CIDR": ".fields.cidr",
+    "HSTORE": ".fields.hstore",
+    "register_hstore_codec": ".fields.hstore",
+    "INET": ".fields.inet",
+    "CompactIPAddress": ".fields.inet",
+    "LazyIPAddress": ".fields.inet",
+    "register_inet_codec": ".fields.inet",
+    "JSONB": ".fields.jsonb",
+    "MACADDR": ".fields.macaddr",
+    "MACADDR8": ".fields.macaddr",
+    "INT4RANGE": ".fields.range",
+    "INT8RANGE": ".fields.range",
+    "NUMRANGE": ".fields.range",
+    "TSRANGE": ".fields.range",
+    "TSTZRANGE": ".fields.range",
+    "DATERANGE": ".fields.range",
+    "INT4MULTIRANGE": ".fields.range",
+    "INT8MULTIRANGE": ".fields.range",
+    "NUMMULTIRANGE": ".fields.range",
+    "TSMULTIRANGE": ".fields.range",
+    "TSTZMULTIRANGE": ".fields.range",
+    "DATEMULTIRANGE": ".fields.range",
+    "Range": ".fields.range",
+    "range_text": ".fields.range",
+    "String": ".fields.trgm",
+    "Text": ".fields.trgm",
+    "similarity": ".fields.trgm",
+    "trgm_distance": ".fields.trgm",
+    "word_similarity": ".fields.trgm",
+    "TSVECTOR": ".fields.tsvector",
+    "ts_rank": ".fields.tsvector",
+    "tsvector_expression": ".fields.tsvector",
+    "UUID": ".fields.uuid",
+    "jsonb_merge": ".fields.jsonb",
+    "jsonb_path": ".fields.jsonb",
+    "jsonb_path_query": ".fields.jsonb",
+    "jsonb_path_query_array": ".fields.jsonb",
+    "jsonb_path_query_first": ".fields.jsonb",
+    "jsonb_remove": ".fields.jsonb",
+    "jsonb_remove_path": ".fields.jsonb",
+    "jsonb_set": ".fields.jsonb",
+    "register_jsonb_codec": ".fields.jsonb",
+    "set_json_codec": ".fields.jsonb",
+    "MetricEvent": ".instrumentation",
+    "MetricsCollector": ".instrumentation",
+    "set_metrics_callback": ".instrumentation",
+    "NetworkCache": ".network_cache",
+    "OperatorConflictError": ".operators",
+    "install_operators": ".operators",
+    "registered_operators": ".operators",
+    "fetch_deferred": ".query",
+    "iterate_batches": ".query",
+    "load_deferred": ".query",
+    "lookup_networks": ".query",
+    "nearest": ".query",
+    "project": ".query",
+    "search": ".query",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__} has no attribute {name}") from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,211 @@
+import json
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import sqlalchemy
+from ormar.queryset import QuerySet
+from ormar.queryset.actions.filter_action import FilterAction
+from ormar.queryset.clause import FilterGroup
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+from .operators import (
+    Operator,
+    registered_operators,
+)
+
+
+class IndexAdvice(NamedTuple):
+    """
+    Advice for one extension operator predicate of a queryset
+
+    `indexes` are the existing indexes on the column that support the operator
+    and `plan_index` the one of them the query plan uses, None when the planner
+    picks another scan. `create_index` is the suggested statement when there is
+    no supporting index and one can be created for the operator.
+    """
+
+    table: str
+    column: str
+    operator: str
+    indexes: List[str]
+    plan_index: Optional[str]
+    create_index: Optional[str]
+
+
+class Explain(Executable, ClauseElement):
+    """
+    works as postgresql `EXPLAIN (FORMAT JSON) statement`
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement) -> None:
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler: Any, **kwargs: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+# Access method and operator class of each key column of the valid indexes on a
+# column
+_COLUMN_INDEXES = sqlalchemy.text("""
+    SELECT index_class.relname AS name, am.amname AS method, opc.opcname AS opclass
+    FROM pg_index ix
+    JOIN pg_class index_class ON index_class.oid = ix.indexrelid
+    JOIN pg_am am ON am.oid = index_class.relam
+    JOIN LATERAL unnest(ix.indkey::int2[], ix.indclass::oid[])
+        AS key(attnum, opclass) ON true
+    JOIN pg_attribute attribute
+        ON attribute.attrelid = ix.indrelid AND attribute.attnum = key.attnum
+    JOIN pg_opclass opc ON opc.oid = key.opclass
+    WHERE ix.indrelid = to_regclass(:table)
+        AND attribute.attname = :column
+        AND ix.indisvalid
+    ORDER BY index_class.relname
+    """)
+
+
+def _filter_actions(clauses: Iterable[Any]) -> Iterator[FilterAction]:
+    for clause in clauses:
+        if isinstance(clause, FilterGroup):
+            yield from clause._iter()
+        else:
+            yield clause
+
+
+def _predicates(
+    queryset: QuerySet, operators: Dict[str, Operator]
+) -> List[Tuple[sqlalchemy.Table, sqlalchemy.Column, Operator]]:
+    predicates = {}
+    for action in _filter_actions(queryset.filter_clauses + queryset.exclude_clauses):
+        operator = operators.get(action.operator)
+        if operator is not None:
+            column = action.column
+            predicates[(column.table.fullname, column.name, operator.name)] = (
+                column.table,
+                column,
+                operator,
+            )
+    return list(predicates.values())
+
+
+def _plan_indexes(plan: Any) -> Set[str]:
+    # Names of all the indexes scanned anywhere in the plan
+    if isinstance(plan, list):
+        return set().union(*map(_plan_indexes, plan))
+    if not isinstance(plan, dict):
+        return set()
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    return names.union(*map(_plan_indexes, plan.values()))
+
+
+def create_index_statement(
+    table: sqlalchemy.Table, column: sqlalchemy.Column, method: str, opclass: str
+) -> str:
+    """
+    CREATE INDEX statement for an index on the column with the given access
+    method and operator class
+    """
+    # Built on a copy of the table so that the index isn't added to the model
+    index_table = sqlalchemy.Table(
+        table.name,
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column(column.name, column.type),
+        schema=table.schema,
+    )
+    index = sqlalchemy.Index(
+        f"ix_{table.name}_{column.name}_{method}",
+        index_table.columns[column.name],
+        postgresql_using=method,
+        postgresql_ops={column.name: opclass},
+    )
+    return str(
+        sqlalchemy.schema.CreateIndex(index).compile(dialect=postgresql.dialect())
+    ).strip()
+
+
+def _suggested_index(
+    column: sqlalchemy.Column, operator: Operator
+) -> Optional[Tuple[str, str]]:
+    # Column types that can only use some of the operator classes of the operator,
+    # e.g. range and multirange columns sharing the range operators, list theirs
+    opclasses = getattr(column.type, "index_opclasses", None)
+    for method, opclass in operator.indexes:
+        if opclasses is None or opclass in opclasses:
+            return method, opclass
+    return None
+
+
+async def advise_indexes(queryset: QuerySet) -> List[IndexAdvice]:
+    """
+    Check whether the extension operator predicates of the queryset (e.g.
+    `jsonb_contains` or `contains_subnet`) can use an index
+
+    The indexes on each filtered column are looked up in the catalog of the
+    database of the model and the queryset is explained to see which of them
+    the planner uses. Small tables are scanned sequentially even when a
+    supporting index exists, so `plan_index` is only meaningful for tables of
+    a realistic size.
+
+    :param queryset: queryset to check, e.g. `Model.objects.filter(...)`
+    :type queryset: ormar.queryset.QuerySet
+    :return: advice for every operator, column pair filtered on
+    :rtype: List[IndexAdvice]
+    """
+    predicates = _predicates(queryset, registered_operators())
+    if not predicates:
+        return []
+
+    database = queryset.database
+    plan = await database.fetch_val(Explain(queryset.build_select_expression()))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan_indexes = _plan_indexes(plan)
+
+    preparer = postgresql.dialect().identifier_preparer
+    column_indexes: Dict[Tuple[str, str], List[Any]] = {}
+    advice = []
+    for table, column, operator in predicates:
+        key = (table.fullname, column.name)
+        if key not in column_indexes:
+            column_indexes[key] = await database.fetch_all(
+                _COLUMN_INDEXES.bindparams(
+                    table=preparer.format_table(table), column=column.name
+                )
+            )
+        indexes = [
+            row["name"]
+            for row in column_indexes[key]
+            if (row["method"], row["opclass"]) in operator.indexes
+        ]
+        create_index = None
+        suggested = _suggested_index(column, operator)
+        if not indexes and suggested is not None:
+            create_index = create_index_statement(table, column, *suggested)
+        advice.append(
+            IndexAdvice(
+                table=table.fullname,
+                column=column.name,
+                operator=operator.name,
+                indexes=indexes,
+                plan_index=next(
+                    (name for name in indexes if name in plan_indexes), None
+                ),
+                create_index=create_index,
+            )
+        )
+    return advice
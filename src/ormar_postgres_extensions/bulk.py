@@ -0,0 +1,230 @@
+from functools import partial
+from itertools import (
+    chain,
+    islice,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import ormar
+from ormar.exceptions import QueryDefinitionError
+from sqlalchemy.dialects.postgresql import pypostgresql
+
+# Same dialect setup the databases asyncpg backend uses to process bind values so
+# values sent with COPY are encoded exactly like they are for an INSERT
+_DIALECT = pypostgresql.dialect(paramstyle="pyformat")
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _decode_macaddr(value: bytes) -> str:
+    return value.hex(":")
+
+
+def _copy_codecs() -> (
+    Tuple[Dict[type, Tuple[str, Callable, Callable]], Dict[type, Tuple[str, str]]]
+):
+    # The field modules are imported when a COPY runs so that importing bulk
+    # doesn't load them
+    from .fields.hstore import PostgresHstoreType
+    from .fields.macaddr import (
+        PostgresMacaddr8Type,
+        PostgresMacaddrType,
+        macaddr_bytes,
+    )
+    from .fields.tsvector import (
+        PostgresTSVectorType,
+        tsvector_bytes,
+        tsvector_text,
+    )
+
+    # asyncpg has no binary codec for these types which the COPY needs. They are
+    # only installed on the connection for the duration of the COPY.
+    binary_codecs = {
+        PostgresMacaddrType: ("macaddr", macaddr_bytes, _decode_macaddr),
+        PostgresMacaddr8Type: (
+            "macaddr8",
+            partial(macaddr_bytes, size=8),
+            _decode_macaddr,
+        ),
+        PostgresTSVectorType: ("tsvector", tsvector_bytes, tsvector_text),
+    }
+    # Types of extensions with a binary codec built into asyncpg, installed the
+    # same way in the schema the extension was created in
+    builtin_codecs = {
+        PostgresHstoreType: ("hstore", "pg_contrib.hstore"),
+    }
+    return binary_codecs, builtin_codecs
+
+
+def _bind_processors(
+    model: Type[ormar.Model], columns: List[str]
+) -> List[Optional[Callable]]:
+    table_columns = model.Meta.table.columns
+    return [
+        table_columns[name].type._cached_bind_processor(_DIALECT) for name in columns
+    ]
+
+
+def _prepare(obj: ormar.Model) -> Dict[str, Any]:
+    return obj.prepare_model_to_save(obj.dict())
+
+
+def _records(
+    model: Type[ormar.Model],
+    columns: List[str],
+    prepared: Iterable[Tuple[ormar.Model, Dict[str, Any]]],
+    copied: List[ormar.Model],
+) -> Iterator[Tuple[Any, ...]]:
+    processors = _bind_processors(model, columns)
+    column_set = set(columns)
+    for obj, values in prepared:
+        if values.keys() != column_set:
+            raise QueryDefinitionError(
+                "All objects passed to bulk_copy need to populate the same columns. "
+                f"Expected {sorted(column_set)} got {sorted(values)}"
+            )
+        yield tuple(
+            (
+                processor(values[name])
+                if processor is not None and values[name] is not None
+                else values[name]
+            )
+            for name, processor in zip(columns, processors)
+        )
+        copied.append(obj)
+
+
+async def _has_binary_codec(connection: Any, table: Any, column: str) -> bool:
+    # Codecs installed on the connection, e.g. with register_hstore_codec, are
+    # used as they are and left in place. asyncpg checks the encoders of the
+    # columns before sending anything, so an empty COPY of the column fails
+    # without one.
+    from asyncpg.exceptions import InternalClientError
+
+    try:
+        await connection.copy_records_to_table(
+            table.name, records=[], columns=[column], schema_name=table.schema
+        )
+    except InternalClientError:
+        return False
+    return True
+
+
+def _chunks(objects: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(objects)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def bulk_copy(
+    model: Type[ormar.Model],
+    objects: Iterable[ormar.Model],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Insert many models at once using the binary COPY protocol of asyncpg
+
+    The objects are streamed to the database so `objects` can be a generator.
+    When the database of the model is not backed by asyncpg this falls back to
+    `bulk_create` in chunks of `chunk_size`.
+
+    Like `bulk_create` no signals are sent and primary keys generated by the
+    database are not populated on the passed objects. The objects are marked as
+    saved once the whole COPY succeeded.
+
+    :param model: ormar model class the objects belong to
+    :type model: Type[ormar.Model]
+    :param objects: model instances to insert
+    :type objects: Iterable[ormar.Model]
+    :param chunk_size: number of objects per INSERT when falling back
+    :type chunk_size: int
+    :return: number of inserted rows
+    :rtype: int
+    """
+    iterator = iter(objects)
+    first = next(iterator, None)
+    if first is None:
+        return 0
+
+    async with model.Meta.database.connection() as connection:
+        raw_connection = connection.raw_connection
+        if not hasattr(raw_connection, "copy_records_to_table"):
+            count = 0
+            for chunk in _chunks(chain([first], iterator), chunk_size):
+                await model.objects.bulk_create(chunk)
+                count += len(chunk)
+            return count
+
+        from .fields.hstore import type_schema
+
+        table = model.Meta.table
+        first_values = _prepare(first)
+        columns = [
+            column.name for column in table.columns if column.name in first_values
+        ]
+        prepared = chain(
+            [(first, first_values)], ((obj, _prepare(obj)) for obj in iterator)
+        )
+        copied: List[ormar.Model] = []
+        # Codecs set by bulk_copy, which are reset once the COPY is done
+        installed: List[Tuple[str, str]] = []
+        binary_codecs, builtin_codecs = _copy_codecs()
+        # One column of each type the COPY may need a codec for
+        codec_columns = {
+            type(column.type): column.name
+            for column in table.columns
+            if column.name in columns
+            and (
+                type(column.type) in binary_codecs
+                or type(column.type) in builtin_codecs
+            )
+        }
+        try:
+            for column_type, column in codec_columns.items():
+                if await _has_binary_codec(raw_connection, table, column):
+                    continue
+                if column_type in binary_codecs:
+                    type_name, encoder, decoder = binary_codecs[column_type]
+                    await raw_connection.set_type_codec(
+                        type_name,
+                        encoder=encoder,
+                        decoder=decoder,
+                        schema="pg_catalog",
+                        format="binary",
+                    )
+                    installed.append((type_name, "pg_catalog"))
+                else:
+                    type_name, codec_name = builtin_codecs[column_type]
+                    schema = await type_schema(raw_connection, type_name)
+                    await raw_connection.set_builtin_type_codec(
+                        type_name, schema=schema, codec_name=codec_name
+                    )
+                    installed.append((type_name, schema))
+
+            status = await raw_connection.copy_records_to_table(
+                table.name,
+                records=_records(model, columns, prepared, copied),
+                columns=columns,
+                schema_name=table.schema,
+            )
+        finally:
+            for type_name, schema in installed:
+                await raw_connection.reset_type_codec(type_name, schema=schema)
+    # The objects are only saved once the whole COPY succeeded
+    for obj in copied:
+        obj.set_save_status(True)
+    # asyncpg returns the command status, e.g. "COPY 10"
+    return int(status.split()[-1])
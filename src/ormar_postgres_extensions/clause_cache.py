@@ -0,0 +1,191 @@
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import ormar
+from ormar.queryset.actions.filter_action import (
+    FILTER_OPERATORS,
+    FilterAction,
+)
+from sqlalchemy.sql.elements import (
+    BinaryExpression,
+    BindParameter,
+    ClauseElement,
+)
+
+from .patching import Patch
+
+DEFAULT_MAXSIZE = 512
+
+# Filter operators added by this package, only their clauses are cached
+CACHED_OPERATORS: Set[str] = set()
+
+
+class ClauseCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ClauseCache:
+    """
+    Bounded LRU cache of the clauses built for filter operators
+
+    The clause for an operator is built once per model, field, operator and
+    parameter shape. Later filters copy the cached clause with a new bound value
+    instead of building it again through the column comparator.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clauses: "OrderedDict[Hashable, Optional[BinaryExpression]]" = (
+            OrderedDict()
+        )
+
+    def info(self) -> ClauseCacheInfo:
+        return ClauseCacheInfo(self.hits, self.misses, self.maxsize, len(self._clauses))
+
+    def clear(self) -> None:
+        self._clauses.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._clauses) > maxsize:
+            self._clauses.popitem(last=False)
+
+    def get(self, key: Hashable) -> Tuple[bool, Optional[BinaryExpression]]:
+        try:
+            clause = self._clauses[key]
+        except KeyError:
+            self.misses += 1
+            return False, None
+        self._clauses.move_to_end(key)
+        self.hits += 1
+        return True, clause
+
+    def put(self, key: Hashable, clause: Optional[BinaryExpression]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._clauses[key] = clause
+        if len(self._clauses) > self.maxsize:
+            self._clauses.popitem(last=False)
+
+
+_cache = ClauseCache()
+
+
+def clause_cache_info() -> ClauseCacheInfo:
+    """
+    Hits, misses, maximum and current size of the filter clause cache
+    """
+    return _cache.info()
+
+
+def clear_clause_cache() -> None:
+    """
+    Remove all cached filter clauses and reset the statistics
+    """
+    _cache.clear()
+
+
+def set_clause_cache_size(maxsize: int) -> None:
+    """
+    Set the maximum number of cached filter clauses, 0 disables the cache
+    """
+    _cache.resize(maxsize)
+
+
+def _template(clause: Any) -> Optional[BinaryExpression]:
+    # Only clauses comparing the column to a single bound value can be reused by
+    # swapping the value, everything else is built every time
+    if isinstance(clause, BinaryExpression) and isinstance(clause.right, BindParameter):
+        return clause
+    return None
+
+
+def _bind(template: BinaryExpression, value: Any) -> BinaryExpression:
+    clause = template._clone()
+    clause.right = template.right._with_value(value, maintain_key=False)
+    return clause
+
+
+def _wrap_get_text_clause(get_text_clause: Callable) -> Callable:
+    def wrapper(self: FilterAction) -> Any:
+        value = self.filter_value
+        if isinstance(value, ormar.Model):
+            value = value.pk
+        if (
+            self.operator not in CACHED_OPERATORS
+            or self.has_escaped_character
+            or value is None
+            or isinstance(value, ClauseElement)
+            or _cache.maxsize <= 0
+        ):
+            return get_text_clause(self)
+
+        # Values of one type make clauses of the same shape unless the column type
+        # tells them apart, e.g. strings compared to ranges
+        operand_shape = getattr(self.column.type, "operand_shape", None)
+        key = (
+            self.column.table,
+            self.table_prefix,
+            self.column.name,
+            self.operator,
+            type(value),
+            None if operand_shape is None else operand_shape(value),
+        )
+        found, template = _cache.get(key)
+        if found:
+            if template is None:
+                return get_text_clause(self)
+            return _bind(template, value)
+
+        clause = get_text_clause(self)
+        _cache.put(key, _template(clause))
+        return clause
+
+    return wrapper
+
+
+_PATCH = Patch(FilterAction, "get_text_clause", _wrap_get_text_clause)
+
+
+def install_clause_cache() -> None:
+    """
+    Route the filters of ormar through the clause cache, done when the first
+    extension operator is installed. Only the clauses of the extension operators
+    are cached.
+    """
+    _PATCH.install()
+
+
+def remove_clause_cache() -> None:
+    """
+    Build the clauses of all filters through ormar again and empty the cache
+    """
+    _PATCH.remove()
+    _cache.clear()
+
+
+def cache_operator(ormar_operation: str) -> None:
+    """
+    Cache the clauses of the given filter operator
+
+    :param ormar_operation: name of the operator as used in filters
+    :type ormar_operation: str
+    """
+    if ormar_operation not in FILTER_OPERATORS:
+        raise KeyError(f"Unknown filter operator {ormar_operation}")
+    CACHED_OPERATORS.add(ormar_operation)
@@ -1,6 +1,75 @@
-from .array import ARRAY  # noqa: F401
-from .cidr import CIDR  # noqa: F401
-from .inet import INET  # noqa: F401
-from .jsonb import JSONB  # noqa: F401
-from .macaddr import MACADDR  # noqa: F401
-from .uuid import UUID  # noqa: F401
+from importlib import import_module
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .array import ARRAY  # noqa: F401
+    from .cidr import CIDR  # noqa: F401
+    from .hstore import HSTORE  # noqa: F401
+    from .inet import INET  # noqa: F401
+    from .jsonb import JSONB  # noqa: F401
+    from .macaddr import (  # noqa: F401
+        MACADDR,
+        MACADDR8,
+    )
+    from .range import (  # noqa: F401
+        DATEMULTIRANGE,
+        DATERANGE,
+        INT4MULTIRANGE,
+        INT4RANGE,
+        INT8MULTIRANGE,
+        INT8RANGE,
+        NUMMULTIRANGE,
+        NUMRANGE,
+        TSMULTIRANGE,
+        TSRANGE,
+        TSTZMULTIRANGE,
+        TSTZRANGE,
+    )
+    from .trgm import (  # noqa: F401
+        String,
+        Text,
+    )
+    from .tsvector import TSVECTOR  # noqa: F401
+    from .uuid import UUID  # noqa: F401
+
+# Each field is only imported when it is first used
+_EXPORTS = {
+    "ARRAY": ".array",
+    "CIDR": ".cidr",
+    "HSTORE": ".hstore",
+    "INET": ".inet",
+    "JSONB": ".jsonb",
+    "MACADDR": ".macaddr",
+    "MACADDR8": ".macaddr",
+    "INT4RANGE": ".range",
+    "INT8RANGE": ".range",
+    "NUMRANGE": ".range",
+    "TSRANGE": ".range",
+    "TSTZRANGE": ".range",
+    "DATERANGE": ".range",
+    "INT4MULTIRANGE": ".range",
+    "INT8MULTIRANGE": ".range",
+    "NUMMULTIRANGE": ".range",
+    "TSMULTIRANGE": ".range",
+    "TSTZMULTIRANGE": ".range",
+    "DATEMULTIRANGE": ".range",
+    "String": ".trgm",
+    "Text": ".trgm",
+    "TSVECTOR": ".tsvector",
+    "UUID": ".uuid",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__} has no attribute {name}") from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,10 +1,24 @@
 from typing import (
     Any,
     Optional,
+    Sequence,
+    Union,
 )
 
 import ormar
+import sqlalchemy
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.sql.expression import ColumnElement
+
+from ..instrumentation import (
+    DECODE,
+    ENCODE,
+    instrument_codec,
+)
+from ..operators import register_operators
+from .deferred import DeferrableFieldFactory
+from .expressions import field_column
 
 
 def array_contains(self, other: Any) -> ormar.queryset.clause.FilterGroup:
@@ -43,38 +57,193 @@ def array_overlap(self, other: Any) -> ormar.queryset.clause.FilterGroup:
     return self._select_operator(op="array_overlap", other=other)
 
 
-# Need to patch the filter objects to support array specifc actions
+def array_any(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `VALUE = ANY(column)`
+
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="array_any", other=other)
+
+
+def array_cardinality(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `cardinality(column) = VALUE`
+
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="array_cardinality", other=other)
+
+
+def array_cardinality_gt(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `cardinality(column) > VALUE`
+
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="array_cardinality_gt", other=other)
+
+
+def array_cardinality_gte(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `cardinality(column) >= VALUE`
+
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="array_cardinality_gte", other=other)
+
+
+def array_cardinality_lt(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `cardinality(column) < VALUE`
+
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="array_cardinality_lt", other=other)
+
+
+def array_cardinality_lte(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `cardinality(column) <= VALUE`
+
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="array_cardinality_lte", other=other)
+
+
+# FieldAccessor methods of the operators
 FIELD_ACCESSOR_MAP = [
     ("array_contains", array_contains),
     ("array_contained_by", array_contained_by),
     ("array_overlap", array_overlap),
+    ("array_any", array_any),
+    ("array_cardinality", array_cardinality),
+    ("array_cardinality_gt", array_cardinality_gt),
+    ("array_cardinality_gte", array_cardinality_gte),
+    ("array_cardinality_lt", array_cardinality_lt),
+    ("array_cardinality_lte", array_cardinality_lte),
 ]
 
 
-for (method_name, method) in FIELD_ACCESSOR_MAP:
-    setattr(ormar.queryset.FieldAccessor, method_name, method)
-
-
-# These lines allow Ormar to lookup the new filter methods and map
-# it to the correct PGSQL functions
+# Column comparator methods the operators are mapped to in ormar's filters
 ACCESSOR_MAP = [
     ("array_contains", "contains"),
     ("array_contained_by", "contained_by"),
     ("array_overlap", "overlap"),
+    ("array_any", "any"),
+    ("array_cardinality", "cardinality_eq"),
+    ("array_cardinality_gt", "cardinality_gt"),
+    ("array_cardinality_gte", "cardinality_gte"),
+    ("array_cardinality_lt", "cardinality_lt"),
+    ("array_cardinality_lte", "cardinality_lte"),
 ]
 
-for (ormar_operation, pg_operation) in ACCESSOR_MAP:
-    ormar.queryset.actions.filter_action.FILTER_OPERATORS[
-        ormar_operation
-    ] = pg_operation
-    ormar.queryset.actions.filter_action.METHODS_TO_OPERATORS[
-        ormar_operation
-    ] = ormar_operation
+# Indexes supporting the operators, the first one is suggested when missing. The
+# any and cardinality operators can't use an index on the column
+INDEX_MAP = [
+    ("array_contains", [("gin", "array_ops")]),
+    ("array_contained_by", [("gin", "array_ops")]),
+    ("array_overlap", [("gin", "array_ops")]),
+]
+
+register_operators("array", FIELD_ACCESSOR_MAP, ACCESSOR_MAP, INDEX_MAP)
+
+
+def array_parameter(value: Any, array_type: postgresql.ARRAY) -> Any:
+    """
+    Bind a list of values as a single parameter of the given array type
+
+    `array([...])` literals of plain values are unpacked as well. They render one
+    placeholder per item, so the SQL text would change with the number of items
+    and prepared statements could not be reused between queries.
+
+    :param value: operand of an array operator
+    :type value: Any
+    :param array_type: type to bind the array as
+    :type array_type: postgresql.ARRAY
+    :return: bound parameter, or the value when it is another SQL expression
+    :rtype: Any
+    """
+    if isinstance(value, postgresql.array):
+        if not all(
+            isinstance(clause, BindParameter) and not clause.callable
+            for clause in value.clauses
+        ):
+            return value
+        value = [clause.value for clause in value.clauses]
+    if isinstance(value, (list, tuple)):
+        return sqlalchemy.bindparam(None, list(value), type_=array_type)
+    return value
 
 
-class ARRAY(ormar.fields.model_fields.ModelFieldFactory, list):
+class PostgresArrayType(postgresql.ARRAY):
+    """
+    Postgres ARRAY type binding the operands of its operators as one array
+    parameter, see `array_parameter`, and comparing the number of elements of the
+    array with the `cardinality_*` operators
+    """
+
+    class Comparator(postgresql.ARRAY.Comparator):
+        def _cardinality(self):
+            return sqlalchemy.func.cardinality(self.expr, type_=sqlalchemy.Integer)
+
+        def cardinality_eq(self, other):
+            return self._cardinality() == other
+
+        def cardinality_gt(self, other):
+            return self._cardinality() > other
+
+        def cardinality_gte(self, other):
+            return self._cardinality() >= other
+
+        def cardinality_lt(self, other):
+            return self._cardinality() < other
+
+        def cardinality_lte(self, other):
+            return self._cardinality() <= other
+
+        def contains(self, other, **kwargs):
+            return super().contains(array_parameter(other, self.type), **kwargs)
+
+        def contained_by(self, other):
+            return super().contained_by(array_parameter(other, self.type))
+
+        def overlap(self, other):
+            return super().overlap(array_parameter(other, self.type))
+
+    comparator_factory = Comparator
+
+    def bind_processor(self, dialect):
+        process = super().bind_processor(dialect)
+        return process and instrument_codec(ENCODE, "ARRAY", process)
+
+    def result_processor(self, dialect, coltype):
+        process = super().result_processor(dialect, coltype)
+        return process and instrument_codec(DECODE, "ARRAY", process)
+
+
+class ARRAY(DeferrableFieldFactory, list):
     _type = list
     _sample = []
+    _operator_modules = ("array",)
 
     def __new__(  # type: ignore
         cls, *, item_type, dimensions: Optional[int] = None, **kwargs: Any
@@ -85,4 +254,169 @@ class ARRAY(ormar.fields.model_fields.ModelFieldFactory, list):
 
     @classmethod
     def get_column_type(cls, **kwargs: Any) -> postgresql.ARRAY:
-        return postgresql.ARRAY(kwargs["item_type"], dimensions=kwargs["dimensions"])
+        return PostgresArrayType(kwargs["item_type"], dimensions=kwargs["dimensions"])
+
+
+ArrayColumn = Union[str, ColumnElement]
+
+
+def _array_column(column: ArrayColumn) -> ColumnElement:
+    if isinstance(column, str):
+        return field_column(column)
+    return column
+
+
+def _array_function(name: str, *arguments: Any) -> ColumnElement:
+    # The type of the parameters is inferred by postgres from the array column
+    return getattr(sqlalchemy.func, name)(
+        *(
+            (
+                argument
+                if isinstance(argument, ColumnElement)
+                else sqlalchemy.bindparam(None, argument)
+            )
+            for argument in arguments
+        )
+    )
+
+
+def array_append(column: ArrayColumn, value: Any) -> ColumnElement:
+    """
+    works as postgresql `array_append(column, VALUE)`, adds the value at the end
+
+    Meant to be used as an update value so the array is changed by postgres:
+    `Model.objects.filter(...).update(tags=array_append("tags", "new"))`
+
+    :param column: name of the ARRAY field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param value: element to add
+    :type value: Any
+    :return: expression with the modified array
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _array_function("array_append", _array_column(column), value)
+
+
+def array_prepend(column: ArrayColumn, value: Any) -> ColumnElement:
+    """
+    works as postgresql `array_prepend(VALUE, column)`, adds the value at the
+    start
+
+    :param column: name of the ARRAY field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param value: element to add
+    :type value: Any
+    :return: expression with the modified array
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _array_function("array_prepend", value, _array_column(column))
+
+
+def array_remove(column: ArrayColumn, value: Any) -> ColumnElement:
+    """
+    works as postgresql `array_remove(column, VALUE)`, removes all the elements
+    equal to the value
+
+    :param column: name of the ARRAY field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param value: element to remove
+    :type value: Any
+    :return: expression with the modified array
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _array_function("array_remove", _array_column(column), value)
+
+
+def array_cat(column: ArrayColumn, values: Sequence[Any]) -> ColumnElement:
+    """
+    works as postgresql `array_cat(column, VALUES)`, adds the values at the end
+
+    :param column: name of the ARRAY field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param values: elements to add
+    :type values: Sequence[Any]
+    :return: expression with the modified array
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _array_function("array_cat", _array_column(column), list(values))
+
+
+def array_union(column: ArrayColumn, values: Sequence[Any]) -> ColumnElement:
+    """
+    works as postgresql
+    `ARRAY(SELECT element FROM unnest(array_cat(column, VALUES)) ...)`, adds the
+    values at the end and removes duplicates, keeping the first occurrence of
+    each element. Meant for one dimensional arrays.
+
+    :param column: name of the ARRAY field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param values: elements to add
+    :type values: Sequence[Any]
+    :return: expression with the modified array
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    elements = (
+        sqlalchemy.func.unnest(array_cat(column, values))
+        .table_valued("element", with_ordinality="position")
+        .render_derived()
+    )
+    return sqlalchemy.func.array(
+        sqlalchemy.select(elements.c.element)
+        .group_by(elements.c.element)
+        .order_by(sqlalchemy.func.min(elements.c.position))
+        .scalar_subquery()
+    )
+
+
+def cardinality(column: ArrayColumn) -> ColumnElement:
+    """
+    works as postgresql `cardinality(column)`, the total number of elements of
+    the array, 0 for an empty array
+
+    Meant to be selected with `project` or used in `order_by` of SQL queries:
+    `project(Model.objects, "id", count=cardinality("tags"))`
+
+    :param column: name of the ARRAY field or an array expression
+    :type column: Union[str, ColumnElement]
+    :return: expression with the number of elements
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return sqlalchemy.func.cardinality(_array_column(column), type_=sqlalchemy.Integer)
+
+
+def array_length(column: ArrayColumn, dimension: int = 1) -> ColumnElement:
+    """
+    works as postgresql `array_length(column, DIMENSION)`, the length of the given
+    dimension of the array, NULL for an empty array
+
+    :param column: name of the ARRAY field or an array expression
+    :type column: Union[str, ColumnElement]
+    :param dimension: dimension to get the length of, starting at 1
+    :type dimension: int
+    :return: expression with the length of the dimension
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return sqlalchemy.func.array_length(
+        _array_column(column),
+        sqlalchemy.literal(dimension, type_=sqlalchemy.Integer),
+        type_=sqlalchemy.Integer,
+    )
+
+
+def array_position(column: ArrayColumn, value: Any) -> ColumnElement:
+    """
+    works as postgresql `array_position(column, VALUE)`, the 1 based index of the
+    first element equal to the value, NULL when it isn't in the array
+
+    :param column: name of the ARRAY field or an array expression
+    :type column: Union[str, ColumnElement]
+    :param value: element to look for
+    :type value: Any
+    :return: expression with the position of the value
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return sqlalchemy.func.array_position(
+        _array_column(column),
+        sqlalchemy.bindparam(None, value),
+        type_=sqlalchemy.Integer,
+    )
@@ -1,21 +1,16 @@
-from ipaddress import (
-    IPv4Address,
-    IPv4Interface,
-    IPv6Address,
-    IPv6Interface,
-)
-from typing import (
-    Any,
-    Union,
-)
+from typing import Any
 
-import ormar
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql.expression import Operators
 from sqlalchemy.types import TypeDecorator
 
+from .inet import (
+    IPFieldFactory,
+    IPTypeMixin,
+)
 
-class PostgresCidrTypeDecorator(TypeDecorator):
+
+class PostgresCidrTypeDecorator(IPTypeMixin, TypeDecorator):
     """
     Postgres specific CIDR type for user with Ormar
 
@@ -43,9 +38,7 @@ class PostgresCidrTypeDecorator(TypeDecorator):
             return Operators.op(self, "&&")(value)
 
 
-class CIDR(ormar.fields.model_fields.ModelFieldFactory, str):
-    _type = Union[IPv4Address, IPv6Address, IPv4Interface, IPv6Interface]
-
+class CIDR(IPFieldFactory, str):
     @classmethod
     def get_column_type(cls, **kwargs: Any) -> postgresql.CIDR:
-        return PostgresCidrTypeDecorator()
+        return PostgresCidrTypeDecorator(ip_decode=kwargs.get("ip_decode", "ipaddress"))
@@ -0,0 +1,272 @@
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import ormar
+from ormar import ModelDefinitionError
+from ormar.exceptions import ModelPersistenceError
+from ormar.fields.model_fields import is_field_nullable
+from ormar.models.excludable import ExcludableItems
+from ormar.models.mixins.excludable_mixin import ExcludableMixin
+from ormar.models.newbasemodel import NewBaseModel
+from ormar.queryset import QuerySet
+
+from ..patching import Patch
+from .index import (
+    IndexedField,
+    IndexedFieldFactory,
+)
+
+
+class DeferrableField(IndexedField):
+    """
+    Field whose column can be left out of the SELECTs of its model
+
+    Deferred fields are set to None on loaded models, like fields excluded with
+    `exclude_fields`, until they are loaded with `load_deferred` or selected
+    explicitly with `fields`.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.deferred: bool = kwargs.pop("deferred", False)
+        super().__init__(**kwargs)
+
+
+class DeferrableFieldFactory(IndexedFieldFactory):
+    """
+    Field factory accepting `deferred=True` to not load the field by default
+
+    Deferred fields accept None in python as that's their value until they are
+    loaded, the column keeps the nullability the field would have otherwise.
+    """
+
+    _bases: Any = (DeferrableField,)
+
+    def __new__(  # type: ignore
+        cls, *args: Any, **kwargs: Any
+    ) -> ormar.fields.BaseField:
+        if kwargs.get("deferred"):
+            if kwargs.get("sql_nullable") is None:
+                kwargs["sql_nullable"] = is_field_nullable(
+                    kwargs.get("nullable"),
+                    kwargs.get("default"),
+                    kwargs.get("server_default"),
+                    kwargs.get("pydantic_only", False),
+                )
+            kwargs["nullable"] = True
+            install_deferred_loading()
+        return super().__new__(cls, *args, **kwargs)
+
+    @classmethod
+    def validate(cls, **kwargs: Any) -> None:
+        if kwargs.get("deferred") and kwargs.get("primary_key"):
+            raise ModelDefinitionError("Primary key fields can't be deferred")
+        super().validate(**kwargs)
+
+
+def deferred_fields(model: Type[ormar.Model]) -> FrozenSet[str]:
+    """
+    Names of the fields of the model that are deferred
+
+    The names are kept on the Meta of the model until its fields change.
+
+    :param model: ormar model class
+    :type model: Type[ormar.Model]
+    :return: names of the deferred fields
+    :rtype: FrozenSet[str]
+    """
+    meta = model.Meta
+    fields = meta.model_fields
+    cached = vars(meta).get("_deferred_fields")
+    if cached is not None and cached[0] is fields and cached[1] == len(fields):
+        return cached[2]
+    deferred = frozenset(
+        name for name, field in fields.items() if getattr(field, "deferred", False)
+    )
+    meta._deferred_fields = (fields, len(fields), deferred)
+    return deferred
+
+
+def _deferred_to_exclude(
+    model: Type[ormar.Model], excludable: ExcludableItems, alias: str
+) -> Set[str]:
+    deferred = deferred_fields(model)
+    if not deferred:
+        return set()
+    # Fields that are selected explicitly with `fields` are loaded
+    return set(deferred - excludable.get(model_cls=model, alias=alias).include)
+
+
+# Ormar decides which columns of a model are selected and which fields are set to
+# None on the loaded models in these two methods. They are wrapped to also
+# exclude the deferred fields once a field is first declared deferred.
+def _wrap_own_table_columns(own_table_columns: Callable) -> Callable:
+    def wrapper(
+        cls,
+        model: Type[ormar.Model],
+        excludable: ExcludableItems,
+        alias: str = "",
+        use_alias: bool = False,
+        add_pk_columns: bool = True,
+    ) -> List[str]:
+        columns = own_table_columns(
+            cls,
+            model,
+            excludable,
+            alias=alias,
+            use_alias=use_alias,
+            add_pk_columns=add_pk_columns,
+        )
+        deferred = _deferred_to_exclude(model, excludable, alias)
+        if deferred:
+            columns = [
+                column
+                for column in columns
+                if (model.get_column_name_from_alias(column) if use_alias else column)
+                not in deferred
+            ]
+        return columns
+
+    return wrapper
+
+
+def _wrap_get_names_to_exclude(get_names_to_exclude: Callable) -> Callable:
+    def wrapper(cls, excludable: ExcludableItems, alias: str) -> Set:
+        return get_names_to_exclude(cls, excludable, alias) | _deferred_to_exclude(
+            cls, excludable, alias
+        )
+
+    return wrapper
+
+
+# Deferred fields left out of the SELECT each model was loaded by, by id of the
+# model as models aren't hashable. An entry goes away with its model.
+_not_loaded: Dict[int, Tuple[weakref.ref, FrozenSet[str]]] = {}
+
+
+def _set_not_loaded(instance: ormar.Model, names: FrozenSet[str]) -> None:
+    key = id(instance)
+
+    def forget(_: weakref.ref) -> None:
+        _not_loaded.pop(key, None)
+
+    _not_loaded[key] = (weakref.ref(instance, forget), names)
+    # Assigning the fields, e.g. in load_deferred, adds them back
+    instance.__fields_set__.difference_update(names)
+
+
+def not_loaded_fields(instance: ormar.Model) -> FrozenSet[str]:
+    """
+    Names of the deferred fields of a model loaded from the database that weren't
+    loaded since
+
+    A field counts as loaded once it's assigned, so after `load_deferred` or
+    setting a new value.
+
+    :param instance: ormar model
+    :type instance: ormar.Model
+    :return: names of the fields that aren't loaded
+    :rtype: FrozenSet[str]
+    """
+    entry = _not_loaded.get(id(instance))
+    if entry is None or entry[0]() is not instance:
+        return frozenset()
+    return entry[1] - instance.__fields_set__
+
+
+def _not_loaded_error(model: Type[ormar.Model], names: Iterable[str]) -> Exception:
+    return ModelPersistenceError(
+        f"Deferred fields {', '.join(sorted(names))} of {model.get_name()} "
+        "aren't loaded and can't be saved, load them with load_deferred first"
+    )
+
+
+# Ormar sets the fields excluded from the SELECT to None when it builds the models
+# of the rows. The deferred ones are recorded, and left out of the UPDATEs of
+# Model.update, and so upsert, and of bulk_update, which would write None to them.
+def _wrap_init(init: Callable) -> Callable:
+    def wrapper(self: NewBaseModel, *args: Any, **kwargs: Any) -> None:
+        excluded = kwargs.get("__excluded__")
+        init(self, *args, **kwargs)
+        if excluded:
+            names = deferred_fields(type(self)).intersection(excluded)
+            if names:
+                _set_not_loaded(self, names)
+
+    return wrapper
+
+
+def _wrap_update(update: Callable) -> Callable:
+    async def wrapper(
+        self: ormar.Model, _columns: Optional[List[str]] = None, **kwargs: Any
+    ) -> ormar.Model:
+        names = not_loaded_fields(self).difference(kwargs)
+        if names:
+            if _columns:
+                if names.intersection(_columns):
+                    raise _not_loaded_error(type(self), names.intersection(_columns))
+            else:
+                _columns = [
+                    name for name in self.Meta.model_fields if name not in names
+                ]
+        return await update(self, _columns=_columns, **kwargs)
+
+    return wrapper
+
+
+def _wrap_bulk_update(bulk_update: Callable) -> Callable:
+    async def wrapper(
+        self: QuerySet, objects: List[ormar.Model], columns: List[str] = None
+    ) -> None:
+        not_loaded = [not_loaded_fields(obj) for obj in objects]
+        names = frozenset().union(*not_loaded)
+        if names:
+            if columns:
+                if names.intersection(columns):
+                    raise _not_loaded_error(self.model, names.intersection(columns))
+            else:
+                # A field is only left out when it's loaded on none of the objects
+                partly_loaded = names - frozenset.intersection(*not_loaded)
+                if partly_loaded:
+                    raise _not_loaded_error(self.model, partly_loaded)
+                columns = [
+                    name
+                    for name in self.model.extract_db_own_fields().union(
+                        self.model.extract_related_names()
+                    )
+                    if name not in names
+                ]
+        return await bulk_update(self, objects, columns)
+
+    return wrapper
+
+
+_PATCHES = [
+    Patch(ExcludableMixin, "own_table_columns", _wrap_own_table_columns),
+    Patch(ExcludableMixin, "get_names_to_exclude", _wrap_get_names_to_exclude),
+    Patch(NewBaseModel, "__init__", _wrap_init),
+    Patch(ormar.Model, "update", _wrap_update),
+    # Wraps the patch leaving out generated TSVECTOR columns, which is then given
+    # the columns
+    Patch(QuerySet, "bulk_update", _wrap_bulk_update, order=1),
+]
+
+
+def install_deferred_loading() -> None:
+    """
+    Leave the deferred fields out of the SELECTs of their models and out of the
+    UPDATEs of models they weren't loaded for, done when the first deferred field
+    is declared
+    """
+    for patch in _PATCHES:
+        patch.install()
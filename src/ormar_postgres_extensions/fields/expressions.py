@@ -0,0 +1,82 @@
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Type,
+)
+
+import ormar
+import sqlalchemy
+from ormar.queryset import QuerySet
+from sqlalchemy.sql.elements import ClauseElement
+from sqlalchemy.sql.expression import (
+    ColumnClause,
+    ColumnElement,
+)
+from sqlalchemy.sql.visitors import replacement_traverse
+
+from ..patching import Patch
+
+
+def field_column(name: str, type_: Any = None) -> ColumnClause:
+    """
+    Column named by a field of the model the expression is used with
+
+    The column isn't bound to a table until the expression is used, `project`
+    and `QuerySet.update` replace it by the column of their model with
+    `bind_columns`.
+
+    :param name: name of the field
+    :type name: str
+    :param type_: type of the column
+    :type type_: Any
+    :return: unbound column
+    :rtype: ColumnClause
+    """
+    _UPDATE_PATCH.install()
+    return sqlalchemy.column(name, type_=type_)
+
+
+def bind_columns(model: Type[ormar.Model], expression: ColumnElement) -> ColumnElement:
+    """
+    Replace the unbound columns of the expression that name a field of the model
+    by the columns of the model table
+
+    Once bound the columns resolve to the column name of fields declared with
+    `name` and aren't ambiguous when related tables are joined.
+
+    :param model: ormar model class
+    :type model: Type[ormar.Model]
+    :param expression: SQL expression
+    :type expression: ColumnElement
+    :return: expression using the columns of the model table
+    :rtype: ColumnElement
+    """
+    model_fields = model.Meta.model_fields
+    table = model.Meta.table
+
+    def replace(element: ClauseElement) -> Optional[ClauseElement]:
+        if not isinstance(element, ColumnClause) or element.table is not None:
+            return None
+        model_field = model_fields.get(element.name)
+        if element.is_literal or model_field is None or model_field.is_relation:
+            return None
+        return table.columns[model_field.get_alias()]
+
+    return replacement_traverse(expression, {}, replace)
+
+
+# The values of QuerySet.update are only translated from field to column names
+# by their keys, the expressions are bound to the model before that. The patch is
+# installed when the first expression naming a field is built.
+def _wrap_update(update: Callable) -> Callable:
+    async def wrapper(self: QuerySet, each: bool = False, **kwargs: Any) -> int:
+        for name, value in kwargs.items():
+            if isinstance(value, ClauseElement):
+                kwargs[name] = bind_columns(self.model, value)
+        return await update(self, each=each, **kwargs)
+
+    return wrapper
+
+
+_UPDATE_PATCH = Patch(QuerySet, "update", _wrap_update)
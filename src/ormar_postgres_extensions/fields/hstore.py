@@ -0,0 +1,315 @@
+import json
+import re
+from decimal import Decimal
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+import ormar
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+
+from ..instrumentation import (
+    DECODE,
+    ENCODE,
+    instrument_codec,
+)
+from ..operators import register_operators
+from .array import array_parameter
+from .deferred import DeferrableFieldFactory
+
+HstoreDict = Dict[str, Optional[str]]
+
+
+def hstore_contained_by(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column <@ VALUE::hstore`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="hstore_contained_by", other=other)
+
+
+def hstore_contains(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column @> VALUE::hstore`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="hstore_contains", other=other)
+
+
+def hstore_has_all(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column ?& VALUE::text[]`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="hstore_has_all", other=other)
+
+
+def hstore_has_any(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column ?| VALUE::text[]`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="hstore_has_any", other=other)
+
+
+def hstore_has_key(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column ? VALUE::text`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="hstore_has_key", other=other)
+
+
+# FieldAccessor methods of the operators
+FIELD_ACCESSOR_MAP = [
+    ("hstore_contained_by", hstore_contained_by),
+    ("hstore_contains", hstore_contains),
+    ("hstore_has_all", hstore_has_all),
+    ("hstore_has_any", hstore_has_any),
+    ("hstore_has_key", hstore_has_key),
+]
+
+
+# Column comparator methods the operators are mapped to in ormar's filters
+ACCESSOR_MAP = [
+    ("hstore_contained_by", "contained_by"),
+    ("hstore_contains", "contains"),
+    ("hstore_has_all", "has_all"),
+    ("hstore_has_any", "has_any"),
+    ("hstore_has_key", "has_key"),
+]
+
+# Indexes supporting the operators, the first one is suggested when missing. No
+# index supports <@
+INDEX_MAP = [
+    (ormar_operation, [("gin", "gin_hstore_ops"), ("gist", "gist_hstore_ops")])
+    for ormar_operation, _ in ACCESSOR_MAP
+    if ormar_operation != "hstore_contained_by"
+]
+
+register_operators("hstore", FIELD_ACCESSOR_MAP, ACCESSOR_MAP, INDEX_MAP)
+
+
+# A key or value of the hstore text format, double quoted with backslash escapes
+# like postgres outputs them or a bare word
+_ITEM = r'"((?:[^"\\]|\\.)*)"|([^\s",=>]+)'
+_PAIR = re.compile(rf"\s*(?:{_ITEM})\s*=>\s*(?:{_ITEM})\s*(,|$)", re.DOTALL)
+_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def _unescape(value: str) -> str:
+    return _ESCAPE.sub(r"\1", value) if "\\" in value else value
+
+
+def parse_hstore(value: str) -> HstoreDict:
+    """
+    Parse the hstore text format, e.g. `"a"=>"1", "b"=>NULL`, into a dict
+
+    :param value: hstore in its text format
+    :type value: str
+    :return: the keys and values
+    :rtype: Dict[str, Optional[str]]
+    """
+    result: HstoreDict = {}
+    position = 0
+    end = len(value.rstrip())
+    while position < end:
+        match = _PAIR.match(value, position)
+        if match is None:
+            raise ValueError(f"malformed hstore literal: {value!r}")
+        quoted_key, key, quoted_value, bare_value, _ = match.groups()
+        if quoted_key is not None:
+            key = _unescape(quoted_key)
+        if quoted_value is not None:
+            result[key] = _unescape(quoted_value)
+        else:
+            result[key] = None if bare_value.upper() == "NULL" else bare_value
+        position = match.end()
+    return result
+
+
+_JSON = json.JSONDecoder(strict=False)
+# Opening quote of a key or value followed by `=>`
+_STARTS_WITH_SEPARATOR = re.compile(r'(?:^|=>|, )"=>')
+
+
+def _decode_hstore(value: str) -> HstoreDict:
+    # Postgres outputs `"key"=>"value", "key"=>NULL` and only escapes quotes and
+    # backslashes inside of strings. Without any backslash every quote delimits a
+    # string, so `"=>` is a separator unless a string starts with `=>`, which shows
+    # as an opening quote followed by `=>`. Otherwise the text becomes a JSON object
+    # by replacing the separators, which the C decoder of json parses ten times
+    # faster than the regex
+    if "\\" not in value and not _STARTS_WITH_SEPARATOR.search(value):
+        return _JSON.decode(
+            "{" + value.replace('"=>"', '":"').replace('"=>NULL', '":null') + "}"
+        )
+    return parse_hstore(value)
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return str(value)
+    raise TypeError(f"hstore keys and values must be strings, got {value!r}")
+
+
+def to_hstore(value: Any) -> HstoreDict:
+    """
+    Convert a dict, a list of key, value pairs or the hstore text format to the
+    dict of strings an hstore holds, numbers are converted to strings
+
+    :param value: value to convert
+    :type value: Any
+    :return: the keys and values
+    :rtype: Dict[str, Optional[str]]
+    """
+    if isinstance(value, str):
+        return parse_hstore(value)
+    items = value.items() if isinstance(value, dict) else value
+    if isinstance(value, dict) and all(
+        type(key) is str and (item is None or type(item) is str) for key, item in items
+    ):
+        return value
+    return {_text(key): None if item is None else _text(item) for key, item in items}
+
+
+class HstoreValue(dict):
+    """
+    Type of the values of HSTORE fields, converts them with `to_hstore`
+    """
+
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Callable[[Any], HstoreDict]]:
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> HstoreDict:
+        return to_hstore(value)
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: dict) -> None:
+        field_schema.update(
+            type="object", additionalProperties={"type": "string", "nullable": True}
+        )
+
+
+def _pairs(value: Any) -> Optional[List[List[Optional[str]]]]:
+    if value is None:
+        return None
+    return [[key, item] for key, item in to_hstore(value).items()]
+
+
+_TEXT_ARRAY = postgresql.ARRAY(sqlalchemy.Text)
+
+_TYPE_SCHEMA = (
+    "SELECT typnamespace::regnamespace::text FROM pg_type WHERE oid = to_regtype($1)"
+)
+
+
+async def type_schema(connection: Any, type_name: str) -> str:
+    """
+    Schema of a type as found on the search path of the connection, e.g. the one
+    the hstore extension was created in
+    """
+    schema = await connection.fetchval(_TYPE_SCHEMA, type_name)
+    if schema is None:
+        raise ValueError(f"Type {type_name} doesn't exist")
+    return schema
+
+
+async def register_hstore_codec(connection: Any) -> None:
+    """
+    Install the binary hstore codec of asyncpg on a connection so that values are
+    decoded to dicts by the driver instead of being returned in the text format
+    and parsed again in python.
+
+    Meant to be passed as the `init` callback of the connection pool:
+
+        databases.Database(url, init=ormar_pg_ext.register_hstore_codec)
+
+    The hstore extension has to exist in the database when the connection is made.
+
+    :param connection: asyncpg connection
+    :type connection: asyncpg.Connection
+    """
+    await connection.set_builtin_type_codec(
+        "hstore",
+        schema=await type_schema(connection, "hstore"),
+        codec_name="pg_contrib.hstore",
+    )
+
+
+class PostgresHstoreType(postgresql.HSTORE):
+    """
+    Postgres HSTORE type that doesn't serialize values to the hstore text format
+
+    Values are bound as a two dimensional text array of key, value pairs turned
+    into an hstore by postgres, `hstore(VALUE::text[])`, so asyncpg encodes them
+    natively. Values decoded by the connection (see `register_hstore_codec`) are
+    passed through, the text format is parsed otherwise.
+
+    The keys given to `has_all` and `has_any` are bound as one text array.
+    """
+
+    class Comparator(postgresql.HSTORE.Comparator):
+        def has_all(self, other):
+            return super().has_all(array_parameter(other, _TEXT_ARRAY))
+
+        def has_any(self, other):
+            return super().has_any(array_parameter(other, _TEXT_ARRAY))
+
+    comparator_factory = Comparator
+
+    def bind_expression(self, bindvalue):
+        return sqlalchemy.func.hstore(
+            sqlalchemy.cast(bindvalue, _TEXT_ARRAY), type_=postgresql.HSTORE
+        )
+
+    def bind_processor(self, dialect):
+        return instrument_codec(ENCODE, "HSTORE", _pairs)
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if isinstance(value, str):
+                return _decode_hstore(value)
+            return value
+
+        return instrument_codec(DECODE, "HSTORE", process)
+
+
+class HSTORE(DeferrableFieldFactory, dict):
+    """
+    Flat map of strings using the PG HSTORE type of the hstore extension
+
+    Values are dicts of strings, None values are NULL in the hstore.
+    """
+
+    _type = HstoreValue
+    _operator_modules = ("hstore",)
+
+    @classmethod
+    def get_column_type(cls, **kwargs: Any) -> postgresql.HSTORE:
+        return PostgresHstoreType()
@@ -0,0 +1,96 @@
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import ormar
+import sqlalchemy
+from ormar import ModelDefinitionError
+
+from ..operators import install_operators
+
+INDEX_METHODS = {"btree", "hash", "gist", "spgist", "gin", "brin"}
+
+
+class IndexedField(ormar.fields.BaseField):
+    """
+    Field that can declare a Postgres specific index on its column
+
+    The index is attached to the column when it is created, so it is part of the
+    table and emitted by `metadata.create_all` like any other index.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.index_method: Optional[str] = kwargs.pop("index_method", None)
+        self.index_opclass: Optional[str] = kwargs.pop("index_opclass", None)
+        super().__init__(**kwargs)
+
+    def get_column(self, name: str) -> sqlalchemy.Column:
+        column = super().get_column(name)
+        if self.index_method:
+            sqlalchemy.Index(
+                None,
+                column,
+                postgresql_using=self.index_method,
+                postgresql_ops=(
+                    {column.name: self.index_opclass} if self.index_opclass else {}
+                ),
+            )
+        return column
+
+
+class IndexedFieldFactory(ormar.fields.model_fields.ModelFieldFactory):
+    """
+    Field factory accepting an index access method as `index`, e.g.
+    `index="gin"`, and an operator class for it as `opclass`.
+
+    `_index_opclasses` holds the operator class used for an access method when
+    none is given, for types that have no default one in Postgres.
+
+    `_operator_modules` names the registered operators the field is filtered
+    with, they are installed in ormar when the first field is declared.
+    """
+
+    _bases: Any = (IndexedField,)
+    _index_opclasses: Dict[str, str] = {}
+    _operator_modules: Tuple[str, ...] = ()
+
+    def __new__(  # type: ignore
+        cls,
+        *args: Any,
+        index: Union[bool, str] = False,
+        opclass: Optional[str] = None,
+        **kwargs: Any,
+    ) -> ormar.fields.BaseField:
+        install_operators(*cls._operator_modules)
+
+        index_method = None
+        if isinstance(index, str):
+            index_method = index.lower()
+            if index_method not in INDEX_METHODS:
+                raise ModelDefinitionError(
+                    f"Unknown index method '{index}', "
+                    f"use one of {', '.join(sorted(INDEX_METHODS))}"
+                )
+            index = False
+        elif opclass:
+            if not index:
+                raise ModelDefinitionError("opclass can only be set for an index")
+            # A plain index=True with an operator class is a btree index
+            index_method = "btree"
+            index = False
+
+        if index_method and not opclass:
+            opclass = cls._index_opclasses.get(index_method)
+
+        return super().__new__(
+            cls,
+            *args,
+            **kwargs,
+            index=index,
+            index_method=index_method,
+            index_opclass=opclass,
+        )
@@ -1,19 +1,32 @@
 from ipaddress import (
     IPv4Address,
     IPv4Interface,
+    IPv4Network,
     IPv6Address,
     IPv6Interface,
+    IPv6Network,
+    ip_address,
+    ip_interface,
 )
 from typing import (
     Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
     Union,
 )
 
 import ormar
+from ormar import ModelDefinitionError
+from pydantic.json import ENCODERS_BY_TYPE
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql.expression import Operators
 from sqlalchemy.types import TypeDecorator
 
+from ..operators import register_operators
+from .index import IndexedFieldFactory
+
 
 def contained_by(self, other: Any) -> ormar.queryset.clause.FilterGroup:
     """
@@ -45,7 +58,7 @@ def contains_subnet(self, other: Any) -> ormar.queryset.clause.FilterGroup:
     :return: FilterGroup for operator
     :rtype: ormar.queryset.clause.FilterGroup
     """
-    return self._select_operator(op="contains", other=other)
+    return self._select_operator(op="contains_subnet", other=other)
 
 
 def contains_subnet_eq(self, other: Any) -> ormar.queryset.clause.FilterGroup:
@@ -70,7 +83,7 @@ def contains_or_eq(self, other: Any) -> ormar.queryset.clause.FilterGroup:
     return self._select_operator(op="contains_or_eq", other=other)
 
 
-# Need to patch the filter objects to support JSONB specifc actions
+# FieldAccessor methods of the operators
 FIELD_ACCESSOR_MAP = [
     ("contained_by", contained_by),
     ("contained_by_eq", contained_by_eq),
@@ -80,12 +93,7 @@ FIELD_ACCESSOR_MAP = [
 ]
 
 
-for (method_name, method) in FIELD_ACCESSOR_MAP:
-    setattr(ormar.queryset.FieldAccessor, method_name, method)
-
-
-# These lines allow Ormar to lookup the new filter methods and map
-# it to the correct PGSQL functions
+# Column comparator methods the operators are mapped to in ormar's filters
 ACCESSOR_MAP = [
     ("contained_by", "contained_by"),
     ("contained_by_eq", "contained_by_eq"),
@@ -94,16 +102,238 @@ ACCESSOR_MAP = [
     ("contains_or_eq", "contains_or_eq"),
 ]
 
-for (ormar_operation, pg_operation) in ACCESSOR_MAP:
-    ormar.queryset.actions.filter_action.FILTER_OPERATORS[
-        ormar_operation
-    ] = pg_operation
-    ormar.queryset.actions.filter_action.METHODS_TO_OPERATORS[
-        ormar_operation
-    ] = ormar_operation
+# Indexes supporting the operators, the first one is suggested when missing
+INDEX_MAP = [
+    (ormar_operation, [("gist", "inet_ops"), ("spgist", "inet_ops")])
+    for ormar_operation, _ in ACCESSOR_MAP
+]
+
+register_operators("inet", FIELD_ACCESSOR_MAP, ACCESSOR_MAP, INDEX_MAP)
+
+IPAddress = Union[
+    IPv4Address,
+    IPv6Address,
+    IPv4Interface,
+    IPv6Interface,
+    IPv4Network,
+    IPv6Network,
+]
 
+# Interfaces are subclasses of the address classes
+_ADDRESS_TYPES = (IPv4Address, IPv6Address, IPv4Network, IPv6Network)
 
-class PostgresInetTypeDecorator(TypeDecorator):
+# Address family byte of the binary inet/cidr format, PGSQL_AF_INET and
+# PGSQL_AF_INET6 in postgres
+PGSQL_AF_INET = 2
+PGSQL_AF_INET6 = 3
+
+_FAMILY_CLASSES = {
+    PGSQL_AF_INET: (IPv4Address, IPv4Interface, IPv4Network),
+    PGSQL_AF_INET6: (IPv6Address, IPv6Interface, IPv6Network),
+}
+
+
+def parse_address(value: Union[str, int]) -> IPAddress:
+    """
+    Parse an address like the INET and CIDR fields validate their values, as an
+    address when there's no netmask and as an interface otherwise
+    """
+    try:
+        return ip_address(value)
+    except ValueError:
+        return ip_interface(value)
+
+
+def decode_inet_binary(value: bytes) -> IPAddress:
+    """
+    Build the ipaddress object of a value in the binary inet/cidr format the way
+    asyncpg does, a network for cidr values, an address when the netmask covers
+    the whole address and an interface otherwise
+    """
+    family, bits, is_cidr = value[0], value[1], value[2]
+    packed = value[4:]
+    address, interface, network = _FAMILY_CLASSES[family]
+    if is_cidr:
+        return network((packed, bits))
+    if bits == len(packed) * 8:
+        return address(packed)
+    return interface((packed, bits))
+
+
+def encode_inet_binary(value: Any) -> bytes:
+    if isinstance(value, CompactIPAddress):
+        value = value.raw
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, (str, int)):
+        value = parse_address(value)
+    if isinstance(value, (IPv4Network, IPv6Network)):
+        packed, bits, is_cidr = value.network_address.packed, value.prefixlen, 1
+    elif isinstance(value, (IPv4Interface, IPv6Interface)):
+        packed, bits, is_cidr = value.packed, value.network.prefixlen, 0
+    else:
+        packed, bits, is_cidr = value.packed, value.max_prefixlen, 0
+    family = PGSQL_AF_INET if value.version == 4 else PGSQL_AF_INET6
+    return bytes((family, bits, is_cidr, len(packed))) + packed
+
+
+def _inet_key(value: Any) -> bytes:
+    # Values compare like they do in postgres, where a cidr value equals the inet
+    # value with the same address and netmask. That's the binary value without
+    # the cidr flag.
+    binary = encode_inet_binary(value)
+    return binary[:2] + binary[3:]
+
+
+async def register_inet_codec(connection: Any) -> None:
+    """
+    Install binary inet and cidr codecs on an asyncpg connection that hand values
+    over in their wire format instead of building an ipaddress object for each
+    of them. Fields with `ip_decode="lazy"` or `"compact"` keep that value and
+    only build the ipaddress object when it's used, the other fields build it
+    when the row is loaded.
+
+    Meant to be passed as the `init` callback of the connection pool:
+
+        databases.Database(url, init=ormar_pg_ext.register_inet_codec)
+
+    :param connection: asyncpg connection
+    :type connection: asyncpg.Connection
+    """
+    for type_name in ("inet", "cidr"):
+        await connection.set_type_codec(
+            type_name,
+            schema="pg_catalog",
+            encoder=encode_inet_binary,
+            # asyncpg passes the binary value as bytes, it is kept as is
+            decoder=bytes,
+            format="binary",
+        )
+
+
+class CompactIPAddress:
+    """
+    inet/cidr value keeping what the database driver returned and building the
+    ipaddress object only when it's used
+
+    `raw` is the value in the binary wire format on connections with the codec of
+    `register_inet_codec` and the ipaddress object asyncpg built otherwise. The
+    ipaddress object isn't kept, it is built again on every access, so loaded
+    values that are rarely used stay as small as possible.
+
+    Attributes of the ipaddress object, e.g. `version` or `network`, can be used
+    on the value directly. Values are equal to the values and ipaddress objects
+    with the same address and netmask, like inet and cidr values in postgres.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: Union[bytes, IPAddress]) -> None:
+        self.raw = raw
+
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Callable[[Any], "CompactIPAddress"]]:
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
+        field_schema.update(type="string", format="ipvanyinterface")
+
+    @classmethod
+    def validate(cls, value: Any) -> "CompactIPAddress":
+        if type(value) is cls:
+            return value
+        if isinstance(value, CompactIPAddress):
+            return cls(value.raw)
+        if isinstance(value, (str, int)):
+            # Values that don't come from the database are checked right away
+            return cls(parse_address(value))
+        if isinstance(value, (bytes,) + _ADDRESS_TYPES):
+            return cls(value)
+        raise TypeError(f"{value!r} is not a valid IP address")
+
+    @property
+    def address(self) -> IPAddress:
+        raw = self.raw
+        return decode_inet_binary(raw) if isinstance(raw, bytes) else raw
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that aren't found. Unset slots must not be
+        # looked up on the address which needs them.
+        if name.startswith("_") or name == "raw":
+            raise AttributeError(name)
+        return getattr(self.address, name)
+
+    def __str__(self) -> str:
+        return str(self.address)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (CompactIPAddress,) + _ADDRESS_TYPES):
+            return NotImplemented
+        return _inet_key(self) == _inet_key(other)
+
+    def __hash__(self) -> int:
+        return hash(_inet_key(self))
+
+
+class LazyIPAddress(CompactIPAddress):
+    """
+    Like `CompactIPAddress` but the ipaddress object is kept once it's built, for
+    values that are used repeatedly after they are loaded
+    """
+
+    __slots__ = ("_address",)
+
+    @property
+    def address(self) -> IPAddress:
+        try:
+            return self._address
+        except AttributeError:
+            self._address = address = CompactIPAddress.address.fget(self)
+            return address
+
+
+ENCODERS_BY_TYPE[CompactIPAddress] = str
+
+IP_DECODES = {"ipaddress", "lazy", "compact"}
+
+# Python types of the values of the lazily decoded fields
+IP_VALUE_TYPES = {"lazy": LazyIPAddress, "compact": CompactIPAddress}
+
+
+def _result_address(value: Any) -> Any:
+    return decode_inet_binary(value) if isinstance(value, bytes) else value
+
+
+class IPTypeMixin:
+    """
+    Value processing shared by the INET and CIDR column types
+
+    Fields decoded lazily get what the driver returns untouched, the values are
+    wrapped when the model is validated.
+    """
+
+    def __init__(self, ip_decode: str = "ipaddress") -> None:
+        super().__init__()
+        self.ip_decode = ip_decode
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if isinstance(value, CompactIPAddress):
+            return value.address
+        return value
+
+    def result_processor(
+        self, dialect: Any, coltype: Any
+    ) -> Optional[Callable[[Any], Any]]:
+        if self.ip_decode != "ipaddress":
+            return None
+        return _result_address
+
+
+class PostgresInetTypeDecorator(IPTypeMixin, TypeDecorator):
     """
     Postgres specific INET type for user with Ormar
 
@@ -131,9 +361,42 @@ class PostgresInetTypeDecorator(TypeDecorator):
             return Operators.op(self, "&&")(value)
 
 
-class INET(ormar.fields.model_fields.ModelFieldFactory, str):
+class IPFieldFactory(IndexedFieldFactory):
+    """
+    Base of the INET and CIDR fields
+
+    Values are ipaddress objects by default. With `ip_decode="lazy"` they are
+    `LazyIPAddress` and with `ip_decode="compact"` `CompactIPAddress` wrappers
+    that only build the ipaddress object when it's used, which saves time and
+    memory for large results together with `register_inet_codec`.
+    """
+
     _type = Union[IPv4Address, IPv6Address, IPv4Interface, IPv6Interface]
+    # There is no default GiST operator class for inet/cidr
+    _index_opclasses = {"gist": "inet_ops"}
+    _operator_modules = ("inet",)
+
+    def __new__(  # type: ignore
+        cls, *args: Any, **kwargs: Any
+    ) -> ormar.fields.BaseField:
+        field = super().__new__(cls, *args, **kwargs)
+        value_type = IP_VALUE_TYPES.get(kwargs.get("ip_decode", "ipaddress"))
+        if value_type is not None:
+            field.__type__ = field.__pydantic_type__ = value_type
+        return field
+
+    @classmethod
+    def validate(cls, **kwargs: Any) -> None:
+        ip_decode = kwargs.get("ip_decode", "ipaddress")
+        if ip_decode not in IP_DECODES:
+            raise ModelDefinitionError(
+                f"Unknown ip_decode '{ip_decode}', "
+                f"use one of {', '.join(sorted(IP_DECODES))}"
+            )
+        super().validate(**kwargs)
+
 
+class INET(IPFieldFactory, str):
     @classmethod
     def get_column_type(cls, **kwargs: Any) -> postgresql.INET:
-        return PostgresInetTypeDecorator()
+        return PostgresInetTypeDecorator(ip_decode=kwargs.get("ip_decode", "ipaddress"))
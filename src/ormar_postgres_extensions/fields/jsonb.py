@@ -1,7 +1,129 @@
-from typing import Any
+import json
+from typing import (
+    Any,
+    Callable,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import ormar
+import sqlalchemy
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import elements
+from sqlalchemy.sql.expression import ColumnElement
+
+from ..instrumentation import (
+    DECODE,
+    ENCODE,
+    instrument_codec,
+)
+from ..operators import register_operators
+from .array import array_parameter
+from .deferred import DeferrableFieldFactory
+from .expressions import field_column
+
+try:
+    import orjson
+except ImportError:  # pragma: no-cover
+    orjson = None
+
+
+class JSONCodec(NamedTuple):
+    """
+    Functions used to serialize and deserialize JSONB documents
+
+    `dumps` may return either str or bytes (like orjson does) and `loads` has to
+    accept both str and bytes.
+    """
+
+    dumps: Callable[[Any], Union[str, bytes]]
+    loads: Callable[[Union[str, bytes]], Any]
+
+
+if orjson is not None:
+    DEFAULT_JSON_CODEC = JSONCodec(dumps=orjson.dumps, loads=orjson.loads)
+else:  # pragma: no-cover
+    DEFAULT_JSON_CODEC = JSONCodec(dumps=json.dumps, loads=json.loads)
+
+_json_codec = DEFAULT_JSON_CODEC
+
+# First byte of the binary representation of a jsonb value
+JSONB_BINARY_FORMAT_VERSION = b"\x01"
+
+
+def set_json_codec(
+    dumps: Optional[Callable[[Any], Union[str, bytes]]] = None,
+    loads: Optional[Callable[[Union[str, bytes]], Any]] = None,
+) -> None:
+    """
+    Set the codec used by all JSONB fields that don't declare their own and by
+    the connection codec installed with `register_jsonb_codec`.
+
+    Passing no arguments restores the default codec (orjson when installed).
+
+    :param dumps: function serializing a python object to JSON
+    :type dumps: Callable[[Any], Union[str, bytes]]
+    :param loads: function parsing JSON into a python object
+    :type loads: Callable[[Union[str, bytes]], Any]
+    """
+    global _json_codec
+    _json_codec = JSONCodec(
+        dumps=dumps or DEFAULT_JSON_CODEC.dumps,
+        loads=loads or DEFAULT_JSON_CODEC.loads,
+    )
+
+
+def get_json_codec() -> JSONCodec:
+    return _json_codec
+
+
+def _encode_jsonb_binary(value: Any) -> bytes:
+    # Like the default asyncpg codec strings are treated as already serialized JSON
+    # which is what the JSONB column type sends
+    if isinstance(value, str):
+        return JSONB_BINARY_FORMAT_VERSION + value.encode("utf-8")
+    serialized = _json_codec.dumps(value)
+    if isinstance(serialized, str):
+        serialized = serialized.encode("utf-8")
+    return JSONB_BINARY_FORMAT_VERSION + serialized
+
+
+class DecodedJSONString(str):
+    """
+    A top level JSON string decoded by the connection codec. Marks the value so it
+    isn't mistaken for serialized JSON that still needs to be parsed.
+    """
+
+
+def _decode_jsonb_binary(value: bytes) -> Any:
+    decoded = _json_codec.loads(value[1:])
+    if isinstance(decoded, str):
+        return DecodedJSONString(decoded)
+    return decoded
+
+
+async def register_jsonb_codec(connection: Any) -> None:
+    """
+    Install a binary jsonb codec on an asyncpg connection so that documents are
+    decoded straight from the wire by the configured JSON codec instead of being
+    returned as text and parsed again by SQLAlchemy.
+
+    Meant to be passed as the `init` callback of the connection pool:
+
+        databases.Database(url, init=ormar_pg_ext.register_jsonb_codec)
+
+    :param connection: asyncpg connection
+    :type connection: asyncpg.Connection
+    """
+    await connection.set_type_codec(
+        "jsonb",
+        schema="pg_catalog",
+        encoder=instrument_codec(ENCODE, "JSONB", _encode_jsonb_binary),
+        decoder=instrument_codec(DECODE, "JSONB", _decode_jsonb_binary),
+        format="binary",
+    )
 
 
 def jsonb_contained_by(self, other: Any) -> ormar.queryset.clause.FilterGroup:
@@ -28,7 +150,7 @@ def jsonb_contains(self, other: Any) -> ormar.queryset.clause.FilterGroup:
 
 def jsonb_has_all(self, other: Any) -> ormar.queryset.clause.FilterGroup:
     """
-    works as postgresql `column ?& VALUE::jsonb`
+    works as postgresql `column ?& VALUE::text[]`
     :param other: value to check against operator
     :type other: Any
     :return: FilterGroup for operator
@@ -39,7 +161,7 @@ def jsonb_has_all(self, other: Any) -> ormar.queryset.clause.FilterGroup:
 
 def jsonb_has_any(self, other: Any) -> ormar.queryset.clause.FilterGroup:
     """
-    works as postgresql `column ?| VALUE::jsonb`
+    works as postgresql `column ?| VALUE::text[]`
     :param other: value to check against operator
     :type other: Any
     :return: FilterGroup for operator
@@ -59,44 +181,365 @@ def jsonb_has_key(self, other: Any) -> ormar.queryset.clause.FilterGroup:
     return self._select_operator(op="jsonb_has_key", other=other)
 
 
-# Need to patch the filter objects to support JSONB specifc actions
+def jsonb_path_exists(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column @? VALUE::jsonpath`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="jsonb_path_exists", other=other)
+
+
+def jsonb_path_match(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column @@ VALUE::jsonpath`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="jsonb_path_match", other=other)
+
+
+# FieldAccessor methods of the operators
 FIELD_ACCESSOR_MAP = [
     ("jsonb_contained_by", jsonb_contained_by),
     ("jsonb_contains", jsonb_contains),
     ("jsonb_has_all", jsonb_has_all),
     ("jsonb_has_any", jsonb_has_any),
     ("jsonb_has_key", jsonb_has_key),
+    ("jsonb_path_exists", jsonb_path_exists),
+    ("jsonb_path_match", jsonb_path_match),
 ]
 
 
-for (method_name, method) in FIELD_ACCESSOR_MAP:
-    setattr(ormar.queryset.FieldAccessor, method_name, method)
-
-
-# These lines allow Ormar to lookup the new filter methods and map
-# it to the correct PGSQL functions
+# Column comparator methods the operators are mapped to in ormar's filters
 ACCESSOR_MAP = [
     ("jsonb_contained_by", "contained_by"),
     ("jsonb_contains", "contains"),
     ("jsonb_has_all", "has_all"),
     ("jsonb_has_any", "has_any"),
     ("jsonb_has_key", "has_key"),
+    ("jsonb_path_exists", "path_exists"),
+    ("jsonb_path_match", "path_match"),
 ]
 
-for (ormar_operation, pg_operation) in ACCESSOR_MAP:
-    ormar.queryset.actions.filter_action.FILTER_OPERATORS[
-        ormar_operation
-    ] = pg_operation
-    ormar.queryset.actions.filter_action.METHODS_TO_OPERATORS[
-        ormar_operation
-    ] = ormar_operation
+# Indexes supporting the operators, the first one is suggested when missing.
+# Only the default jsonb_ops operator class supports the key operators and no
+# index supports <@
+INDEX_MAP = [
+    ("jsonb_contains", [("gin", "jsonb_ops"), ("gin", "jsonb_path_ops")]),
+    ("jsonb_has_all", [("gin", "jsonb_ops")]),
+    ("jsonb_has_any", [("gin", "jsonb_ops")]),
+    ("jsonb_has_key", [("gin", "jsonb_ops")]),
+    ("jsonb_path_exists", [("gin", "jsonb_ops"), ("gin", "jsonb_path_ops")]),
+    ("jsonb_path_match", [("gin", "jsonb_ops"), ("gin", "jsonb_path_ops")]),
+]
+
+register_operators("jsonb", FIELD_ACCESSOR_MAP, ACCESSOR_MAP, INDEX_MAP)
+
+
+_TEXT_ARRAY = postgresql.ARRAY(sqlalchemy.Text)
+
+
+class JSONPathType(sqlalchemy.types.UserDefinedType):
+    """
+    Postgres jsonpath type, paths are sent as strings
+    """
+
+    cache_ok = True
+
+    def get_col_spec(self, **kwargs: Any) -> str:
+        return "JSONPATH"
+
+
+def _jsonpath(path: Any) -> Any:
+    if isinstance(path, elements.ClauseElement):
+        return path
+    return sqlalchemy.bindparam(None, path, type_=JSONPathType())
+
+
+class PostgresJSONBType(postgresql.JSONB):
+    """
+    Postgres JSONB type that serializes documents with a pluggable JSON codec
+
+    Values that were already decoded by the connection (see `register_jsonb_codec`)
+    are passed through untouched instead of being parsed a second time.
+
+    The keys given to `has_all` and `has_any` are bound as one text array.
+    `path_exists` and `path_match` take a jsonpath as a string.
+    """
+
+    class Comparator(postgresql.JSONB.Comparator):
+        def path_exists(self, other):
+            return self.expr.op("@?", is_comparison=True)(_jsonpath(other))
+
+        def path_match(self, other):
+            return self.expr.op("@@", is_comparison=True)(_jsonpath(other))
+
+        def has_all(self, other):
+            return super().has_all(array_parameter(other, _TEXT_ARRAY))
+
+        def has_any(self, other):
+            return super().has_any(array_parameter(other, _TEXT_ARRAY))
+
+    comparator_factory = Comparator
+
+    def __init__(
+        self,
+        none_as_null: bool = False,
+        json_dumps: Optional[Callable[[Any], Union[str, bytes]]] = None,
+        json_loads: Optional[Callable[[Union[str, bytes]], Any]] = None,
+    ) -> None:
+        super().__init__(none_as_null=none_as_null)
+        self.json_dumps = json_dumps
+        self.json_loads = json_loads
 
+    def bind_processor(self, dialect):
+        json_dumps = self.json_dumps
 
-class JSONB(ormar.JSON):
+        def process(value):
+            if value is self.NULL:
+                value = None
+            elif isinstance(value, elements.Null) or (
+                value is None and self.none_as_null
+            ):
+                return None
+
+            serialized = (json_dumps or _json_codec.dumps)(value)
+            if isinstance(serialized, bytes):
+                serialized = serialized.decode("utf-8")
+            return serialized
+
+        return instrument_codec(ENCODE, "JSONB", process)
+
+    def result_processor(self, dialect, coltype):
+        json_loads = self.json_loads
+
+        def process(value):
+            if not isinstance(value, (str, bytes)) or isinstance(
+                value, DecodedJSONString
+            ):
+                return value
+            return (json_loads or _json_codec.loads)(value)
+
+        return instrument_codec(DECODE, "JSONB", process)
+
+
+class JSONB(DeferrableFieldFactory, ormar.JSON):
     """
     Custom JSON field uses a native PG JSONB type
+
+    Accepts optional `json_dumps` and `json_loads` functions to use for this field
+    instead of the global codec set with `set_json_codec`.
     """
 
+    _operator_modules = ("jsonb",)
+
     @classmethod
     def get_column_type(cls, **kwargs: Any) -> postgresql.JSONB:
-        return postgresql.JSONB()
+        return PostgresJSONBType(
+            json_dumps=kwargs.get("json_dumps"), json_loads=kwargs.get("json_loads")
+        )
+
+
+JSONBColumn = Union[str, ColumnElement]
+
+
+def _jsonb_column(column: JSONBColumn) -> ColumnElement:
+    if isinstance(column, str):
+        return field_column(column, type_=PostgresJSONBType())
+    return column
+
+
+def jsonb_path(
+    column: JSONBColumn, *path: Union[str, int], as_text: bool = False
+) -> ColumnElement:
+    """
+    works as postgresql `column -> 'a' -> 'b'` or `column -> 'a' ->> 'b'` when
+    as_text is set. Integers in the path index into JSON arrays.
+
+    :param column: name of the JSONB field or the column itself
+    :type column: Union[str, ColumnElement]
+    :param path: keys to follow into the document
+    :type path: Union[str, int]
+    :param as_text: return the last element as text instead of JSONB
+    :type as_text: bool
+    :return: expression selecting the value at the path
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    if not path:
+        raise ValueError("jsonb_path needs at least one key")
+
+    expression = _jsonb_column(column)
+    for key in path:
+        # Without the cast postgres can't tell `-> int` from `-> text` and asyncpg
+        # would refuse to send the integer as a text parameter
+        if isinstance(key, int):
+            key = sqlalchemy.cast(sqlalchemy.literal(key), sqlalchemy.Integer)
+        expression = expression[key]
+    return expression.astext if as_text else expression
+
+
+def _text_path(path: Sequence[Union[str, int]]) -> ColumnElement:
+    return sqlalchemy.literal(
+        [str(key) for key in path], type_=postgresql.ARRAY(sqlalchemy.Text)
+    )
+
+
+def jsonb_set(
+    column: JSONBColumn,
+    path: Sequence[Union[str, int]],
+    value: Any,
+    create_missing: bool = True,
+) -> ColumnElement:
+    """
+    works as postgresql `jsonb_set(column, '{a,b}', VALUE::jsonb, create_missing)`
+
+    Meant to be used as an update value so only the changed key is sent:
+    `Model.objects.filter(...).update(data=jsonb_set("data", ["a", "b"], 1))`
+
+    :param column: name of the JSONB field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param path: keys (or array indexes) leading to the value to replace
+    :type path: Sequence[Union[str, int]]
+    :param value: new value, serialized to JSON
+    :type value: Any
+    :param create_missing: add the key if it does not exist yet
+    :type create_missing: bool
+    :return: expression with the modified document
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return sqlalchemy.func.jsonb_set(
+        _jsonb_column(column),
+        _text_path(path),
+        sqlalchemy.literal(value, type_=PostgresJSONBType()),
+        sqlalchemy.literal(create_missing, type_=sqlalchemy.Boolean),
+        type_=PostgresJSONBType(),
+    )
+
+
+def jsonb_merge(column: JSONBColumn, value: Any) -> ColumnElement:
+    """
+    works as postgresql `column || VALUE::jsonb`, top level keys of the value
+    replace the ones in the document
+
+    :param column: name of the JSONB field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param value: document to merge in, serialized to JSON
+    :type value: Any
+    :return: expression with the modified document
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _jsonb_column(column).op("||", return_type=PostgresJSONBType())(
+        sqlalchemy.literal(value, type_=PostgresJSONBType())
+    )
+
+
+def jsonb_remove(
+    column: JSONBColumn, key: Union[str, int, Sequence[str]]
+) -> ColumnElement:
+    """
+    works as postgresql `column - VALUE`, removes a top level key, all keys of a
+    list of keys or an array element when given an integer
+
+    :param column: name of the JSONB field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param key: key, list of keys or array index to remove
+    :type key: Union[str, int, Sequence[str]]
+    :return: expression with the modified document
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    if isinstance(key, str):
+        operand = sqlalchemy.cast(sqlalchemy.literal(key), sqlalchemy.Text)
+    elif isinstance(key, int):
+        operand = sqlalchemy.cast(sqlalchemy.literal(key), sqlalchemy.Integer)
+    else:
+        operand = sqlalchemy.cast(_text_path(key), postgresql.ARRAY(sqlalchemy.Text))
+    return _jsonb_column(column).op("-", return_type=PostgresJSONBType())(operand)
+
+
+def jsonb_remove_path(
+    column: JSONBColumn, path: Sequence[Union[str, int]]
+) -> ColumnElement:
+    """
+    works as postgresql `column #- '{a,b}'`, removes the value at the path
+
+    :param column: name of the JSONB field or an expression to modify
+    :type column: Union[str, ColumnElement]
+    :param path: keys (or array indexes) leading to the value to remove
+    :type path: Sequence[Union[str, int]]
+    :return: expression with the modified document
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _jsonb_column(column).op("#-", return_type=PostgresJSONBType())(
+        _text_path(path)
+    )
+
+
+def _jsonb_path_function(
+    name: str, column: JSONBColumn, path: str, variables: Optional[Any]
+) -> ColumnElement:
+    arguments = [_jsonb_column(column), _jsonpath(path)]
+    if variables is not None:
+        arguments.append(sqlalchemy.literal(variables, type_=PostgresJSONBType()))
+    return getattr(sqlalchemy.func, name)(*arguments, type_=PostgresJSONBType())
+
+
+def jsonb_path_query(
+    column: JSONBColumn, path: str, variables: Optional[Any] = None
+) -> ColumnElement:
+    """
+    works as postgresql `jsonb_path_query(column, VALUE::jsonpath, VARIABLES)`,
+    returns one row for every item matched by the path
+
+    :param column: name of the JSONB field or the column itself
+    :type column: Union[str, ColumnElement]
+    :param path: jsonpath to evaluate, e.g. `$.items[*] ? (@.price > $min)`
+    :type path: str
+    :param variables: values of the variables used in the path, e.g. {"min": 10}
+    :type variables: Optional[Any]
+    :return: expression selecting the matched items
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _jsonb_path_function("jsonb_path_query", column, path, variables)
+
+
+def jsonb_path_query_array(
+    column: JSONBColumn, path: str, variables: Optional[Any] = None
+) -> ColumnElement:
+    """
+    works as postgresql `jsonb_path_query_array(column, VALUE::jsonpath, VARIABLES)`,
+    all the items matched by the path as a JSON array
+
+    :param column: name of the JSONB field or the column itself
+    :type column: Union[str, ColumnElement]
+    :param path: jsonpath to evaluate
+    :type path: str
+    :param variables: values of the variables used in the path
+    :type variables: Optional[Any]
+    :return: expression selecting the array of matched items
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _jsonb_path_function("jsonb_path_query_array", column, path, variables)
+
+
+def jsonb_path_query_first(
+    column: JSONBColumn, path: str, variables: Optional[Any] = None
+) -> ColumnElement:
+    """
+    works as postgresql `jsonb_path_query_first(column, VALUE::jsonpath, VARIABLES)`,
+    the first item matched by the path or NULL
+
+    :param column: name of the JSONB field or the column itself
+    :type column: Union[str, ColumnElement]
+    :param path: jsonpath to evaluate
+    :type path: str
+    :param variables: values of the variables used in the path
+    :type variables: Optional[Any]
+    :return: expression selecting the first matched item
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _jsonb_path_function("jsonb_path_query_first", column, path, variables)
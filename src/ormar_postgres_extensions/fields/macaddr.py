@@ -1,13 +1,233 @@
-from typing import Any
+import re
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+)
 
 import ormar
+import sqlalchemy
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import (
+    TypeDecorator,
+    TypeEngine,
+    UserDefinedType,
+)
 
+from ..operators import register_operators
+from .index import (
+    IndexedField,
+    IndexedFieldFactory,
+)
 
-class MACADDR(ormar.fields.model_fields.ModelFieldFactory, str):
-    _type = str
+_SEPARATORS = str.maketrans("", "", ":-.")
+
+# The format postgres outputs addresses in, values in it need no conversion
+_CANONICAL = {
+    6: re.compile(r"[0-9a-f]{2}(?::[0-9a-f]{2}){5}"),
+    8: re.compile(r"[0-9a-f]{2}(?::[0-9a-f]{2}){7}"),
+}
+
+
+def macaddr_bytes(value: str, size: int = 6) -> bytes:
+    """
+    Bytes of a MAC address in any of the input formats postgres accepts, e.g.
+    08:00:2b:01:02:03, 08-00-2b-01-02-03, 08002b:010203 or 0800.2b01.0203
+
+    Like postgres does for macaddr8, 6 byte addresses are converted to 8 byte
+    ones by inserting ff:fe in the middle when `size` is 8.
+    """
+    raw = bytes.fromhex(value.translate(_SEPARATORS))
+    if size == 8 and len(raw) == 6:
+        raw = raw[:3] + b"\xff\xfe" + raw[3:]
+    if len(raw) != size:
+        type_name = "macaddr8" if size == 8 else "macaddr"
+        raise ValueError(f"invalid input syntax for type {type_name}: {value!r}")
+    return raw
+
+
+def _oui(value: str, size: int) -> str:
+    # The vendor prefix of an address, or the prefix itself, e.g. 08:00:2b, as an
+    # address with the other bytes set to zero like `trunc()` returns it
+    raw = bytes.fromhex(value.translate(_SEPARATORS))
+    if len(raw) not in (3, 6, size):
+        raise ValueError(f"invalid MAC address or OUI: {value!r}")
+    return (raw[:3] + bytes(size - 3)).hex(":")
+
+
+class MacAddress(str):
+    """
+    Type of the values of MACADDR fields, checks the address and converts it to
+    the format postgres returns it in, e.g. 08:00:2b:01:02:03, so that values
+    compare equal whatever format they were given in
+    """
+
+    size = 6
+
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Callable[[Any], str]]:
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> str:
+        if not isinstance(value, str):
+            raise TypeError("string required")
+        if _CANONICAL[cls.size].fullmatch(value):
+            return value
+        return macaddr_bytes(value, cls.size).hex(":")
+
+
+class MacAddress8(MacAddress):
+    """
+    Type of the values of MACADDR8 fields, 6 byte addresses are converted to 8
+    byte ones like postgres does, e.g. 08:00:2b:ff:fe:01:02:03
+    """
+
+    size = 8
+
+
+def macaddr_oui(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `trunc(column) = trunc(VALUE)`, VALUE can be an address
+    or its vendor prefix (OUI) like 08:00:2b
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="macaddr_oui", other=other)
+
+
+def macaddr_oui_in(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `trunc(column) IN (trunc(VALUE), ...)`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="macaddr_oui_in", other=other)
+
+
+# FieldAccessor methods of the operators
+FIELD_ACCESSOR_MAP = [
+    ("macaddr_oui", macaddr_oui),
+    ("macaddr_oui_in", macaddr_oui_in),
+]
+
+
+# Column comparator methods the operators are mapped to in ormar's filters
+ACCESSOR_MAP = [
+    ("macaddr_oui", "oui"),
+    ("macaddr_oui_in", "oui_in"),
+]
+
+# The operators are supported by the expression index of `oui_index=True`, which
+# isn't an index on the column itself
+register_operators("macaddr", FIELD_ACCESSOR_MAP, ACCESSOR_MAP)
+
+
+class OUIType(TypeDecorator):
+    """
+    Type of the values compared to `trunc(column)`, converts addresses and vendor
+    prefixes to the truncated address when they are bound
+    """
+
+    impl = postgresql.MACADDR
+    cache_ok = True
+
+    def __init__(self, size: int = 6) -> None:
+        super().__init__()
+        self.size = size
+
+    def load_dialect_impl(self, dialect: Any) -> TypeEngine:
+        return PostgresMacaddr8Type() if self.size == 8 else postgresql.MACADDR()
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        return None if value is None else _oui(value, self.size)
+
+
+class MacaddrComparator(TypeEngine.Comparator):
+    def _trunc(self) -> sqlalchemy.sql.ColumnElement:
+        return sqlalchemy.func.trunc(self.expr, type_=OUIType(self.type.size))
+
+    def oui(self, other: Any) -> sqlalchemy.sql.ColumnElement:
+        return self._trunc() == other
+
+    def oui_in(self, other: Any) -> sqlalchemy.sql.ColumnElement:
+        return self._trunc().in_(other)
+
+
+class PostgresMacaddrType(postgresql.MACADDR):
+    """
+    Postgres MACADDR type with the comparator methods of the OUI filters
+    """
+
+    size = 6
+    comparator_factory = MacaddrComparator
+
+
+class PostgresMacaddr8Type(UserDefinedType):
+    """
+    Postgres MACADDR8 type, which SQLAlchemy doesn't provide
+    """
+
+    cache_ok = True
+    size = 8
+    comparator_factory = MacaddrComparator
+
+    def get_col_spec(self, **kwargs: Any) -> str:
+        return "MACADDR8"
+
+
+def _add_oui_index(column: sqlalchemy.Column, table: sqlalchemy.Table) -> None:
+    sqlalchemy.Index(
+        f"ix_{table.name}_{column.name}_oui", sqlalchemy.func.trunc(column)
+    )
+
+
+class MacaddrField(IndexedField):
+    """
+    Field that can declare an index on the vendor prefix of its addresses,
+    `trunc(column)`, for the `macaddr_oui` filters
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.oui_index: bool = kwargs.pop("oui_index", False)
+        super().__init__(**kwargs)
+
+    def get_column(self, name: str) -> sqlalchemy.Column:
+        column = super().get_column(name)
+        if self.oui_index:
+            # Named once the table is known so it can't clash with the index of
+            # the column itself
+            sqlalchemy.event.listen(column, "after_parent_attach", _add_oui_index)
+        return column
+
+
+class MACADDR(IndexedFieldFactory, str):
+    """
+    MAC address field, `oui_index=True` adds an index for the `macaddr_oui`
+    filters on the vendor prefix
+    """
+
+    _bases = (MacaddrField,)
+    _type = MacAddress
+    _operator_modules = ("macaddr",)
 
     @classmethod
     def get_column_type(cls, **kwargs: Any) -> postgresql.MACADDR:
         # Tell Ormar that this column should be a postgres macaddr type
-        return postgresql.MACADDR()
+        return PostgresMacaddrType()
+
+
+class MACADDR8(MACADDR):
+    """
+    EUI-64 MAC address field, 6 byte addresses are stored as 8 byte ones
+    """
+
+    _type = MacAddress8
+
+    @classmethod
+    def get_column_type(cls, **kwargs: Any) -> PostgresMacaddr8Type:
+        return PostgresMacaddr8Type()
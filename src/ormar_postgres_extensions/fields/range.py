@@ -0,0 +1,654 @@
+import re
+from datetime import (
+    date,
+    datetime,
+    timedelta,
+)
+from decimal import Decimal
+from functools import (
+    lru_cache,
+    partial,
+)
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Type,
+)
+
+import ormar
+import sqlalchemy
+from asyncpg import Range
+from pydantic.datetime_parse import (
+    parse_date,
+    parse_datetime,
+)
+from pydantic.json import custom_pydantic_encoder
+from pydantic.validators import (
+    decimal_validator,
+    int_validator,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.elements import ClauseElement
+from sqlalchemy.types import (
+    TypeDecorator,
+    TypeEngine,
+    UserDefinedType,
+)
+
+from ..operators import register_operators
+from .index import (
+    IndexedField,
+    IndexedFieldFactory,
+)
+
+
+def range_overlap(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column && VALUE`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="range_overlap", other=other)
+
+
+def range_contains(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column @> VALUE`, VALUE can be a range or an element
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="range_contains", other=other)
+
+
+def range_contained_by(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column <@ VALUE`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="range_contained_by", other=other)
+
+
+def range_adjacent(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column -|- VALUE`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="range_adjacent", other=other)
+
+
+# FieldAccessor methods of the operators
+FIELD_ACCESSOR_MAP = [
+    ("range_overlap", range_overlap),
+    ("range_contains", range_contains),
+    ("range_contained_by", range_contained_by),
+    ("range_adjacent", range_adjacent),
+]
+
+
+# Column comparator methods the operators are mapped to in ormar's filters
+ACCESSOR_MAP = [
+    ("range_overlap", "overlaps"),
+    ("range_contains", "contains"),
+    ("range_contained_by", "contained_by"),
+    ("range_adjacent", "adjacent_to"),
+]
+
+# Indexes supporting the operators, the first one the column type can use is
+# suggested when missing
+INDEX_MAP = [
+    (
+        ormar_operation,
+        [("gist", "range_ops"), ("gist", "multirange_ops"), ("spgist", "range_ops")],
+    )
+    for ormar_operation, _ in ACCESSOR_MAP
+]
+
+register_operators("range", FIELD_ACCESSOR_MAP, ACCESSOR_MAP, INDEX_MAP)
+
+
+class RangeKind(NamedTuple):
+    """
+    A postgres range type, its multirange type and the type of their bounds
+
+    `step` is the distance between consecutive values of discrete ranges, their
+    bounds are converted to `[lower, upper)` like postgres does. It's None for
+    continuous ranges.
+    """
+
+    name: str
+    multirange: str
+    impl: Type[TypeEngine]
+    element_type: TypeEngine
+    parse_bound: Callable[[Any], Any]
+    bound_type: type
+    step: Any = None
+
+
+RANGE_KINDS = {
+    kind.name: kind
+    for kind in [
+        RangeKind(
+            "int4range",
+            "int4multirange",
+            postgresql.INT4RANGE,
+            sqlalchemy.Integer(),
+            int_validator,
+            int,
+            1,
+        ),
+        RangeKind(
+            "int8range",
+            "int8multirange",
+            postgresql.INT8RANGE,
+            sqlalchemy.BigInteger(),
+            int_validator,
+            int,
+            1,
+        ),
+        RangeKind(
+            "numrange",
+            "nummultirange",
+            postgresql.NUMRANGE,
+            sqlalchemy.Numeric(),
+            decimal_validator,
+            Decimal,
+        ),
+        RangeKind(
+            "tsrange",
+            "tsmultirange",
+            postgresql.TSRANGE,
+            sqlalchemy.DateTime(),
+            parse_datetime,
+            datetime,
+        ),
+        RangeKind(
+            "tstzrange",
+            "tstzmultirange",
+            postgresql.TSTZRANGE,
+            sqlalchemy.DateTime(timezone=True),
+            parse_datetime,
+            datetime,
+        ),
+        RangeKind(
+            "daterange",
+            "datemultirange",
+            postgresql.DATERANGE,
+            sqlalchemy.Date(),
+            parse_date,
+            date,
+            timedelta(days=1),
+        ),
+    ]
+}
+
+EMPTY = Range(empty=True)
+
+# Text format of ranges, e.g. [1,5) or ["2020-01-01 00:00:00",), bounds can be
+# double quoted and are left out when they are infinite
+_RANGE_TEXT = re.compile(
+    r'\s*([\[(])\s*("(?:[^"]*)"|[^,]*?)\s*,\s*("(?:[^"]*)"|[^\])]*?)\s*([\])])\s*'
+)
+
+# Values read as one range, the other sequences are lists of ranges
+_RANGE_VALUE_TYPES = (Range, dict, str)
+
+
+def _bound(value: Any, kind: RangeKind) -> Any:
+    if value is None or type(value) is kind.bound_type:
+        return value
+    if isinstance(value, str):
+        value = value.strip('"')
+        if not value:
+            return None
+    return kind.parse_bound(value)
+
+
+def _parse_range(value: str) -> Range:
+    if value.strip().lower() == "empty":
+        return EMPTY
+    match = _RANGE_TEXT.fullmatch(value)
+    if match is None:
+        raise ValueError(f"malformed range literal: {value!r}")
+    lower_bracket, lower, upper, upper_bracket = match.groups()
+    return Range(
+        lower or None,
+        upper or None,
+        lower_inc=lower_bracket == "[",
+        upper_inc=upper_bracket == "]",
+    )
+
+
+def to_range(value: Any, kind: RangeKind) -> Range:
+    """
+    Convert a value to a range in the form postgres returns it, so that ranges
+    compare equal before and after they are saved
+
+    The value can be a `Range`, a `(lower, upper)` pair that includes the lower
+    bound and excludes the upper one like the range constructors of postgres, a
+    dict of the `Range` arguments or the text format, e.g. `[1,5)`. Bounds are
+    converted to the type of the range and discrete ranges to `[lower, upper)`.
+
+    :param value: value to convert
+    :type value: Any
+    :param kind: type of the range
+    :type kind: RangeKind
+    :return: the range
+    :rtype: Range
+    """
+    if isinstance(value, Range):
+        found = value
+    elif isinstance(value, str):
+        found = _parse_range(value)
+    elif isinstance(value, dict):
+        found = Range(**value)
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        found = Range(*value)
+    else:
+        raise TypeError(f"{kind.name} value required, got {value!r}")
+    if found.isempty:
+        return EMPTY
+
+    lower = _bound(found.lower, kind)
+    upper = _bound(found.upper, kind)
+    lower_inc = found.lower_inc and lower is not None
+    upper_inc = found.upper_inc and upper is not None
+    if lower is not None and upper is not None:
+        if lower > upper:
+            raise ValueError(
+                "range lower bound must be less than or equal to range upper bound"
+            )
+        if lower == upper and not (lower_inc and upper_inc):
+            return EMPTY
+    if kind.step is not None:
+        if lower is not None and not lower_inc:
+            lower, lower_inc = lower + kind.step, True
+        if upper is not None and upper_inc:
+            upper, upper_inc = upper + kind.step, False
+        if lower is not None and upper is not None and lower == upper:
+            return EMPTY
+
+    if (
+        found is value
+        and lower is found.lower
+        and upper is found.upper
+        and lower_inc == found.lower_inc
+        and upper_inc == found.upper_inc
+    ):
+        return found
+    return Range(lower, upper, lower_inc=lower_inc, upper_inc=upper_inc)
+
+
+def _lower_key(value: Range) -> Any:
+    return (value.lower is not None, value.lower, not value.lower_inc)
+
+
+def _upper_after(first: Range, second: Range) -> bool:
+    # Whether the upper bound of the first range is after the one of the second
+    if first.upper is None or second.upper is None:
+        return first.upper is None and second.upper is not None
+    if first.upper != second.upper:
+        return first.upper > second.upper
+    return first.upper_inc and not second.upper_inc
+
+
+def _touches(first: Range, second: Range) -> bool:
+    # Whether the second range, which doesn't start before the first one, overlaps
+    # or is adjacent to it
+    if first.upper is None or second.lower is None:
+        return True
+    if second.lower != first.upper:
+        return second.lower < first.upper
+    return first.upper_inc or second.lower_inc
+
+
+def to_multirange(value: Any, kind: RangeKind) -> List[Range]:
+    """
+    Convert a value to a multirange in the form postgres returns it: its ranges
+    sorted and without empty, overlapping or adjacent ones
+
+    The value can be a list of any of the range values `to_range` accepts, the
+    text format, e.g. `{[1,3),[5,7)}`, or a single range.
+
+    :param value: value to convert
+    :type value: Any
+    :param kind: type of the ranges
+    :type kind: RangeKind
+    :return: ranges of the multirange
+    :rtype: List[Range]
+    """
+    if isinstance(value, str) and value.strip().startswith("{"):
+        value = [match.group() for match in _RANGE_TEXT.finditer(value)]
+    elif isinstance(value, _RANGE_VALUE_TYPES) or (
+        isinstance(value, (list, tuple))
+        and len(value) == 2
+        and not any(
+            isinstance(item, (list, tuple, *_RANGE_VALUE_TYPES)) for item in value
+        )
+    ):
+        value = [value]
+    elif not isinstance(value, (list, tuple)):
+        raise TypeError(f"{kind.multirange} value required, got {value!r}")
+
+    ranges = sorted(
+        (
+            found
+            for found in (to_range(item, kind) for item in value)
+            if not found.isempty
+        ),
+        key=_lower_key,
+    )
+    merged: List[Range] = []
+    for found in ranges:
+        if merged and _touches(merged[-1], found):
+            last = merged[-1]
+            if _upper_after(found, last):
+                merged[-1] = Range(
+                    last.lower,
+                    found.upper,
+                    lower_inc=last.lower_inc,
+                    upper_inc=found.upper_inc,
+                )
+        else:
+            merged.append(found)
+    return merged
+
+
+def range_text(value: Range) -> str:
+    """
+    The text format postgres uses for a range, e.g. `[1,5)`
+    """
+    if value.isempty:
+        return "empty"
+    bounds = [
+        (
+            ""
+            if bound is None
+            else f'"{bound}"' if isinstance(bound, datetime) else str(bound)
+        )
+        for bound in (value.lower, value.upper)
+    ]
+    return (
+        f"{'[' if value.lower_inc else '('}{bounds[0]},"
+        f"{bounds[1]}{']' if value.upper_inc else ')'}"
+    )
+
+
+class RangeValue:
+    """
+    Type of the values of range fields, converts them with `to_range`
+    """
+
+    kind: RangeKind
+
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Callable[[Any], Range]]:
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> Range:
+        return to_range(value, cls.kind)
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: dict) -> None:
+        field_schema.update(type="string", format=cls.kind.name)
+
+
+class MultirangeValue(RangeValue):
+    """
+    Type of the values of multirange fields, converts them with `to_multirange`
+    """
+
+    @classmethod
+    def validate(cls, value: Any) -> List[Range]:  # type: ignore
+        return to_multirange(value, cls.kind)
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: dict) -> None:
+        field_schema.update(
+            type="array", items={"type": "string", "format": cls.kind.name}
+        )
+
+
+@lru_cache(maxsize=None)
+def range_value_type(range_type: str, multirange: bool = False) -> Type[RangeValue]:
+    """
+    Python type of the values of a range or multirange field
+    """
+    kind = RANGE_KINDS[range_type]
+    base = MultirangeValue if multirange else RangeValue
+    name = kind.multirange if multirange else kind.name
+    return type(f"{name.capitalize()}Value", (base,), {"kind": kind})
+
+
+class ElementType(TypeDecorator):
+    """
+    Type of the elements compared to a range, e.g. by `range_contains`
+
+    The value is converted like the bounds of the range and cast to the element
+    type in the query, otherwise postgres takes it for a range like the other
+    operand.
+    """
+
+    impl = sqlalchemy.Integer
+    cache_ok = True
+
+    def __init__(self, range_type: str) -> None:
+        super().__init__()
+        self.range_type = range_type
+        self.impl = RANGE_KINDS[range_type].element_type
+
+    def bind_expression(self, bindvalue: Any) -> Any:
+        return sqlalchemy.cast(bindvalue, self.impl)
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        # Converted like the bounds of the range, e.g. a date given as a string
+        return _bound(value, RANGE_KINDS[self.range_type])
+
+
+# Strings compared to a range are ranges, or multiranges, in the text format when
+# they start like one and elements otherwise, e.g. the date "2020-01-01"
+_RANGE_TEXT_STARTS = ("[", "(", "{", "empty")
+
+
+def _is_range_operand(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lstrip().lower().startswith(_RANGE_TEXT_STARTS)
+    return isinstance(value, (list, tuple, *_RANGE_VALUE_TYPES))
+
+
+class RangeComparator(TypeEngine.Comparator):
+    def _operand(self, other: Any) -> Any:
+        if isinstance(other, ClauseElement):
+            return other
+        if _is_range_operand(other):
+            return sqlalchemy.bindparam(None, other, type_=self.type)
+        return sqlalchemy.bindparam(
+            None, other, type_=ElementType(self.type.range_type)
+        )
+
+    def overlaps(self, other: Any) -> sqlalchemy.sql.ColumnElement:
+        return self.expr.op("&&", is_comparison=True)(self._operand(other))
+
+    def contains(self, other: Any, **kwargs: Any) -> sqlalchemy.sql.ColumnElement:
+        return self.expr.op("@>", is_comparison=True)(self._operand(other))
+
+    def contained_by(self, other: Any) -> sqlalchemy.sql.ColumnElement:
+        return self.expr.op("<@", is_comparison=True)(self._operand(other))
+
+    def adjacent_to(self, other: Any) -> sqlalchemy.sql.ColumnElement:
+        return self.expr.op("-|-", is_comparison=True)(self._operand(other))
+
+
+class MultirangeType(UserDefinedType):
+    """
+    Postgres multirange types, which SQLAlchemy doesn't provide
+    """
+
+    cache_ok = True
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def get_col_spec(self, **kwargs: Any) -> str:
+        return self.name.upper()
+
+
+class PostgresRangeTypeDecorator(TypeDecorator):
+    """
+    Postgres range and multirange types for use with Ormar
+
+    Bound values are converted with `to_range` or `to_multirange`. Values compared
+    to a multirange can also be a single range, they are bound as a multirange of
+    it, which the operators treat the same. Values of other types, e.g. an int
+    for an int4range column, are compared as elements.
+    """
+
+    impl = postgresql.INT4RANGE
+    cache_ok = True
+    comparator_factory = RangeComparator
+
+    def __init__(self, range_type: str, multirange: bool = False) -> None:
+        super().__init__()
+        self.range_type = range_type
+        self.multirange = multirange
+        kind = RANGE_KINDS[range_type]
+        self.impl = MultirangeType(kind.multirange) if multirange else kind.impl()
+        # Operator classes the column can be indexed with, see advise_indexes
+        self.index_opclasses = {"multirange_ops" if multirange else "range_ops"}
+
+    def operand_shape(self, value: Any) -> bool:
+        """
+        Whether a value compared to the column is bound as a range or as an
+        element, which the filter clause cache keys the clauses by
+        """
+        return _is_range_operand(value)
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        kind = RANGE_KINDS[self.range_type]
+        return to_multirange(value, kind) if self.multirange else to_range(value, kind)
+
+
+def _add_json_encoder(model: Type[ormar.Model]) -> None:
+    # pydantic builds the JSON encoder of a model from its config when the class
+    # is created, before its fields know the model. An encoder of the model's own
+    # config for Range takes precedence.
+    config = model.__config__
+    if Range in config.json_encoders:
+        return
+    config.json_encoders = {**config.json_encoders, Range: range_text}
+    model.__json_encoder__ = staticmethod(  # type: ignore
+        partial(custom_pydantic_encoder, config.json_encoders)
+    )
+
+
+class RangeField(IndexedField):
+    """
+    Range or multirange field, which serializes its values to JSON in the range
+    text format through the config of the model it's declared on
+    """
+
+    @property  # type: ignore
+    def owner(self) -> Any:
+        return self.__dict__.get("_owner")
+
+    @owner.setter
+    def owner(self, model: Any) -> None:
+        self.__dict__["_owner"] = model
+        if model is not None:
+            _add_json_encoder(model)
+
+
+class RangeFieldFactory(IndexedFieldFactory):
+    """
+    Base of the range and multirange fields
+
+    Values are asyncpg `Range` objects, lists of them for multiranges. A GiST index
+    (`index="gist"`) supports all the range operators.
+    """
+
+    _bases: Any = (RangeField,)
+    _range_type = "int4range"
+    _multirange = False
+    _operator_modules = ("range",)
+
+    def __new__(  # type: ignore
+        cls, *args: Any, **kwargs: Any
+    ) -> ormar.fields.BaseField:
+        field = super().__new__(cls, *args, **kwargs)
+        field.__type__ = field.__pydantic_type__ = range_value_type(
+            cls._range_type, cls._multirange
+        )
+        return field
+
+    @classmethod
+    def get_column_type(cls, **kwargs: Any) -> PostgresRangeTypeDecorator:
+        return PostgresRangeTypeDecorator(cls._range_type, multirange=cls._multirange)
+
+
+class INT4RANGE(RangeFieldFactory):
+    _range_type = "int4range"
+
+
+class INT8RANGE(RangeFieldFactory):
+    _range_type = "int8range"
+
+
+class NUMRANGE(RangeFieldFactory):
+    _range_type = "numrange"
+
+
+class TSRANGE(RangeFieldFactory):
+    _range_type = "tsrange"
+
+
+class TSTZRANGE(RangeFieldFactory):
+    _range_type = "tstzrange"
+
+
+class DATERANGE(RangeFieldFactory):
+    _range_type = "daterange"
+
+
+class INT4MULTIRANGE(RangeFieldFactory, list):
+    _range_type = "int4range"
+    _multirange = True
+
+
+class INT8MULTIRANGE(RangeFieldFactory, list):
+    _range_type = "int8range"
+    _multirange = True
+
+
+class NUMMULTIRANGE(RangeFieldFactory, list):
+    _range_type = "numrange"
+    _multirange = True
+
+
+class TSMULTIRANGE(RangeFieldFactory, list):
+    _range_type = "tsrange"
+    _multirange = True
+
+
+class TSTZMULTIRANGE(RangeFieldFactory, list):
+    _range_type = "tstzrange"
+    _multirange = True
+
+
+class DATEMULTIRANGE(RangeFieldFactory, list):
+    _range_type = "daterange"
+    _multirange = True
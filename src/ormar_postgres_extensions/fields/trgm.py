@@ -0,0 +1,190 @@
+from typing import (
+    Any,
+    Union,
+)
+
+import ormar
+import sqlalchemy
+from sqlalchemy.sql.expression import ColumnElement
+
+from ..operators import register_operators
+from .deferred import DeferrableFieldFactory
+
+
+def trgm_similar(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column % VALUE`, true when the trigram similarity of
+    the strings is above `pg_trgm.similarity_threshold` (0.3 by default)
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="trgm_similar", other=other)
+
+
+def trgm_word_similar(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column %> VALUE`, true when the value is similar to a
+    part of the string made of whole words, the word similarity is above
+    `pg_trgm.word_similarity_threshold` (0.6 by default)
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="trgm_word_similar", other=other)
+
+
+# FieldAccessor methods of the operators
+FIELD_ACCESSOR_MAP = [
+    ("trgm_similar", trgm_similar),
+    ("trgm_word_similar", trgm_word_similar),
+]
+
+
+# Column comparator methods the operators are mapped to in ormar's filters
+ACCESSOR_MAP = [
+    ("trgm_similar", "trigram_similar"),
+    ("trgm_word_similar", "trigram_word_similar"),
+]
+
+# Indexes supporting the operators, the first one is suggested when missing. Only
+# GiST indexes support ordering by distance as well
+INDEX_MAP = [
+    ("trgm_similar", [("gin", "gin_trgm_ops"), ("gist", "gist_trgm_ops")]),
+    ("trgm_word_similar", [("gin", "gin_trgm_ops"), ("gist", "gist_trgm_ops")]),
+]
+
+register_operators("trgm", FIELD_ACCESSOR_MAP, ACCESSOR_MAP, INDEX_MAP)
+
+
+StringColumn = Union[str, ColumnElement]
+
+
+def _string_column(column: StringColumn) -> ColumnElement:
+    if isinstance(column, str):
+        return sqlalchemy.column(column)
+    return column
+
+
+def _text(value: Any) -> Any:
+    if isinstance(value, sqlalchemy.sql.ClauseElement):
+        return value
+    return sqlalchemy.bindparam(None, value, type_=sqlalchemy.Text)
+
+
+class TrigramComparator(sqlalchemy.String.Comparator):
+    def trigram_similar(self, other: Any) -> ColumnElement:
+        return self.expr.op("%", is_comparison=True)(_text(other))
+
+    def trigram_word_similar(self, other: Any) -> ColumnElement:
+        # Commutator of `VALUE <% column`, which keeps the column on the left
+        return self.expr.op("%>", is_comparison=True)(_text(other))
+
+
+class PostgresTrigramString(sqlalchemy.String):
+    """
+    Postgres VARCHAR type with the pg_trgm similarity operators
+    """
+
+    comparator_factory = TrigramComparator
+
+
+class PostgresTrigramText(sqlalchemy.Text):
+    """
+    Postgres TEXT type with the pg_trgm similarity operators
+    """
+
+    comparator_factory = TrigramComparator
+
+
+def trgm_distance(
+    column: StringColumn, value: Any, word: bool = False
+) -> ColumnElement:
+    """
+    works as postgresql `column <-> VALUE`, one minus the similarity of the
+    strings, or `column <->> VALUE`, one minus their word similarity, when word
+    is set
+
+    Ordering by it with a limit finds the nearest strings using a GiST index,
+    see `nearest`.
+
+    :param column: name of the string column or the column itself
+    :type column: Union[str, ColumnElement]
+    :param value: string to compare with
+    :type value: Any
+    :param word: use the word similarity
+    :type word: bool
+    :return: expression with the distance
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return _string_column(column).op(
+        "<->>" if word else "<->", return_type=sqlalchemy.Float
+    )(_text(value))
+
+
+def similarity(column: StringColumn, value: Any) -> ColumnElement:
+    """
+    works as postgresql `similarity(column, VALUE)`, from 0 for strings without
+    a trigram in common to 1 for identical ones
+
+    :param column: name of the string column or the column itself
+    :type column: Union[str, ColumnElement]
+    :param value: string to compare with
+    :type value: Any
+    :return: expression with the similarity
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return sqlalchemy.func.similarity(
+        _string_column(column), _text(value), type_=sqlalchemy.Float
+    )
+
+
+def word_similarity(column: StringColumn, value: Any) -> ColumnElement:
+    """
+    works as postgresql `word_similarity(VALUE, column)`, the greatest
+    similarity of the value with a part of the string made of whole words
+
+    :param column: name of the string column or the column itself
+    :type column: Union[str, ColumnElement]
+    :param value: string to look for
+    :type value: Any
+    :return: expression with the word similarity
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    return sqlalchemy.func.word_similarity(
+        _text(value), _string_column(column), type_=sqlalchemy.Float
+    )
+
+
+class String(DeferrableFieldFactory, ormar.String):
+    """
+    String field filtered with the similarity operators of the pg_trgm extension
+
+    `index="gin"` or `index="gist"` create a trigram index, with `gin_trgm_ops` and
+    `gist_trgm_ops` respectively, which the operators as well as the `contains`,
+    `icontains`, `startswith` and `endswith` filters use. Only a GiST index can
+    be used to order by distance.
+    """
+
+    _index_opclasses = {"gin": "gin_trgm_ops", "gist": "gist_trgm_ops"}
+    _operator_modules = ("trgm",)
+
+    @classmethod
+    def get_column_type(cls, **kwargs: Any) -> PostgresTrigramString:
+        return PostgresTrigramString(length=kwargs.get("max_length"))
+
+
+class Text(DeferrableFieldFactory, ormar.Text):
+    """
+    Text field filtered with the similarity operators of the pg_trgm extension,
+    see `String`
+    """
+
+    _index_opclasses = {"gin": "gin_trgm_ops", "gist": "gist_trgm_ops"}
+    _operator_modules = ("trgm",)
+
+    @classmethod
+    def get_column_type(cls, **kwargs: Any) -> PostgresTrigramText:
+        return PostgresTrigramText()
@@ -0,0 +1,396 @@
+import re
+import struct
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import ormar
+import sqlalchemy
+from ormar import ModelDefinitionError
+from ormar.models.mixins.alias_mixin import AliasMixin
+from ormar.queryset import QuerySet
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.types import TypeDecorator
+
+from ..operators import register_operators
+from ..patching import Patch
+from .deferred import DeferrableFieldFactory
+
+DEFAULT_CONFIG = "english"
+
+# Functions parsing the text searched for into a tsquery
+WEBSEARCH = "websearch_to_tsquery"
+PLAIN = "plainto_tsquery"
+
+
+def tsvector_match(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column @@ websearch_to_tsquery(CONFIG, VALUE)`, the
+    value can use the web search syntax, e.g. `"quick fox" or dog -cat`
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="tsvector_match", other=other)
+
+
+def tsvector_match_plain(self, other: Any) -> ormar.queryset.clause.FilterGroup:
+    """
+    works as postgresql `column @@ plainto_tsquery(CONFIG, VALUE)`, all the words
+    of the value have to match
+    :param other: value to check against operator
+    :type other: Any
+    :return: FilterGroup for operator
+    :rtype: ormar.queryset.clause.FilterGroup
+    """
+    return self._select_operator(op="tsvector_match_plain", other=other)
+
+
+# FieldAccessor methods of the operators
+FIELD_ACCESSOR_MAP = [
+    ("tsvector_match", tsvector_match),
+    ("tsvector_match_plain", tsvector_match_plain),
+]
+
+
+# Column comparator methods the operators are mapped to in ormar's filters
+ACCESSOR_MAP = [
+    ("tsvector_match", "websearch_match"),
+    ("tsvector_match_plain", "plain_match"),
+]
+
+# Indexes supporting the operators, the first one is suggested when missing
+INDEX_MAP = [
+    ("tsvector_match", [("gin", "tsvector_ops"), ("gist", "tsvector_ops")]),
+    ("tsvector_match_plain", [("gin", "tsvector_ops"), ("gist", "tsvector_ops")]),
+]
+
+register_operators("tsvector", FIELD_ACCESSOR_MAP, ACCESSOR_MAP, INDEX_MAP)
+
+
+_CONFIG_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*(\.[A-Za-z_][A-Za-z0-9_$]*)?")
+_WEIGHTS = {"A", "B", "C", "D"}
+
+TSVectorColumn = Union[str, ColumnElement]
+
+# A lexeme of the tsvector text format, quoted with '' and \ escapes like postgres
+# outputs it or a bare word, and its positions, e.g. 'fox':2A,5
+_LEXEME = re.compile(
+    r"\s*(?:'((?:[^'\\]|''|\\.)*)'|((?:[^\s'\\:]|\\.)+))(?::([0-9A-Da-d,*]+))?",
+    re.DOTALL,
+)
+_ESCAPE = re.compile(r"''|\\(.)", re.DOTALL)
+_WEIGHT_BITS = {"A": 3, "B": 2, "C": 1, "D": 0}
+_WEIGHT_LETTERS = {3: "A", 2: "B", 1: "C", 0: ""}
+_MAX_POSITION = 16383
+
+
+def _unescape(value: str) -> str:
+    return _ESCAPE.sub(lambda match: match.group(1) or "'", value)
+
+
+def _positions(value: str) -> Iterator[Tuple[int, int]]:
+    # Positions and weights of a lexeme, e.g. 2A,5
+    for item in value.split(","):
+        item = item.rstrip("*")
+        weight = 0
+        if item and item[-1].upper() in _WEIGHT_BITS:
+            weight = _WEIGHT_BITS[item[-1].upper()]
+            item = item[:-1]
+        position = int(item)
+        if position < 1:
+            raise ValueError(f"invalid tsvector position {item!r}")
+        yield min(position, _MAX_POSITION), weight
+
+
+def tsvector_bytes(value: str) -> bytes:
+    """
+    Binary format of a tsvector in the text format, e.g. `'fox':2A 'quick':1`,
+    which asyncpg has no codec for. Like postgres does, repeated lexemes are
+    merged and a repeated position keeps its highest weight.
+    """
+    lexemes: Dict[str, Dict[int, int]] = {}
+    position = 0
+    end = len(value.rstrip())
+    while position < end:
+        match = _LEXEME.match(value, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"invalid input syntax for type tsvector: {value!r}")
+        quoted, bare, positions = match.groups()
+        lexeme = _unescape(quoted if quoted is not None else bare)
+        weights = lexemes.setdefault(lexeme, {})
+        for item, weight in _positions(positions) if positions else ():
+            weights[item] = max(weights.get(item, 0), weight)
+        position = match.end()
+
+    parts = [struct.pack("!i", len(lexemes))]
+    for lexeme, weights in lexemes.items():
+        # The weight is stored in the two highest bits of the position
+        items = [weight << 14 | item for item, weight in sorted(weights.items())]
+        parts.append(lexeme.encode("utf-8") + b"\0")
+        parts.append(struct.pack(f"!H{len(items)}H", len(items), *items))
+    return b"".join(parts)
+
+
+def tsvector_text(data: bytes) -> str:
+    """
+    Text format of a tsvector in the binary format
+    """
+    (count,) = struct.unpack_from("!i", data)
+    offset = 4
+    lexemes = []
+    for _ in range(count):
+        end = data.index(b"\0", offset)
+        lexeme = data[offset:end].decode("utf-8")
+        (npos,) = struct.unpack_from("!H", data, end + 1)
+        positions = struct.unpack_from(f"!{npos}H", data, end + 3)
+        offset = end + 3 + 2 * npos
+        text = "'" + lexeme.replace("\\", "\\\\").replace("'", "''") + "'"
+        if positions:
+            text += ":" + ",".join(
+                f"{item & _MAX_POSITION}{_WEIGHT_LETTERS[item >> 14]}"
+                for item in positions
+            )
+        lexemes.append(text)
+    return " ".join(lexemes)
+
+
+def _config(config: str) -> ColumnElement:
+    # The configuration is part of the SQL rather than a parameter, generated
+    # columns need a constant one and an index is only used for queries parsed
+    # with the configuration the column was built with
+    if not _CONFIG_NAME.fullmatch(config):
+        raise ValueError(f"Invalid text search configuration {config!r}")
+    return sqlalchemy.literal_column(f"'{config}'::regconfig")
+
+
+class TSQueryType(TypeDecorator):
+    """
+    Type of the text searched for in a TSVECTOR column, it is parsed into a
+    tsquery in the query, e.g. `websearch_to_tsquery('english'::regconfig, VALUE)`
+    """
+
+    impl = sqlalchemy.Text
+    cache_ok = True
+
+    def __init__(self, config: str = DEFAULT_CONFIG, parser: str = WEBSEARCH) -> None:
+        super().__init__()
+        self.config = config
+        self.parser = parser
+
+    def bind_expression(self, bindvalue: Any) -> Any:
+        return getattr(sqlalchemy.func, self.parser)(_config(self.config), bindvalue)
+
+
+class PostgresTSVectorType(postgresql.TSVECTOR):
+    """
+    Postgres TSVECTOR type matched against text with a text search configuration
+    """
+
+    class Comparator(postgresql.TSVECTOR.Comparator):
+        def _match(self, other: Any, parser: str) -> ColumnElement:
+            if not isinstance(other, sqlalchemy.sql.ClauseElement):
+                other = sqlalchemy.bindparam(
+                    None, other, type_=TSQueryType(self.type.config, parser)
+                )
+            return self.expr.op("@@", is_comparison=True)(other)
+
+        def websearch_match(self, other: Any) -> ColumnElement:
+            return self._match(other, WEBSEARCH)
+
+        def plain_match(self, other: Any) -> ColumnElement:
+            return self._match(other, PLAIN)
+
+    comparator_factory = Comparator
+
+    def __init__(self, config: str = DEFAULT_CONFIG) -> None:
+        super().__init__()
+        self.config = config
+
+
+def generated_fields(model: Any) -> Tuple[str, ...]:
+    """
+    Names of the generated TSVECTOR fields of a model, which aren't written to
+    """
+    return tuple(
+        name
+        for name, field in model.Meta.model_fields.items()
+        if getattr(field, "generated", False)
+    )
+
+
+# Ormar translates the field names of the values of every INSERT and UPDATE it
+# runs to column names in this method, and only there. It's wrapped to leave the
+# generated columns out once a generated field is first declared. bulk_update
+# sets all the columns of the model unless told which ones, so it's given the
+# others.
+def _wrap_translate_columns_to_aliases(translate: Callable) -> Callable:
+    def wrapper(cls, new_kwargs: Dict) -> Dict:
+        for name in generated_fields(cls):
+            new_kwargs.pop(name, None)
+        return translate(cls, new_kwargs)
+
+    return wrapper
+
+
+def _wrap_bulk_update(bulk_update: Callable) -> Callable:
+    async def wrapper(
+        self: QuerySet, objects: List[ormar.Model], columns: List[str] = None
+    ) -> None:
+        generated = generated_fields(self.model)
+        if generated:
+            if not columns:
+                columns = list(
+                    self.model.extract_db_own_fields().union(
+                        self.model.extract_related_names()
+                    )
+                )
+            columns = [name for name in columns if name not in generated]
+        return await bulk_update(self, objects, columns)
+
+    return wrapper
+
+
+_GENERATED_PATCHES = [
+    Patch(
+        AliasMixin, "translate_columns_to_aliases", _wrap_translate_columns_to_aliases
+    ),
+    Patch(QuerySet, "bulk_update", _wrap_bulk_update),
+]
+
+
+def tsvector_expression(
+    columns: Union[Sequence[str], Dict[str, str]], config: str = DEFAULT_CONFIG
+) -> ColumnElement:
+    """
+    Expression building a tsvector from text columns, NULLs count as empty text
+
+    Given a dict of column names to weights (`"A"` to `"D"`) each column is
+    weighted with `setweight` before they are concatenated, so `ts_rank` ranks
+    matches in e.g. a title above the ones in a body.
+
+    :param columns: names of the columns, or names and weights
+    :type columns: Union[Sequence[str], Dict[str, str]]
+    :param config: text search configuration
+    :type config: str
+    :return: tsvector expression
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    if not columns:
+        raise ValueError("A tsvector needs at least one column")
+
+    def text(name: str) -> ColumnElement:
+        return sqlalchemy.func.coalesce(sqlalchemy.column(name), "")
+
+    func = sqlalchemy.func
+    if not isinstance(columns, dict):
+        document = text(columns[0])
+        for name in columns[1:]:
+            document = document.concat(" ").concat(text(name))
+        return func.to_tsvector(_config(config), document, type_=postgresql.TSVECTOR)
+
+    vectors = []
+    for name, weight in columns.items():
+        if weight not in _WEIGHTS:
+            raise ValueError(f"Invalid weight {weight!r}, use one of A, B, C or D")
+        vector = func.to_tsvector(_config(config), text(name))
+        vectors.append(func.setweight(vector, weight, type_=postgresql.TSVECTOR))
+    expression = vectors[0]
+    for vector in vectors[1:]:
+        expression = expression.op("||")(vector)
+    return expression
+
+
+def ts_rank(
+    column: TSVectorColumn,
+    query: str,
+    config: Optional[str] = None,
+    plain: bool = False,
+) -> ColumnElement:
+    """
+    works as postgresql `ts_rank(column, websearch_to_tsquery(CONFIG, QUERY))`,
+    or `plainto_tsquery` when plain is set, how well the row matches the query
+
+    Meant to be selected with `project` or used in `order_by` of SQL queries,
+    `search` orders the models of a queryset by it.
+
+    :param column: name of the TSVECTOR column or the column itself
+    :type column: Union[str, ColumnElement]
+    :param query: text searched for
+    :type query: str
+    :param config: text search configuration, the one of the column by default
+    :type config: Optional[str]
+    :param plain: parse the query with `plainto_tsquery`
+    :type plain: bool
+    :return: expression with the rank
+    :rtype: sqlalchemy.sql.expression.ColumnElement
+    """
+    if isinstance(column, str):
+        column = sqlalchemy.column(column)
+    if config is None:
+        config = getattr(column.type, "config", DEFAULT_CONFIG)
+    query_type = TSQueryType(config, PLAIN if plain else WEBSEARCH)
+    return sqlalchemy.func.ts_rank(
+        column,
+        sqlalchemy.bindparam(None, query, type_=query_type),
+        type_=sqlalchemy.Float,
+    )
+
+
+class TSVECTOR(DeferrableFieldFactory, str):
+    """
+    Full text search document using the PG TSVECTOR type
+
+    With `generated_from` the column is generated by postgres from the given text
+    columns of the model, a list of column names or a dict of column names to
+    weights, and is read only. Otherwise values are set in the tsvector text
+    format, e.g. `'fox':2 'quick':1`.
+
+    `config` is the text search configuration the document and the searched text
+    are parsed with, `english` by default. Both operators can use a GIN index,
+    `index="gin"`.
+    """
+
+    _type = str
+    _operator_modules = ("tsvector",)
+
+    def __new__(  # type: ignore
+        cls,
+        *,
+        generated_from: Optional[Union[Sequence[str], Dict[str, str]]] = None,
+        config: str = DEFAULT_CONFIG,
+        **kwargs: Any,
+    ) -> ormar.fields.BaseField:
+        if generated_from is not None:
+            if kwargs.get("server_default") is not None:
+                raise ModelDefinitionError(
+                    "Generated TSVECTOR fields can't have a server_default"
+                )
+            try:
+                expression = tsvector_expression(generated_from, config)
+            except ValueError as error:
+                raise ModelDefinitionError(str(error)) from None
+            # ormar leaves fields with a server default out of INSERTs while they
+            # are None and loads them again once the row is saved
+            kwargs["server_default"] = sqlalchemy.Computed(expression, persisted=True)
+            for patch in _GENERATED_PATCHES:
+                patch.install()
+        elif not _CONFIG_NAME.fullmatch(config):
+            raise ModelDefinitionError(f"Invalid text search configuration {config!r}")
+        return super().__new__(
+            cls, **kwargs, config=config, generated=generated_from is not None
+        )
+
+    @classmethod
+    def get_column_type(cls, **kwargs: Any) -> PostgresTSVectorType:
+        return PostgresTSVectorType(config=kwargs["config"])
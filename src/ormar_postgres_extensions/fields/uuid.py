@@ -1,15 +1,48 @@
 from typing import Any
 
 import ormar
+from ormar import ModelDefinitionError
 from sqlalchemy.dialects import postgresql
 
+from .index import IndexedFieldFactory
 
-class UUID(ormar.UUID):
+UUID_FORMATS = {"hex", "string", "native"}
+
+
+class PostgresUUIDType(postgresql.UUID):
+    """
+    Postgres UUID type that hands uuid values to and from asyncpg untouched
+
+    asyncpg encodes and decodes uuid values in its binary format itself, so no
+    bind or result processing is done. `uuid_format` is read by ormar when it
+    prepares the values for `bulk_update`, "hex" and "string" convert them to
+    strings like `ormar.UUID` does while "native" passes the uuid values through.
+    """
+
+    def __init__(self, uuid_format: str = "hex") -> None:
+        super().__init__(as_uuid=False)
+        self.uuid_format = uuid_format
+
+
+class UUID(IndexedFieldFactory, ormar.UUID):
     """
     Custom UUID field for the schema that uses a native PG UUID type
+
+    With `uuid_format="native"` values are never converted to strings, which
+    saves converting and parsing them again for every value written.
     """
 
+    @classmethod
+    def validate(cls, **kwargs: Any) -> None:
+        uuid_format = kwargs.get("uuid_format", "hex")
+        if uuid_format not in UUID_FORMATS:
+            raise ModelDefinitionError(
+                f"Unknown uuid_format '{uuid_format}', "
+                f"use one of {', '.join(sorted(UUID_FORMATS))}"
+            )
+        super().validate(**kwargs)
+
     @classmethod
     def get_column_type(cls, **kwargs: Any) -> postgresql.UUID:
         # Tell Ormar that this column should be a postgres UUID type
-        return postgresql.UUID()
+        return PostgresUUIDType(uuid_format=kwargs.get("uuid_format", "hex"))
@@ -0,0 +1,172 @@
+from collections import (
+    Counter,
+    defaultdict,
+)
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from ormar.queryset import QuerySet
+from ormar.queryset.actions.filter_action import FilterAction
+
+from .operators import INSTALLED_OPERATORS
+from .patching import Patch
+
+# Kinds of metric events
+OPERATOR = "operator"
+QUERY = "query"
+ENCODE = "encode"
+DECODE = "decode"
+
+
+class MetricEvent(NamedTuple):
+    """
+    A measurement passed to the metrics callback
+
+    * `operator` - a filter clause was built for the operator `name`
+    * `query` - a query filtering on the operator `name` took `duration`
+    * `encode` / `decode` - a value of the field type `name` (e.g. "JSONB") was
+      converted to or from what the database driver sends in `duration`
+
+    Durations are in seconds, `operator` events have a duration of 0.
+    """
+
+    kind: str
+    name: str
+    duration: float
+
+
+MetricsCallback = Callable[[MetricEvent], None]
+
+_callback: Optional[MetricsCallback] = None
+
+
+def set_metrics_callback(callback: Optional[MetricsCallback]) -> None:
+    """
+    Set the function called with every `MetricEvent`, None stops collecting
+    metrics. The callback is called synchronously while queries are built, run
+    and their values converted, so it should only record the event.
+
+    :param callback: function receiving the metric events
+    :type callback: Optional[Callable[[MetricEvent], None]]
+    """
+    global _callback
+    _callback = callback
+    for patch in _PATCHES:
+        if callback is None:
+            patch.remove()
+        else:
+            patch.install()
+
+
+class MetricsCollector:
+    """
+    Metrics callback keeping the number of events and their total duration in
+    memory by kind and name, e.g. `collector.counts[("query", "jsonb_contains")]`
+    """
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.durations: DefaultDict[Tuple[str, str], float] = defaultdict(float)
+
+    def __call__(self, event: MetricEvent) -> None:
+        key = (event.kind, event.name)
+        self.counts[key] += 1
+        self.durations[key] += event.duration
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self.durations.clear()
+
+
+def instrument_codec(
+    kind: str, name: str, function: Callable[[Any], Any]
+) -> Callable[[Any], Any]:
+    """
+    Wrap a function converting single values of a field type so that it reports
+    `encode` or `decode` events while a metrics callback is set
+    """
+
+    @wraps(function)
+    def process(value: Any) -> Any:
+        callback = _callback
+        if callback is None:
+            return function(value)
+        start = perf_counter()
+        result = function(value)
+        callback(MetricEvent(kind, name, perf_counter() - start))
+        return result
+
+    return process
+
+
+# Operators of the filter clauses built while running the current query
+_query_operators: ContextVar[Optional[List[str]]] = ContextVar(
+    "query_operators", default=None
+)
+
+
+def _wrap_get_text_clause(get_text_clause: Callable) -> Callable:
+    def wrapper(self: FilterAction) -> Any:
+        callback = _callback
+        if callback is not None and self.operator in INSTALLED_OPERATORS:
+            callback(MetricEvent(OPERATOR, self.operator, 0.0))
+            operators = _query_operators.get()
+            if operators is not None:
+                operators.append(self.operator)
+        return get_text_clause(self)
+
+    return wrapper
+
+
+def _instrument_query(method: Callable) -> Callable:
+    @wraps(method)
+    async def wrapper(self: QuerySet, *args: Any, **kwargs: Any) -> Any:
+        # Queryset methods call each other, only the outermost call is timed
+        if _callback is None or _query_operators.get() is not None:
+            return await method(self, *args, **kwargs)
+
+        operators: List[str] = []
+        token = _query_operators.set(operators)
+        start = perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            duration = perf_counter() - start
+            _query_operators.reset(token)
+            callback = _callback
+            if callback is not None:
+                for operator in dict.fromkeys(operators):
+                    callback(MetricEvent(QUERY, operator, duration))
+
+    return wrapper
+
+
+# The queryset methods running queries, the others call one of these
+QUERY_METHODS = [
+    "_query_aggr_function",
+    "all",
+    "count",
+    "delete",
+    "exists",
+    "first",
+    "get",
+    "get_or_none",
+    "update",
+    "values",
+]
+
+# Installed while a metrics callback is set. The clause one wraps the clause
+# cache so that cached clauses are counted too
+_PATCHES = [Patch(FilterAction, "get_text_clause", _wrap_get_text_clause, order=1)] + [
+    Patch(QuerySet, name, _instrument_query) for name in QUERY_METHODS
+]
@@ -0,0 +1,193 @@
+import asyncio
+from collections import defaultdict
+from ipaddress import (
+    IPv4Address,
+    IPv4Interface,
+    IPv4Network,
+    IPv6Address,
+    IPv6Interface,
+    IPv6Network,
+)
+from time import monotonic
+from typing import (
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import ormar
+from ormar.exceptions import QueryDefinitionError
+from ormar.queryset import QuerySet
+
+from .fields.inet import (
+    CompactIPAddress,
+    IPTypeMixin,
+    parse_address,
+)
+
+Network = Union[
+    IPv4Address,
+    IPv6Address,
+    IPv4Interface,
+    IPv6Interface,
+    IPv4Network,
+    IPv6Network,
+    CompactIPAddress,
+    str,
+]
+
+# Models of the rows by network address for each prefix length
+_PrefixTable = Dict[int, Dict[int, List[ormar.Model]]]
+
+
+def _prefix(value: Network) -> Tuple[int, int, int]:
+    # Version, address as an integer and prefix length the value is compared
+    # with, like postgres only the first prefix length bits of it count
+    if isinstance(value, CompactIPAddress):
+        value = value.address
+    elif isinstance(value, str):
+        value = parse_address(value)
+    if isinstance(value, (IPv4Interface, IPv6Interface)):
+        return value.version, int(value.ip), value.network.prefixlen
+    if isinstance(value, (IPv4Network, IPv6Network)):
+        return value.version, int(value.network_address), value.prefixlen
+    return value.version, int(value), value.max_prefixlen
+
+
+class NetworkCache:
+    """
+    In memory longest prefix match lookups on the networks of an INET or CIDR
+    field, for tables that are read much more often than they change
+
+    The rows of the queryset are loaded once and kept in a hash table per prefix
+    length. A lookup probes the prefix lengths present in the table from the
+    longest to the shortest, so it costs a few dictionary lookups and no query.
+    `match_all` returns the same rows as filtering with `contains_subnet_eq`
+    (`>>=`) and `match` the one with the longest prefix.
+
+    The rows are loaded again by `refresh` or, when a `ttl` in seconds is given,
+    by the first `lookup` after it has passed. A refresh swaps the whole table at
+    once, lookups never see a partially loaded one.
+    """
+
+    def __init__(
+        self, queryset: QuerySet, field: str, ttl: Optional[float] = None
+    ) -> None:
+        model = queryset.model
+        model_field = model.Meta.model_fields.get(field)
+        if model_field is None or not isinstance(
+            model.Meta.table.columns[model_field.get_alias()].type, IPTypeMixin
+        ):
+            raise QueryDefinitionError(
+                f"{model.get_name()}.{field} is not an INET or CIDR field"
+            )
+        self.queryset = queryset
+        self.field = field
+        self.ttl = ttl
+        self.loaded_at: Optional[float] = None
+        self._tables: Dict[int, _PrefixTable] = {}
+        self._prefix_lengths: Dict[int, List[int]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the rows were never loaded or were loaded longer than `ttl` ago
+        """
+        if self.loaded_at is None:
+            return True
+        return self.ttl is not None and monotonic() - self.loaded_at >= self.ttl
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Created on first use so that it belongs to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def refresh(self) -> None:
+        """
+        Load the rows of the queryset and replace the cached ones with them
+        """
+        async with self._get_lock():
+            await self._load()
+
+    async def _load(self) -> None:
+        tables: DefaultDict[int, _PrefixTable] = defaultdict(dict)
+        for obj in await self.queryset.all():
+            value = getattr(obj, self.field)
+            if value is None:
+                continue
+            version, address, prefix_length = _prefix(value)
+            max_length = 32 if version == 4 else 128
+            networks = tables[version].setdefault(prefix_length, {})
+            networks.setdefault(address >> (max_length - prefix_length), []).append(obj)
+
+        self._tables = dict(tables)
+        self._prefix_lengths = {
+            version: sorted(table, reverse=True) for version, table in tables.items()
+        }
+        self.loaded_at = monotonic()
+
+    async def _refresh_if_expired(self) -> None:
+        if not self.expired:
+            return
+        async with self._get_lock():
+            # Another lookup may have loaded the rows while this one waited
+            if self.expired:
+                await self._load()
+
+    def _matches(self, address: Network) -> Iterator[List[ormar.Model]]:
+        # Rows of each network containing the address, the longest prefix first
+        version, value, prefix_length = _prefix(address)
+        table = self._tables.get(version)
+        if table is None:
+            return
+        max_length = 32 if version == 4 else 128
+        for length in self._prefix_lengths[version]:
+            if length <= prefix_length:
+                found = table[length].get(value >> (max_length - length))
+                if found:
+                    yield found
+
+    def match_all(self, address: Network) -> List[ormar.Model]:
+        """
+        All cached rows whose network contains or equals the address, the longest
+        prefix first. Doesn't refresh the cache, nothing matches before the rows
+        were loaded.
+
+        :param address: address or network to look up
+        :type address: Network
+        :return: matching models
+        :rtype: List[ormar.Model]
+        """
+        return [obj for found in self._matches(address) for obj in found]
+
+    def match(self, address: Network) -> Optional[ormar.Model]:
+        """
+        The cached row with the longest network prefix containing or equal to the
+        address, None when there's none. Doesn't refresh the cache.
+
+        :param address: address or network to look up
+        :type address: Network
+        :return: matching model
+        :rtype: Optional[ormar.Model]
+        """
+        for found in self._matches(address):
+            return found[0]
+        return None
+
+    async def lookup(self, address: Network) -> Optional[ormar.Model]:
+        """
+        Like `match` but loads the rows first when the cache has expired
+
+        :param address: address or network to look up
+        :type address: Network
+        :return: matching model
+        :rtype: Optional[ormar.Model]
+        """
+        await self._refresh_if_expired()
+        return self.match(address)
@@ -0,0 +1,163 @@
+from typing import (
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from ormar import ModelDefinitionError
+from ormar.queryset import FieldAccessor
+from ormar.queryset.actions.filter_action import (
+    FILTER_OPERATORS,
+    METHODS_TO_OPERATORS,
+)
+
+from .clause_cache import (
+    cache_operator,
+    install_clause_cache,
+)
+
+
+class Operator(NamedTuple):
+    """
+    A filter operator added to ormar by one of the field modules
+
+    `name` is used in filters (`field__name=value`) and as the FieldAccessor
+    method, `comparator` is the method of the column comparator building the
+    clause and `module` the field module that registered the operator.
+
+    `indexes` are the (access method, operator class) pairs of the indexes that
+    can be used for the operator, the first one is the suggested index.
+    """
+
+    name: str
+    method: Callable
+    comparator: str
+    module: str
+    indexes: Tuple[Tuple[str, str], ...] = ()
+
+
+class OperatorConflictError(ModelDefinitionError):
+    """
+    Raised when an operator is registered under a name that is already used by
+    ormar or by another module with a different meaning
+    """
+
+
+_operators: Dict[str, Operator] = {}
+_modules: Dict[str, List[Operator]] = {}
+_installed: Set[str] = set()
+
+# Names of the operators installed in ormar
+INSTALLED_OPERATORS: Set[str] = set()
+
+
+def register_operators(
+    module: str,
+    field_accessor_map: Sequence[Tuple[str, Callable]],
+    accessor_map: Sequence[Tuple[str, str]],
+    index_map: Optional[Sequence[Tuple[str, Sequence[Tuple[str, str]]]]] = None,
+) -> None:
+    """
+    Register the filter operators of a field module without installing them
+
+    Operators are installed in ormar with `install_operators`, which the fields
+    do when they are first declared. Registering the same operator again from
+    another module is allowed as long as it maps to the same comparator method.
+
+    :param module: name of the module the operators belong to, e.g. "jsonb"
+    :type module: str
+    :param field_accessor_map: FieldAccessor method for each operator
+    :type field_accessor_map: Sequence[Tuple[str, Callable]]
+    :param accessor_map: column comparator method for each operator
+    :type accessor_map: Sequence[Tuple[str, str]]
+    :param index_map: index access methods and operator classes supporting the
+    operators, operators without an entry can't use an index
+    :type index_map: Optional[Sequence[Tuple[str, Sequence[Tuple[str, str]]]]]
+    """
+    methods = dict(field_accessor_map)
+    comparators = dict(accessor_map)
+    indexes = dict(index_map or [])
+    if methods.keys() != comparators.keys():
+        raise ModelDefinitionError(
+            f"Operators of {module} need both a method and a comparator: "
+            f"{sorted(methods.keys() ^ comparators.keys())}"
+        )
+
+    operators = [
+        Operator(
+            name, methods[name], comparators[name], module, tuple(indexes.get(name, ()))
+        )
+        for name in comparators
+    ]
+    for operator in operators:
+        _check_conflict(operator)
+    for operator in operators:
+        _operators.setdefault(operator.name, operator)
+    _modules.setdefault(module, []).extend(operators)
+    # Operators added to a module that is already installed are installed too
+    if module in _installed:
+        _install(operators)
+
+
+def _check_conflict(operator: Operator) -> None:
+    registered = _operators.get(operator.name)
+    if registered is not None:
+        if registered.comparator != operator.comparator:
+            raise OperatorConflictError(
+                f"Operator {operator.name} of {operator.module} maps to "
+                f"{operator.comparator} but {registered.module} maps it to "
+                f"{registered.comparator}"
+            )
+        return
+    if operator.name in FILTER_OPERATORS or hasattr(FieldAccessor, operator.name):
+        raise OperatorConflictError(
+            f"Operator {operator.name} of {operator.module} is already defined "
+            "by ormar"
+        )
+
+
+def _install(operators: Sequence[Operator]) -> None:
+    if operators and not INSTALLED_OPERATORS:
+        install_clause_cache()
+    for operator in operators:
+        setattr(FieldAccessor, operator.name, operator.method)
+        FILTER_OPERATORS[operator.name] = operator.comparator
+        METHODS_TO_OPERATORS[operator.name] = operator.name
+        INSTALLED_OPERATORS.add(operator.name)
+        cache_operator(operator.name)
+
+
+def install_operators(*modules: str) -> None:
+    """
+    Add the operators of the given modules (all registered modules when none are
+    given) to ormar's filters and FieldAccessor. Installing is idempotent.
+
+    :param modules: names of the modules to install the operators of
+    :type modules: str
+    """
+    for module in modules or list(_modules):
+        if module in _installed:
+            continue
+        if module not in _modules:
+            raise KeyError(f"No operators registered for {module}")
+        _install(_modules[module])
+        _installed.add(module)
+
+
+def registered_operators() -> Dict[str, Operator]:
+    """
+    All registered operators by name, whether they are installed or not
+    """
+    return dict(_operators)
+
+
+def installed_modules() -> Set[str]:
+    """
+    Names of the modules whose operators are installed
+    """
+    return set(_installed)
@@ -0,0 +1,67 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+)
+
+# Method replaced and the patches of each patched (class, method name)
+_patched: Dict[Tuple[type, str], Tuple[Any, List["Patch"]]] = {}
+
+
+class Patch:
+    """
+    Replacement of a method of an ormar class that is only in place while some
+    feature of the package needs it
+
+    `wrap` is called with the method when the patch is installed and returns the
+    function replacing it. Patches of the same method are chained whatever the
+    order they are installed in, the ones with a higher `order` wrap the others.
+    Removing the last one restores the method.
+    """
+
+    def __init__(
+        self,
+        owner: type,
+        name: str,
+        wrap: Callable[[Callable], Callable],
+        order: int = 0,
+    ) -> None:
+        self.owner = owner
+        self.name = name
+        self.wrap = wrap
+        self.order = order
+
+    @property
+    def installed(self) -> bool:
+        entry = _patched.get((self.owner, self.name))
+        return entry is not None and self in entry[1]
+
+    def install(self) -> None:
+        if self.installed:
+            return
+        key = (self.owner, self.name)
+        original, patches = _patched.setdefault(key, (vars(self.owner)[self.name], []))
+        patches.append(self)
+        patches.sort(key=lambda patch: patch.order)
+        self._apply(original, patches)
+
+    def remove(self) -> None:
+        if not self.installed:
+            return
+        key = (self.owner, self.name)
+        original, patches = _patched[key]
+        patches.remove(self)
+        if not patches:
+            del _patched[key]
+        self._apply(original, patches)
+
+    def _apply(self, original: Any, patches: List["Patch"]) -> None:
+        is_classmethod = isinstance(original, classmethod)
+        function = original.__func__ if is_classmethod else original
+        for patch in patches:
+            function = patch.wrap(function)
+        if patches and is_classmethod:
+            function = classmethod(function)
+        setattr(self.owner, self.name, function if patches else original)
@@ -0,0 +1,399 @@
+from collections import defaultdict
+from ipaddress import (
+    IPv4Address,
+    IPv4Interface,
+    IPv6Address,
+    IPv6Interface,
+)
+from itertools import count
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Union,
+)
+
+import ormar
+import sqlalchemy
+from ormar.exceptions import (
+    NoMatch,
+    QueryDefinitionError,
+)
+from ormar.queryset import QuerySet
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+from sqlalchemy.sql.expression import ColumnElement
+
+from .fields.array import array_parameter
+from .fields.deferred import deferred_fields
+from .fields.expressions import bind_columns
+from .fields.trgm import trgm_distance
+from .fields.tsvector import (
+    PostgresTSVectorType,
+    ts_rank,
+)
+
+Address = Union[IPv4Address, IPv6Address, IPv4Interface, IPv6Interface, str]
+
+# Label of the position of the address a row was matched by, named so that it
+# can't clash with the columns of the model
+_POSITION_LABEL = "_lookup_networks_position"
+
+
+async def project(
+    queryset: QuerySet, *fields: str, **expressions: ColumnElement
+) -> List[Dict[str, Any]]:
+    """
+    Run the queryset but select only the given fields and SQL expressions
+
+    Filters, ordering, limit and offset of the queryset are kept. Only the
+    selected values are transferred from the database, which is useful to pick
+    a few values out of large documents or arrays without loading the model.
+
+    :param queryset: queryset to run, e.g. `Model.objects.filter(...)`
+    :type queryset: ormar.queryset.QuerySet
+    :param fields: names of model fields to include as they are
+    :type fields: str
+    :param expressions: SQL expressions to include under the keyword name, the
+        columns they name by field are the ones of the queryset model
+    :type expressions: ColumnElement
+    :return: one dictionary per row keyed by field and expression names
+    :rtype: List[Dict[str, Any]]
+    """
+    model = queryset.model
+    table = model.Meta.table
+    columns = [
+        table.columns[model.get_column_alias(name)].label(name) for name in fields
+    ]
+    columns.extend(
+        bind_columns(model, expression).label(name)
+        for name, expression in expressions.items()
+    )
+    if not columns:
+        raise ValueError("project needs at least one field or expression")
+
+    expr = queryset.build_select_expression().with_only_columns(columns)
+    rows = await queryset.database.fetch_all(expr)
+    names = [*fields, *expressions]
+    return [{name: row[name] for name in names} for row in rows]
+
+
+async def lookup_networks(
+    queryset: QuerySet, field: str, addresses: Iterable[Address]
+) -> Dict[Address, List[ormar.Model]]:
+    """
+    Find the rows whose INET/CIDR field contains each of the given addresses
+
+    Works like running `filter(<field>__contains_subnet_eq=address)` for every
+    address, but all addresses are sent as a single array parameter and joined
+    against the table with `unnest(addresses) <<= field` in one query. A GiST
+    index on the field, e.g. `CIDR(index="gist")`, is used for the join.
+
+    Filters and ordering of the queryset are kept, limit and offset apply to the
+    joined rows. Related models are loaded with `select_related` but
+    `prefetch_related` is not supported.
+
+    :param queryset: queryset to match against, e.g. `Model.objects.filter(...)`
+    :type queryset: ormar.queryset.QuerySet
+    :param field: name of the INET or CIDR field holding the networks
+    :type field: str
+    :param addresses: addresses to look up
+    :type addresses: Iterable[Address]
+    :return: matching models for each address, in the order they were given
+    :rtype: Dict[Address, List[ormar.Model]]
+    """
+    addresses = list(addresses)
+    if not addresses:
+        return {}
+
+    model = queryset.model
+    column = model.Meta.table.columns[model.get_column_alias(field)]
+    array_type = postgresql.ARRAY(postgresql.INET)
+    unnested = (
+        sqlalchemy.func.unnest(
+            sqlalchemy.cast(sqlalchemy.literal(addresses, array_type), array_type)
+        )
+        .table_valued("address", with_ordinality="position")
+        .render_derived()
+    )
+    expr = (
+        queryset.build_select_expression()
+        .add_columns(unnested.c.position.label(_POSITION_LABEL))
+        .where(unnested.c.address.op("<<=")(column))
+    )
+    rows = await queryset.database.fetch_all(expr)
+
+    rows_by_position = defaultdict(list)
+    for row in rows:
+        rows_by_position[row[_POSITION_LABEL]].append(row)
+
+    result: Dict[Address, List[ormar.Model]] = {}
+    for position, address in enumerate(addresses, start=1):
+        if address in result:
+            continue
+        matches = rows_by_position.get(position)
+        result[address] = (
+            queryset._process_query_result_rows(matches) if matches else []
+        )
+    return result
+
+
+async def search(
+    queryset: QuerySet, field: str, query: str, plain: bool = False
+) -> List[ormar.Model]:
+    """
+    Find the rows whose TSVECTOR field matches the text, the best ranked first
+
+    Filters the queryset with `tsvector_match`, or `tsvector_match_plain` when
+    plain is set, and orders the rows by `ts_rank` of the field and the query
+    instead of the ordering of the queryset. Rows ranked the same are ordered by
+    primary key. Limit and offset apply to the ranked rows, e.g.
+    `search(Model.objects.limit(10), "document", "quick fox")` returns the ten
+    best matches.
+
+    :param queryset: queryset to search in, e.g. `Model.objects.filter(...)`
+    :type queryset: ormar.queryset.QuerySet
+    :param field: name of the TSVECTOR field
+    :type field: str
+    :param query: text searched for, in the web search syntax unless plain is set
+    :type query: str
+    :param plain: parse the text with `plainto_tsquery`
+    :type plain: bool
+    :return: matching models, the best ranked first
+    :rtype: List[ormar.Model]
+    """
+    column = _field_column(queryset, field, PostgresTSVectorType, "a TSVECTOR")
+    operator = "tsvector_match_plain" if plain else "tsvector_match"
+    return await _fetch_ordered(
+        queryset.filter(**{f"{field}__{operator}": query}),
+        ts_rank(column, query, plain=plain).desc(),
+    )
+
+
+async def nearest(
+    queryset: QuerySet, field: str, value: str, word: bool = False
+) -> List[ormar.Model]:
+    """
+    Order the rows by the trigram distance of a string field to the value, the
+    most similar first
+
+    Orders by `field <-> value`, or `field <->> value` using the word similarity
+    when word is set, instead of the ordering of the queryset. Rows at the same
+    distance are ordered by primary key. With a limit, e.g.
+    `nearest(Model.objects.limit(10), "hostname", "web-01")`, a GiST trigram
+    index on the field (`index="gist"`) finds the nearest rows without scoring
+    all of them. Filter with `trgm_similar` to only keep similar rows.
+
+    :param queryset: queryset to order, e.g. `Model.objects.filter(...)`
+    :type queryset: ormar.queryset.QuerySet
+    :param field: name of the string field
+    :type field: str
+    :param value: string to compare with
+    :type value: str
+    :param word: use the word similarity
+    :type word: bool
+    :return: models ordered by distance
+    :rtype: List[ormar.Model]
+    """
+    column = _field_column(queryset, field, sqlalchemy.String, "a string")
+    return await _fetch_ordered(queryset, trgm_distance(column, value, word=word))
+
+
+def _field_column(
+    queryset: QuerySet, field: str, column_type: type, description: str
+) -> sqlalchemy.Column:
+    model = queryset.model
+    model_field = model.Meta.model_fields.get(field)
+    if model_field is None or model_field.is_relation:
+        raise QueryDefinitionError(
+            f"{model.get_name()}.{field} is not {description} field"
+        )
+    column = model.Meta.table.columns[model_field.get_alias()]
+    if not isinstance(column.type, column_type):
+        raise QueryDefinitionError(
+            f"{model.get_name()}.{field} is not {description} field"
+        )
+    return column
+
+
+async def _fetch_ordered(
+    queryset: QuerySet, ordering: ColumnElement
+) -> List[ormar.Model]:
+    # Replaces the ordering of the queryset, the primary key breaks ties
+    model = queryset.model
+    pk_column = model.Meta.table.columns[model.get_column_alias(model.Meta.pkname)]
+    expr = (
+        queryset.build_select_expression().order_by(None).order_by(ordering, pk_column)
+    )
+    rows = await queryset.database.fetch_all(expr)
+    return queryset._process_query_result_rows(rows)
+
+
+async def load_deferred(
+    instances: Union[ormar.Model, Sequence[ormar.Model]], *fields: str
+) -> None:
+    """
+    Load deferred fields of the given models from the database
+
+    The values for all models of the same class are fetched in a single query.
+    Other fields of the models are not refreshed and the save status of the models
+    is kept.
+
+    :param instances: model or models to load the fields for
+    :type instances: Union[ormar.Model, Sequence[ormar.Model]]
+    :param fields: names of the fields to load, all deferred fields if not given
+    :type fields: str
+    :raises NoMatch: if one of the models is not in the database
+    """
+    if isinstance(instances, ormar.Model):
+        instances = [instances]
+
+    instances_by_model = defaultdict(list)
+    for instance in instances:
+        instances_by_model[type(instance)].append(instance)
+
+    for model, objects in instances_by_model.items():
+        names = fields or sorted(deferred_fields(model))
+        if not names:
+            continue
+
+        table = model.Meta.table
+        pk_column = table.columns[model.get_column_alias(model.Meta.pkname)]
+        columns = [table.columns[model.get_column_alias(name)] for name in names]
+        # Bound as one array so the SQL is the same for any number of models
+        pks = array_parameter(
+            [obj.pk for obj in objects], postgresql.ARRAY(pk_column.type)
+        )
+        expr = sqlalchemy.select([pk_column, *columns]).where(
+            pk_column == sqlalchemy.any_(pks)
+        )
+        rows = await model.Meta.database.fetch_all(expr)
+
+        rows_by_pk = {row[pk_column.name]: row for row in rows}
+        for obj in objects:
+            row = rows_by_pk.get(obj.pk)
+            if row is None:
+                raise NoMatch("Instance was deleted from database and cannot be loaded")
+            saved = obj.saved
+            obj.update_from_dict(
+                obj.translate_aliases_to_columns(
+                    {column.name: row[column.name] for column in columns}
+                )
+            )
+            obj.set_save_status(saved)
+
+
+async def fetch_deferred(instance: ormar.Model, field: str) -> Any:
+    """
+    Return the value of a deferred field, loading it first if it isn't loaded
+
+    A deferred field that is None is considered not loaded, so nullable fields
+    that are None are fetched again on every call.
+
+    :param instance: model to get the value from
+    :type instance: ormar.Model
+    :param field: name of the field
+    :type field: str
+    :return: value of the field
+    :rtype: Any
+    """
+    if getattr(instance, field) is None and field in deferred_fields(type(instance)):
+        await load_deferred(instance, field)
+    return getattr(instance, field)
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+_cursor_ids = count()
+
+
+class DeclareCursor(Executable, ClauseElement):
+    """
+    works as postgresql `DECLARE name NO SCROLL CURSOR FOR statement`
+    """
+
+    inherit_cache = False
+
+    def __init__(self, name: str, statement: ClauseElement) -> None:
+        self.name = name
+        self.statement = statement
+
+
+@compiles(DeclareCursor)
+def _compile_declare_cursor(
+    element: DeclareCursor, compiler: Any, **kwargs: Any
+) -> str:
+    return f"DECLARE {element.name} NO SCROLL CURSOR FOR " + compiler.process(
+        element.statement, **kwargs
+    )
+
+
+async def iterate_batches(
+    queryset: QuerySet, batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncGenerator[List[ormar.Model], None]:
+    """
+    Iterate over the models of the queryset in lists of up to `batch_size`
+
+    The query runs in a server side cursor inside a transaction and only one
+    batch of rows is fetched and decoded at a time, so memory use doesn't grow
+    with the size of the result and the first models are available as soon as
+    the first batch is fetched.
+
+    The transaction and the cursor are open until the generator finishes. A loop
+    that can end early has to close it, with `contextlib.aclosing` or `aclose`,
+    otherwise the connection stays busy and the next query on it fails.
+
+    :param queryset: queryset to run, e.g. `Model.objects.filter(...)`
+    :type queryset: ormar.queryset.QuerySet
+    :param batch_size: number of rows fetched from the cursor at a time
+    :type batch_size: int
+    :return: asynchronous generator of lists of models
+    :rtype: AsyncGenerator[List[ormar.Model], None]
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if queryset._prefetch_related:
+        raise QueryDefinitionError(
+            "Prefetch related queries are not supported in iterators"
+        )
+
+    model = queryset.model
+    expr = queryset.build_select_expression()
+    name = f"ormar_pg_ext_cursor_{next(_cursor_ids)}"
+    # Typed as the columns of the query so the rows are decoded like those of the
+    # query itself
+    fetch = sqlalchemy.text(f"FETCH FORWARD {batch_size} FROM {name}").columns(
+        *expr.selected_columns
+    )
+    pk_alias = model.get_column_alias(model.Meta.pkname)
+    # With select_related a model spans several rows, the rows of the last model
+    # of a batch are kept for the next one as more of them may follow
+    pending: List[Any] = []
+
+    database = queryset.database
+    async with database.transaction():
+        await database.execute(DeclareCursor(name, expr))
+        while True:
+            rows = await database.fetch_all(fetch)
+            if not rows:
+                break
+            if not queryset._select_related:
+                yield queryset._process_query_result_rows(rows)
+                continue
+
+            rows = pending + rows
+            last_pk = rows[-1][pk_alias]
+            split = len(rows)
+            while split and rows[split - 1][pk_alias] == last_pk:
+                split -= 1
+            pending = rows[split:]
+            if split:
+                yield queryset._process_query_result_rows(rows[:split])
+
+        if pending:
+            yield queryset._process_query_result_rows(pending)
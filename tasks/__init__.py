@@ -1,6 +1,7 @@
 from invoke import Collection
 
 from . import (
+    benchmark,
     build,
     database,
     lint,
@@ -9,6 +10,7 @@ from . import (
 
 ns = Collection()
 # Top level tasks
+ns.add_task(benchmark.benchmark)
 ns.add_task(build.dist, name="build")
 ns.add_task(build.requirements)
 ns.add_task(build.release)
@@ -0,0 +1,34 @@
+from invoke import task
+
+from .utils import ctx_run
+
+
+@task(
+    help={
+        "output": "JSON file the results are written to",
+        "field": "Only benchmark the given field type",
+        "rows": "Comma separated table sizes for the database benchmarks",
+        "skip-db": "Only run the benchmarks that don't need a database",
+        "compare": "Baseline JSON file to check the new results against",
+    }
+)
+def benchmark(
+    ctx,
+    output="benchmark.json",
+    field=None,
+    rows=None,
+    skip_db=False,
+    compare=None,
+):
+    """
+    Run the benchmark suite
+    """
+    flags = {
+        f"--field {field}": field,
+        f"--rows {rows}": rows,
+        "--skip-db": skip_db,
+    }
+    run_flags = " ".join(flag for flag, enabled in flags.items() if enabled)
+    ctx_run(ctx, f"python -m benchmarks run -o {output} {run_flags}")
+    if compare:
+        ctx_run(ctx, f"python -m benchmarks compare {compare} {output}")
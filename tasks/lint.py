@@ -8,7 +8,7 @@ from .utils import ctx_run
 lint_commands = {
     "isort": lambda fix: f"python -m isort {'' if fix else '--check'} .",
     "black": lambda fix: f"python -m black {'' if fix else '--check'} .",
-    "flake8": lambda _: "python -m flake8 src tests *.py",
+    "flake8": lambda _: "python -m flake8 src tests benchmarks *.py",
 }
 
 
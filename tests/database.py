@@ -1,4 +1,7 @@
+import os
+
 import databases
+import pytest
 import sqlalchemy
 
 DB_HOST = "localhost"
@@ -8,3 +11,20 @@ DATABASE_URL = databases.DatabaseURL(
 )
 database = databases.Database(str(DATABASE_URL))
 metadata = sqlalchemy.MetaData()
+
+
+def create_extension(name, extension_metadata):
+    # Creates the tables needing the extension once it exists. Their tests are
+    # skipped when a local server doesn't provide it but must run in CI
+    engine = sqlalchemy.create_engine(str(DATABASE_URL.replace(scheme="postgresql")))
+    try:
+        with engine.connect() as conn:
+            conn.execute(f"CREATE EXTENSION IF NOT EXISTS {name}")
+        extension_metadata.create_all(engine)
+    except sqlalchemy.exc.DBAPIError as error:
+        message = f"{name} extension is not available: {error}"
+        if os.environ.get("CI"):
+            pytest.fail(message)
+        pytest.skip(message)
+    finally:
+        engine.dispose()
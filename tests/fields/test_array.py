@@ -3,6 +3,10 @@ from typing import Optional
 import ormar
 import pytest
 import sqlalchemy
+from sqlalchemy.dialects.postgresql import (
+    array,
+    pypostgresql,
+)
 
 import ormar_postgres_extensions as ormar_pg_ext
 from tests.database import (
@@ -41,6 +45,15 @@ class NullableArrayTestModel(ormar.Model):
     )
 
 
+class AliasedArrayTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String(), name="items")
+
+
 @pytest.mark.asyncio
 async def test_create_model_with_array(db):
     created = await ArrayTestModel(data=["a", "b"], thing="test thing").save()
@@ -179,3 +192,179 @@ async def test_multi_dimensional_array(db):
         [1, 2],
         [3, 4],
     ]
+
+
+@pytest.mark.parametrize(
+    "operator", ["array_contains", "array_contained_by", "array_overlap"]
+)
+def test_filter_array_sql_independent_of_length(operator):
+    dialect = pypostgresql.dialect(paramstyle="pyformat")
+    statements = set()
+    for value, expected in [
+        (["a"], ["a"]),
+        (["a", "b", "c"], ["a", "b", "c"]),
+        (array(["a", "b"]), ["a", "b"]),
+        (("a", "b", "c", "d"), ["a", "b", "c", "d"]),
+    ]:
+        expr = ArrayTestModel.objects.filter(
+            **{f"data__{operator}": value}
+        ).build_select_expression()
+        compiled = expr.compile(dialect=dialect)
+        assert list(compiled.params.values()) == [expected]
+        statements.add(str(compiled))
+
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_filter_array_literal(db):
+    await ArrayTestModel(data=["a", "b"]).save()
+    await ArrayTestModel(data=["c"]).save()
+
+    found = await ArrayTestModel.objects.filter(
+        data__array_overlap=array(["b", "c"])
+    ).all()
+    assert len(found) == 2
+
+
+@pytest.mark.asyncio
+async def test_array_append_prepend(db):
+    first = await ArrayTestModel(data=["a", "b"]).save()
+    second = await ArrayTestModel(data=["c"]).save()
+
+    await ArrayTestModel.objects.filter(data__array_contains=["a"]).update(
+        data=ormar_pg_ext.array_prepend(ormar_pg_ext.array_append("data", "z"), "y")
+    )
+
+    await first.load()
+    await second.load()
+    assert first.data == ["y", "a", "b", "z"]
+    assert second.data == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_array_update_aliased_field(db):
+    created = await AliasedArrayTestModel(data=["a", "b"]).save()
+
+    await AliasedArrayTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.array_remove(ormar_pg_ext.array_append("data", "c"), "a")
+    )
+
+    await created.load()
+    assert created.data == ["b", "c"]
+    found = await ormar_pg_ext.project(
+        AliasedArrayTestModel.objects, count=ormar_pg_ext.cardinality("data")
+    )
+    assert found == [{"count": 2}]
+
+
+@pytest.mark.asyncio
+async def test_array_remove(db):
+    created = await ArrayTestModel(data=["a", "b", "a"]).save()
+
+    await ArrayTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.array_remove("data", "a")
+    )
+    await created.load()
+    assert created.data == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_array_cat(db):
+    created = await ArrayTestModel(data=["a", "b"]).save()
+
+    await ArrayTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.array_cat("data", ["b", "c"])
+    )
+    await created.load()
+    assert created.data == ["a", "b", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_array_union(db):
+    created = await ArrayTestModel(data=["b", "a", "b"]).save()
+
+    await ArrayTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.array_union("data", ["c", "a", "d", "c"])
+    )
+    await created.load()
+    assert created.data == ["b", "a", "c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_array_union_null(db):
+    created = await NullableArrayTestModel().save()
+
+    await NullableArrayTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.array_union("data", ["a", "a"])
+    )
+    await created.load()
+    assert created.data == ["a"]
+
+
+async def create_array_models():
+    await ArrayTestModel(data=["a", "b", "c"], thing="three").save()
+    await ArrayTestModel(data=["b"], thing="one").save()
+    await ArrayTestModel(data=[], thing="empty").save()
+
+
+@pytest.mark.asyncio
+async def test_filter_array_any(db):
+    await create_array_models()
+
+    found = await ArrayTestModel.objects.filter(data__array_any="b").all()
+    assert sorted(obj.thing for obj in found) == ["one", "three"]
+
+    found = await ArrayTestModel.objects.filter(
+        ArrayTestModel.data.array_any("c")
+    ).all()
+    assert [obj.thing for obj in found] == ["three"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "operator, value, expected",
+    [
+        ("array_cardinality", 0, ["empty"]),
+        ("array_cardinality_gt", 1, ["three"]),
+        ("array_cardinality_gte", 1, ["one", "three"]),
+        ("array_cardinality_lt", 1, ["empty"]),
+        ("array_cardinality_lte", 1, ["empty", "one"]),
+    ],
+)
+async def test_filter_array_cardinality(db, operator, value, expected):
+    await create_array_models()
+
+    found = await ArrayTestModel.objects.filter(**{f"data__{operator}": value}).all()
+    assert sorted(obj.thing for obj in found) == expected
+
+
+@pytest.mark.asyncio
+async def test_array_annotations(db):
+    await create_array_models()
+
+    rows = await ormar_pg_ext.project(
+        ArrayTestModel.objects.order_by("id"),
+        "thing",
+        count=ormar_pg_ext.cardinality("data"),
+        length=ormar_pg_ext.array_length("data"),
+        position=ormar_pg_ext.array_position("data", "b"),
+    )
+    assert rows == [
+        {"thing": "three", "count": 3, "length": 3, "position": 2},
+        {"thing": "one", "count": 1, "length": 1, "position": 1},
+        {"thing": "empty", "count": 0, "length": None, "position": None},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_multi_dimensional_array_length(db):
+    await MultiDimensionArrayTestModel(data=[[1, 2, 3], [4, 5, 6]]).save()
+
+    rows = await ormar_pg_ext.project(
+        MultiDimensionArrayTestModel.objects,
+        count=ormar_pg_ext.cardinality("data"),
+        rows=ormar_pg_ext.array_length("data"),
+        columns=ormar_pg_ext.array_length("data", 2),
+    )
+    assert rows == [{"count": 6, "rows": 2, "columns": 3}]
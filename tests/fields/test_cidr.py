@@ -5,6 +5,7 @@ from ipaddress import (
     IPv6Interface,
     ip_address,
     ip_interface,
+    ip_network,
 )
 from typing import (
     Optional,
@@ -46,6 +47,15 @@ class NullableCidrTestModel(ormar.Model):
     cidr: Optional[IPAddress] = ormar_pg_ext.CIDR(nullable=True)
 
 
+class CompactCidrTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    cidr: ormar_pg_ext.CompactIPAddress = ormar_pg_ext.CIDR(ip_decode="compact")
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "ip, ip_type",
@@ -221,3 +231,17 @@ async def test_cidr_contains_or_eq(db, ip, contained, expected):
         assert found[0] == created
     else:
         assert len(found) == 0
+
+
+@pytest.mark.asyncio
+async def test_compact_cidr(db):
+    created = await CompactCidrTestModel(cidr="192.168.1.0/24").save()
+
+    found = await CompactCidrTestModel.objects.get(
+        cidr__contains_subnet=ip_address("192.168.1.5")
+    )
+    assert isinstance(found.cidr, ormar_pg_ext.CompactIPAddress)
+    # The driver decodes cidr values as networks
+    assert found.cidr.address == ip_network("192.168.1.0/24")
+    assert found.cidr == created.cidr
+    assert found.cidr.num_addresses == 256
@@ -0,0 +1,231 @@
+from typing import Optional
+
+import ormar
+import pytest
+import sqlalchemy
+from ormar import ModelDefinitionError
+from ormar.exceptions import ModelPersistenceError
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields.deferred import (
+    deferred_fields,
+    not_loaded_fields,
+)
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class DeferredTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    name: str = ormar.String(max_length=20)
+    data: dict = ormar_pg_ext.JSONB(deferred=True)
+    tags: list = ormar_pg_ext.ARRAY(
+        item_type=sqlalchemy.String(), deferred=True, name="all_tags"
+    )
+
+
+class DeferredChildTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    parent: Optional[DeferredTestModel] = ormar.ForeignKey(DeferredTestModel)
+    data: Optional[dict] = ormar_pg_ext.JSONB(deferred=True, nullable=True)
+
+
+async def create_models():
+    await DeferredTestModel(name="first", data={"a": 1}, tags=["x"]).save()
+    await DeferredTestModel(name="second", data={"a": 2}, tags=["y", "z"]).save()
+
+
+def test_deferred_columns_not_selected():
+    sql = str(DeferredTestModel.objects.build_select_expression())
+    assert "deferredtestmodels.name" in sql
+    assert "deferredtestmodels.data" not in sql
+    assert "deferredtestmodels.all_tags" not in sql
+
+
+def test_deferred_column_nullable():
+    assert not DeferredTestModel.Meta.table.columns["data"].nullable
+    assert not DeferredTestModel.Meta.table.columns["all_tags"].nullable
+    assert DeferredChildTestModel.Meta.table.columns["data"].nullable
+
+
+def test_deferred_fields_kept_on_meta():
+    class DeferredMetaTestModel(ormar.Model):
+        class Meta:
+            database = database
+            metadata = sqlalchemy.MetaData()
+
+        id: int = ormar.Integer(primary_key=True)
+        data: dict = ormar_pg_ext.JSONB(deferred=True)
+
+    assert deferred_fields(DeferredMetaTestModel) == {"data"}
+    assert DeferredMetaTestModel.Meta._deferred_fields[2] == {"data"}
+
+    # Fields added to the model later are taken into account
+    fields = DeferredMetaTestModel.Meta.model_fields
+    fields["other"] = fields["data"]
+    assert deferred_fields(DeferredMetaTestModel) == {"data", "other"}
+
+
+def test_deferred_primary_key():
+    with pytest.raises(ModelDefinitionError):
+        ormar_pg_ext.JSONB(primary_key=True, deferred=True)
+
+
+@pytest.mark.asyncio
+async def test_deferred_fields_not_loaded(db):
+    await create_models()
+
+    found = await DeferredTestModel.objects.order_by("id").all()
+    assert [obj.name for obj in found] == ["first", "second"]
+    assert all(obj.data is None and obj.tags is None for obj in found)
+
+    # Filtering on deferred fields still works
+    found = await DeferredTestModel.objects.filter(tags__array_contains=["z"]).get()
+    assert found.name == "second"
+    assert found.tags is None
+
+
+@pytest.mark.asyncio
+async def test_deferred_fields_selected_explicitly(db):
+    await create_models()
+
+    found = await DeferredTestModel.objects.fields(["name", "data"]).get(name="first")
+    assert found.data == {"a": 1}
+    assert found.tags is None
+
+
+@pytest.mark.asyncio
+async def test_load_deferred(db):
+    await create_models()
+    found = await DeferredTestModel.objects.order_by("id").all()
+
+    await ormar_pg_ext.load_deferred(found)
+
+    assert [obj.data for obj in found] == [{"a": 1}, {"a": 2}]
+    assert [obj.tags for obj in found] == [["x"], ["y", "z"]]
+    assert all(obj.saved for obj in found)
+
+
+@pytest.mark.asyncio
+async def test_load_deferred_single_field(db):
+    await create_models()
+    found = await DeferredTestModel.objects.get(name="first")
+
+    await ormar_pg_ext.load_deferred(found, "tags")
+
+    assert found.tags == ["x"]
+    assert found.data is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_deferred(db):
+    await create_models()
+    found = await DeferredTestModel.objects.get(name="second")
+
+    assert await ormar_pg_ext.fetch_deferred(found, "data") == {"a": 2}
+    assert found.data == {"a": 2}
+    assert found.tags is None
+
+
+@pytest.mark.asyncio
+async def test_deferred_related_models(db):
+    await create_models()
+    parent = await DeferredTestModel.objects.get(name="first")
+    await DeferredChildTestModel(parent=parent, data={"child": True}).save()
+
+    child = await DeferredChildTestModel.objects.select_related("parent").get()
+    assert child.data is None
+    assert child.parent.name == "first"
+    assert child.parent.data is None
+
+    await ormar_pg_ext.load_deferred([child, child.parent])
+    assert child.data == {"child": True}
+    assert child.parent.data == {"a": 1}
+
+
+async def stored_values():
+    found = (
+        await DeferredTestModel.objects.fields(["name", "data", "tags"])
+        .order_by("id")
+        .all()
+    )
+    return [(obj.name, obj.data, obj.tags) for obj in found]
+
+
+@pytest.mark.asyncio
+async def test_deferred_fields_kept_on_update(db):
+    await create_models()
+    found = await DeferredTestModel.objects.get(name="first")
+    assert not_loaded_fields(found) == {"data", "tags"}
+
+    await found.update(name="renamed")
+    found.name = "again"
+    await found.update()
+    await found.upsert()
+
+    assert await stored_values() == [
+        ("again", {"a": 1}, ["x"]),
+        ("second", {"a": 2}, ["y", "z"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_loaded_deferred_fields_updated(db):
+    await create_models()
+    found = await DeferredTestModel.objects.order_by("id").all()
+
+    await ormar_pg_ext.load_deferred(found[0], "data")
+    found[0].data["b"] = 2
+    found[1].tags = ["new"]
+    assert not_loaded_fields(found[0]) == {"tags"}
+    assert not_loaded_fields(found[1]) == {"data"}
+    await found[0].update()
+    await found[1].update()
+
+    assert await stored_values() == [
+        ("first", {"a": 1, "b": 2}, ["x"]),
+        ("second", {"a": 2}, ["new"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_not_loaded_deferred_fields_written_explicitly(db):
+    await create_models()
+    found = await DeferredTestModel.objects.get(name="first")
+
+    with pytest.raises(ModelPersistenceError):
+        await found.update(_columns=["name", "data"])
+    await found.update(_columns=["name"], name="renamed")
+
+    assert (await stored_values())[0] == ("renamed", {"a": 1}, ["x"])
+
+
+@pytest.mark.asyncio
+async def test_deferred_fields_kept_on_bulk_update(db):
+    await create_models()
+    found = await DeferredTestModel.objects.order_by("id").all()
+    for obj in found:
+        obj.name = obj.name.upper()
+
+    await DeferredTestModel.objects.bulk_update(found)
+
+    assert await stored_values() == [
+        ("FIRST", {"a": 1}, ["x"]),
+        ("SECOND", {"a": 2}, ["y", "z"]),
+    ]
+
+    found[0].tags = ["new"]
+    with pytest.raises(ModelPersistenceError):
+        await DeferredTestModel.objects.bulk_update(found)
+    with pytest.raises(ModelPersistenceError):
+        await DeferredTestModel.objects.bulk_update(found, columns=["name", "data"])
@@ -0,0 +1,192 @@
+from decimal import Decimal
+from typing import Optional
+
+import databases
+import ormar
+import pydantic
+import pytest
+import pytest_asyncio
+import sqlalchemy
+from sqlalchemy.dialects.postgresql import pypostgresql
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields.hstore import (
+    PostgresHstoreType,
+    parse_hstore,
+)
+from tests.database import (
+    DATABASE_URL,
+    create_extension,
+    database,
+)
+
+# The tables need the hstore extension, they are created separately from the
+# others once it exists
+metadata = sqlalchemy.MetaData()
+
+codec_database = databases.Database(
+    str(DATABASE_URL), init=ormar_pg_ext.register_hstore_codec
+)
+
+
+class HstoreTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.HSTORE(index="gin")
+
+
+class NullableHstoreTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: Optional[dict] = ormar_pg_ext.HSTORE(nullable=True)
+
+
+class CodecHstoreTestModel(ormar.Model):
+    class Meta:
+        database = codec_database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.HSTORE()
+
+
+@pytest_asyncio.fixture
+async def hstore_db(db):
+    create_extension("hstore", metadata)
+    yield
+
+
+@pytest_asyncio.fixture
+async def codec_db(hstore_db):
+    await codec_database.connect()
+    yield
+    await codec_database.disconnect()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("", {}),
+        ('"a"=>"1", "b"=>NULL', {"a": "1", "b": None}),
+        ("a=>1,b => null", {"a": "1", "b": None}),
+        ('"b"=>"NULL"', {"b": "NULL"}),
+        ('"a,b"=>"x=>y", "c"=>""', {"a,b": "x=>y", "c": ""}),
+        (r'"q\"uote"=>"back\\slash"', {'q"uote': "back\\slash"}),
+        ('"multi\nline"=>"tab\t"', {"multi\nline": "tab\t"}),
+    ],
+)
+def test_parse_hstore(value, expected):
+    assert parse_hstore(value) == expected
+
+
+def test_result_processor_fast_path_matches_parser():
+    process = PostgresHstoreType().result_processor(None, None)
+    for value in [
+        "",
+        '"a"=>"1", "b"=>NULL, "c"=>"NULL"',
+        '"a,b"=>"x=>y", "é"=>"\n"',
+        r'"q\"uote"=>"back\\slash", "d"=>NULL',
+        '"k"=>"=>NULL", "=>NULL"=>"v"',
+        '"=>"=>"=>", "a"=>"=>"',
+    ]:
+        assert process(value) == parse_hstore(value)
+    value = {"a": "1"}
+    assert process(value) is value
+
+
+@pytest.mark.parametrize("value", ['"a"=>', "a", '"a"=>"1" "b"=>"2"'])
+def test_parse_malformed_hstore(value):
+    with pytest.raises(ValueError):
+        parse_hstore(value)
+
+
+def test_hstore_validation():
+    assert HstoreTestModel(data={"a": "1", "b": None}).data == {"a": "1", "b": None}
+    assert HstoreTestModel(data={"a": 1, 2: Decimal("2.5")}).data == {
+        "a": "1",
+        "2": "2.5",
+    }
+    assert HstoreTestModel(data=[("a", "1"), ("b", None)]).data == {
+        "a": "1",
+        "b": None,
+    }
+    assert HstoreTestModel(data='"a"=>"1"').data == {"a": "1"}
+
+
+@pytest.mark.parametrize("value", [{"a": {"b": "c"}}, {"a": True}, {"a": ["b"]}, 1])
+def test_invalid_hstore(value):
+    with pytest.raises(pydantic.ValidationError):
+        HstoreTestModel(data=value)
+
+
+def test_hstore_bound_as_text_array():
+    column = HstoreTestModel.Meta.table.columns["data"]
+    dialect = pypostgresql.dialect(paramstyle="pyformat")
+    clause = str(column.contains({"a": "1"}).compile(dialect=dialect))
+    assert clause == ("hstoretestmodels.data @> hstore(CAST(%(data_1)s AS TEXT[]))")
+    # The keys are one text array parameter whatever their number
+    clause = column.has_all(["a", "b"]).compile(dialect=dialect)
+    assert str(clause) == "hstoretestmodels.data ?& %(param_1)s"
+    assert clause.params == {"param_1": ["a", "b"]}
+
+    process = column.type.bind_processor(dialect)
+    assert process({"a": "1", "b": None}) == [["a", "1"], ["b", None]]
+    assert process(None) is None
+
+
+@pytest.mark.asyncio
+async def test_create_model_with_hstore(hstore_db):
+    created = await HstoreTestModel(data={"a": "1", 'q"': "\\", "n": None}).save()
+    await NullableHstoreTestModel().save()
+
+    found = await HstoreTestModel.objects.get()
+    assert found.data == created.data == {"a": "1", 'q"': "\\", "n": None}
+    assert (await NullableHstoreTestModel.objects.get()).data is None
+
+
+@pytest.mark.asyncio
+async def test_hstore_operators(hstore_db):
+    await HstoreTestModel(data={"a": "1", "b": "2"}).save()
+    await HstoreTestModel(data={"a": "1", "c": "3"}).save()
+    await HstoreTestModel(data={"d": None}).save()
+
+    async def ids(**kwargs):
+        found = await HstoreTestModel.objects.filter(**kwargs).order_by("id").all()
+        return [obj.id for obj in found]
+
+    assert await ids(data__hstore_has_key="a") == [1, 2]
+    assert await ids(data__hstore_has_key="d") == [3]
+    assert await ids(data__hstore_has_all=["a", "b"]) == [1]
+    assert await ids(data__hstore_has_any=["b", "c"]) == [1, 2]
+    assert await ids(data__hstore_contains={"a": "1"}) == [1, 2]
+    assert await ids(data__hstore_contains={"a": "2"}) == []
+    assert await ids(data__hstore_contained_by={"a": "1", "b": "2", "d": None}) == [
+        1,
+        3,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connection_hstore_codec(codec_db):
+    await CodecHstoreTestModel(data={"a": "1", "b": None}).save()
+
+    raw = await codec_database.fetch_val("SELECT data FROM codechstoretestmodels")
+    assert raw == {"a": "1", "b": None}
+    found = await CodecHstoreTestModel.objects.get(data__hstore_has_key="a")
+    assert found.data == {"a": "1", "b": None}
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_hstore(hstore_db):
+    count = await ormar_pg_ext.bulk_copy(
+        HstoreTestModel, (HstoreTestModel(data={"i": str(i)}) for i in range(10))
+    )
+    assert count == 10
+    found = await HstoreTestModel.objects.filter(data__hstore_contains={"i": "5"})
+    assert [obj.data for obj in await found.all()] == [{"i": "5"}]
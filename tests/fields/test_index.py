@@ -0,0 +1,84 @@
+from ipaddress import IPv4Address
+from typing import List
+from uuid import UUID
+
+import ormar
+import pytest
+import sqlalchemy
+from ormar import ModelDefinitionError
+
+import ormar_postgres_extensions as ormar_pg_ext
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class IndexTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.JSONB(index="gin")
+    paths: dict = ormar_pg_ext.JSONB(index="gin", opclass="jsonb_path_ops")
+    tags: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String(), index="GIN")
+    inet: IPv4Address = ormar_pg_ext.INET(index="gist")
+    mac: str = ormar_pg_ext.MACADDR(index="hash")
+    uid: UUID = ormar_pg_ext.UUID(index=True, opclass="uuid_ops")
+    plain: dict = ormar_pg_ext.JSONB()
+
+
+def get_indexes(name: str) -> List[sqlalchemy.Index]:
+    return [
+        index for index in IndexTestModel.Meta.table.indexes if name in index.columns
+    ]
+
+
+@pytest.mark.parametrize(
+    "name,using,ops",
+    [
+        ("data", "gin", {}),
+        ("paths", "gin", {"paths": "jsonb_path_ops"}),
+        ("tags", "gin", {}),
+        ("inet", "gist", {"inet": "inet_ops"}),
+        ("mac", "hash", {}),
+        ("uid", "btree", {"uid": "uuid_ops"}),
+    ],
+)
+def test_index_declared_on_table(name, using, ops):
+    (index,) = get_indexes(name)
+    assert index.dialect_options["postgresql"]["using"] == using
+    assert index.dialect_options["postgresql"]["ops"] == ops
+    assert not IndexTestModel.Meta.table.columns[name].index
+
+
+def test_no_index_by_default():
+    assert get_indexes("plain") == []
+
+
+def test_unknown_index_method():
+    with pytest.raises(ModelDefinitionError):
+        ormar_pg_ext.JSONB(index="fulltext")
+
+
+def test_opclass_without_index():
+    with pytest.raises(ModelDefinitionError):
+        ormar_pg_ext.JSONB(opclass="jsonb_path_ops")
+
+
+@pytest.mark.asyncio
+async def test_index_created(db):
+    rows = await database.fetch_all(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = :table",
+        {"table": IndexTestModel.Meta.tablename},
+    )
+    indexes = {row["indexname"]: row["indexdef"] for row in rows}
+    table = IndexTestModel.Meta.tablename
+
+    assert "USING gin (data)" in indexes[f"ix_{table}_data"]
+    assert "USING gin (paths jsonb_path_ops)" in indexes[f"ix_{table}_paths"]
+    assert "USING gin (tags)" in indexes[f"ix_{table}_tags"]
+    assert "USING gist (inet inet_ops)" in indexes[f"ix_{table}_inet"]
+    assert "USING hash (mac)" in indexes[f"ix_{table}_mac"]
+    assert "USING btree (uid)" in indexes[f"ix_{table}_uid"]
@@ -5,21 +5,35 @@ from ipaddress import (
     IPv6Interface,
     ip_address,
     ip_interface,
+    ip_network,
 )
 from typing import (
     Optional,
     Union,
 )
 
+import databases
 import ormar
+import pydantic
 import pytest
+import pytest_asyncio
+import sqlalchemy
 
 import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields.inet import (
+    decode_inet_binary,
+    encode_inet_binary,
+)
 from tests.database import (
+    DATABASE_URL,
     database,
     metadata,
 )
 
+codec_database = databases.Database(
+    str(DATABASE_URL), init=ormar_pg_ext.register_inet_codec
+)
+
 IPAddress = Union[
     IPv4Address,
     IPv4Interface,
@@ -46,6 +60,40 @@ class NullableInetTestModel(ormar.Model):
     inet: Optional[IPAddress] = ormar_pg_ext.INET(nullable=True)
 
 
+class LazyInetTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    lazy: ormar_pg_ext.LazyIPAddress = ormar_pg_ext.INET(ip_decode="lazy")
+    compact: Optional[ormar_pg_ext.CompactIPAddress] = ormar_pg_ext.INET(
+        ip_decode="compact", nullable=True
+    )
+    inet: IPAddress = ormar_pg_ext.INET()
+
+
+class CodecLazyInetTestModel(ormar.Model):
+    class Meta:
+        database = codec_database
+        tablename = "lazyinettestmodels"
+        metadata = sqlalchemy.MetaData()
+
+    id: int = ormar.Integer(primary_key=True)
+    lazy: ormar_pg_ext.LazyIPAddress = ormar_pg_ext.INET(ip_decode="lazy")
+    compact: Optional[ormar_pg_ext.CompactIPAddress] = ormar_pg_ext.INET(
+        ip_decode="compact", nullable=True
+    )
+    inet: IPAddress = ormar_pg_ext.INET()
+
+
+@pytest_asyncio.fixture
+async def codec_db(db):
+    await codec_database.connect()
+    yield
+    await codec_database.disconnect()
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "ip, ip_type",
@@ -221,3 +269,88 @@ async def test_inet_contains_or_eq(db, ip, contained, expected):
         assert found[0] == created
     else:
         assert len(found) == 0
+
+
+@pytest.mark.parametrize(
+    "ip",
+    [
+        ip_address("192.168.0.1"),
+        ip_interface("192.168.0.1/24"),
+        ip_network("192.168.0.0/24"),
+        ip_address("2001:db8::1"),
+        ip_interface("2001:db8::1/64"),
+        ip_network("2001:db8::/64"),
+    ],
+)
+def test_inet_binary_format(ip):
+    assert decode_inet_binary(encode_inet_binary(ip)) == ip
+    assert type(decode_inet_binary(encode_inet_binary(ip))) is type(ip)
+
+
+def test_lazy_inet_validation():
+    model = LazyInetTestModel(lazy="10.0.0.1", compact="10.0.0.0/8", inet="::1")
+    assert model.lazy.raw == ip_address("10.0.0.1")
+    assert model.compact.raw == ip_interface("10.0.0.0/8")
+    assert model.json() == (
+        '{"id": null, "lazy": "10.0.0.1", "compact": "10.0.0.0/8", "inet": "::1"}'
+    )
+
+    with pytest.raises(pydantic.ValidationError):
+        LazyInetTestModel(lazy="not an address", inet="::1")
+
+
+def test_unknown_ip_decode():
+    with pytest.raises(ormar.ModelDefinitionError):
+        ormar_pg_ext.INET(ip_decode="eager")
+
+
+@pytest.mark.asyncio
+async def test_lazy_inet(db):
+    created = await LazyInetTestModel(
+        lazy=ip_interface("10.0.0.1/24"), inet=ip_address("10.0.0.2")
+    ).save()
+
+    found = await LazyInetTestModel.objects.get()
+    assert isinstance(found.lazy, ormar_pg_ext.LazyIPAddress)
+    assert found.lazy == created.lazy == ip_interface("10.0.0.1/24")
+    assert str(found.lazy) == "10.0.0.1/24"
+    assert found.lazy.network == ip_network("10.0.0.0/24")
+    assert found.compact is None
+    assert found.inet == ip_address("10.0.0.2")
+
+    found = await LazyInetTestModel.objects.get(
+        lazy__contained_by=ormar_pg_ext.CompactIPAddress(ip_interface("10.0.0.0/8"))
+    )
+    assert found.id == created.id
+
+
+@pytest.mark.asyncio
+async def test_lazy_inet_with_connection_codec(codec_db):
+    await CodecLazyInetTestModel.objects.bulk_create(
+        [
+            CodecLazyInetTestModel(
+                lazy="10.0.0.1/24", compact="2001:db8::1", inet="10.0.0.2"
+            ),
+            CodecLazyInetTestModel(lazy="10.1.0.1", inet="10.1.0.0/16"),
+        ]
+    )
+
+    first, second = await CodecLazyInetTestModel.objects.order_by("id").all()
+    # The values are kept in the binary wire format until they are used
+    assert isinstance(first.lazy.raw, bytes)
+    assert isinstance(first.compact.raw, bytes)
+    assert first.lazy == ip_interface("10.0.0.1/24")
+    assert first.lazy.address is first.lazy.address
+    assert first.compact == ip_address("2001:db8::1")
+    assert first.compact.address is not first.compact.address
+    assert first.inet == ip_address("10.0.0.2")
+    assert second.lazy == ip_address("10.1.0.1")
+    assert second.inet == ip_interface("10.1.0.0/16")
+
+    # Loaded values can be saved and filtered on again
+    second.compact = first.compact
+    await second.update()
+    found = await CodecLazyInetTestModel.objects.filter(
+        compact=first.compact, inet__contains_subnet=ip_address("10.1.2.3")
+    ).all()
+    assert [obj.id for obj in found] == [second.id]
@@ -1,16 +1,26 @@
 import json
 from typing import Optional
 
+import databases
 import ormar
 import pytest
-from sqlalchemy.dialects.postgresql import array
+import pytest_asyncio
+from sqlalchemy.dialects.postgresql import (
+    array,
+    pypostgresql,
+)
 
 import ormar_postgres_extensions as ormar_pg_ext
 from tests.database import (
+    DATABASE_URL,
     database,
     metadata,
 )
 
+codec_database = databases.Database(
+    str(DATABASE_URL), init=ormar_pg_ext.register_jsonb_codec
+)
+
 
 class JSONBTestModel(ormar.Model):
     class Meta:
@@ -30,6 +40,48 @@ class NullableJSONBTestModel(ormar.Model):
     data: Optional[dict] = ormar_pg_ext.JSONB(nullable=True)
 
 
+class AliasedJSONBTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.JSONB(name="payload")
+
+
+class CodecJSONBTestModel(ormar.Model):
+    class Meta:
+        database = codec_database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.JSONB()
+
+
+calls = []
+
+
+def tracking_dumps(value):
+    calls.append("dumps")
+    return json.dumps(value)
+
+
+def tracking_loads(value):
+    calls.append("loads")
+    return json.loads(value)
+
+
+class CustomCodecJSONBTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.JSONB(
+        json_dumps=tracking_dumps, json_loads=tracking_loads
+    )
+
+
 @pytest.mark.asyncio
 async def test_create_model_with_jsonb(db):
     created = await JSONBTestModel(data=json.dumps(dict(foo="bar"))).save()
@@ -166,6 +218,36 @@ async def test_has_any(db):
     assert len(found) == 2
 
 
+@pytest.mark.asyncio
+async def test_has_all_any_list(db):
+    await JSONBTestModel(data=json.dumps(dict(key1="foo", key3=2))).save()
+    await JSONBTestModel(data=json.dumps(dict(key2="bar"))).save()
+
+    found = await JSONBTestModel.objects.filter(
+        data__jsonb_has_all=["key1", "key3"]
+    ).all()
+    assert len(found) == 1
+
+    found = await JSONBTestModel.objects.filter(
+        data__jsonb_has_any=["key1", "key2"]
+    ).all()
+    assert len(found) == 2
+
+
+@pytest.mark.parametrize("operator", ["jsonb_has_all", "jsonb_has_any"])
+def test_has_all_any_sql_independent_of_length(operator):
+    dialect = pypostgresql.dialect(paramstyle="pyformat")
+    statements = {
+        str(
+            JSONBTestModel.objects.filter(**{f"data__{operator}": value})
+            .build_select_expression()
+            .compile(dialect=dialect)
+        )
+        for value in [["key1"], ["key1", "key2", "key3"], array(["key1", "key2"])]
+    }
+    assert len(statements) == 1
+
+
 @pytest.mark.asyncio
 async def test_has_key_object(db):
     await JSONBTestModel(data=json.dumps(dict(key1="foo"))).save()
@@ -188,3 +270,324 @@ async def test_has_key_array(db):
 
     found = await JSONBTestModel.objects.filter(data__jsonb_has_key="other").all()
     assert len(found) == 0
+
+
+@pytest_asyncio.fixture
+async def codec_db(db):
+    await codec_database.connect()
+    yield
+    await codec_database.disconnect()
+
+
+@pytest.fixture
+def reset_calls():
+    calls.clear()
+    yield
+    calls.clear()
+
+
+@pytest.mark.asyncio
+async def test_field_json_codec(db, reset_calls):
+    await CustomCodecJSONBTestModel(data=dict(foo="bar")).save()
+    assert calls == ["dumps"]
+
+    found = await CustomCodecJSONBTestModel.objects.get()
+    assert found.data == {"foo": "bar"}
+    assert calls == ["dumps", "loads"]
+
+
+@pytest.mark.asyncio
+async def test_global_json_codec(db, reset_calls):
+    ormar_pg_ext.set_json_codec(dumps=tracking_dumps, loads=tracking_loads)
+    try:
+        await JSONBTestModel(data=dict(foo="bar")).save()
+        found = await JSONBTestModel.objects.filter(
+            data__jsonb_contains=dict(foo="bar")
+        ).get()
+    finally:
+        ormar_pg_ext.set_json_codec()
+
+    assert found.data == {"foo": "bar"}
+    assert calls == ["dumps", "dumps", "loads"]
+
+
+@pytest.mark.asyncio
+async def test_connection_json_codec(codec_db):
+    created = await CodecJSONBTestModel(data=dict(foo="bar", nested=[1, 2])).save()
+    await CodecJSONBTestModel(data=dict(foo="baz")).save()
+
+    found = await CodecJSONBTestModel.objects.get(id=created.id)
+    assert found.data == {"foo": "bar", "nested": [1, 2]}
+
+    found = await CodecJSONBTestModel.objects.filter(
+        data__jsonb_contains=dict(foo="baz")
+    ).all()
+    assert len(found) == 1
+
+    # The driver hands back decoded documents, even for raw queries
+    table = CodecJSONBTestModel.Meta.tablename
+    raw = await codec_database.fetch_val(f"SELECT data FROM {table} WHERE id = 1")
+    assert raw == {"foo": "bar", "nested": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_connection_json_codec_string_document(codec_db):
+    table = CodecJSONBTestModel.Meta.tablename
+    await codec_database.execute(
+        f"INSERT INTO {table} (data) VALUES (:data)", values={"data": '"foo"'}
+    )
+
+    raw = await codec_database.fetch_val(f"SELECT data FROM {table}")
+    assert raw == "foo"
+
+    column = CodecJSONBTestModel.Meta.table.columns["data"]
+    processor = column.type.result_processor(None, None)
+    assert processor(raw) == "foo"
+
+
+@pytest.mark.asyncio
+async def test_jsonb_path_projection(db):
+    await JSONBTestModel(
+        data=dict(name="first", address=dict(city="Toronto"), tags=["a", "b"])
+    ).save()
+    await JSONBTestModel(data=dict(name="second", address=dict(city="Ottawa"))).save()
+
+    found = await ormar_pg_ext.project(
+        JSONBTestModel.objects.order_by("id"),
+        "id",
+        city=ormar_pg_ext.jsonb_path("data", "address", "city", as_text=True),
+        address=ormar_pg_ext.jsonb_path("data", "address"),
+        first_tag=ormar_pg_ext.jsonb_path("data", "tags", 0),
+    )
+    assert found == [
+        {"id": 1, "city": "Toronto", "address": {"city": "Toronto"}, "first_tag": "a"},
+        {"id": 2, "city": "Ottawa", "address": {"city": "Ottawa"}, "first_tag": None},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_jsonb_path_projection_filtered(db):
+    await JSONBTestModel(data=dict(name="first", group=1)).save()
+    await JSONBTestModel(data=dict(name="second", group=2)).save()
+    await JSONBTestModel(data=dict(name="third", group=2)).save()
+
+    found = await ormar_pg_ext.project(
+        JSONBTestModel.objects.filter(data__jsonb_contains=dict(group=2)).limit(1),
+        name=ormar_pg_ext.jsonb_path(
+            JSONBTestModel.Meta.table.columns["data"], "name", as_text=True
+        ),
+    )
+    assert found == [{"name": "second"}]
+
+
+@pytest.mark.asyncio
+async def test_jsonb_path_projection_connection_codec(codec_db):
+    await CodecJSONBTestModel(data=dict(nested=dict(value=[1, 2]))).save()
+
+    found = await ormar_pg_ext.project(
+        CodecJSONBTestModel.objects,
+        value=ormar_pg_ext.jsonb_path("data", "nested", "value"),
+    )
+    assert found == [{"value": [1, 2]}]
+
+
+def test_jsonb_path_requires_path():
+    with pytest.raises(ValueError):
+        ormar_pg_ext.jsonb_path("data")
+
+
+@pytest.mark.asyncio
+async def test_jsonb_set(db):
+    first = await JSONBTestModel(data=dict(a=dict(b=1, c=2), keep=True)).save()
+    second = await JSONBTestModel(data=dict(a=dict(b=1))).save()
+
+    await JSONBTestModel.objects.filter(id=first.id).update(
+        data=ormar_pg_ext.jsonb_set("data", ["a", "b"], dict(new=[1, 2]))
+    )
+
+    await first.load()
+    await second.load()
+    assert first.data == {"a": {"b": {"new": [1, 2]}, "c": 2}, "keep": True}
+    assert second.data == {"a": {"b": 1}}
+
+
+@pytest.mark.asyncio
+async def test_jsonb_update_aliased_field(db):
+    created = await AliasedJSONBTestModel(data=dict(a=1, b=2)).save()
+
+    await AliasedJSONBTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.jsonb_merge(ormar_pg_ext.jsonb_remove("data", "b"), dict(c=3))
+    )
+
+    await created.load()
+    assert created.data == {"a": 1, "c": 3}
+    found = await ormar_pg_ext.project(
+        AliasedJSONBTestModel.objects,
+        a=ormar_pg_ext.jsonb_path("data", "a"),
+    )
+    assert found == [{"a": 1}]
+
+
+@pytest.mark.asyncio
+async def test_jsonb_set_create_missing(db):
+    created = await JSONBTestModel(data=dict(a=dict(list=[1, 2]))).save()
+
+    await JSONBTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.jsonb_set("data", ["a", "missing"], 1, create_missing=False)
+    )
+    await created.load()
+    assert created.data == {"a": {"list": [1, 2]}}
+
+    await JSONBTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.jsonb_set("data", ["a", "list", 0], "first")
+    )
+    await created.load()
+    assert created.data == {"a": {"list": ["first", 2]}}
+
+
+@pytest.mark.asyncio
+async def test_jsonb_merge(db):
+    await JSONBTestModel(data=dict(a=1, b=dict(c=2))).save()
+    await JSONBTestModel(data=dict(a=2)).save()
+
+    await JSONBTestModel.objects.filter(data__jsonb_contains=dict(a=1)).update(
+        data=ormar_pg_ext.jsonb_merge("data", dict(b=3, d=[4]))
+    )
+
+    found = await JSONBTestModel.objects.order_by("id").all()
+    assert found[0].data == {"a": 1, "b": 3, "d": [4]}
+    assert found[1].data == {"a": 2}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "document, key, expected",
+    [
+        (dict(a=1, b=2, c=3), "a", {"b": 2, "c": 3}),
+        (dict(a=1, b=2, c=3), ["a", "c"], {"b": 2}),
+        (dict(a=1), "missing", {"a": 1}),
+        (["x", "y", "z"], 1, ["x", "z"]),
+    ],
+)
+async def test_jsonb_remove(db, document, key, expected):
+    created = await JSONBTestModel(data=json.dumps(document)).save()
+
+    await JSONBTestModel.objects.update(
+        each=True, data=ormar_pg_ext.jsonb_remove("data", key)
+    )
+
+    await created.load()
+    assert created.data == expected
+
+
+@pytest.mark.asyncio
+async def test_jsonb_remove_path(db):
+    created = await JSONBTestModel(data=dict(a=dict(b=1, c=[1, 2, 3]))).save()
+
+    await JSONBTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.jsonb_remove_path(
+            ormar_pg_ext.jsonb_remove_path("data", ["a", "b"]), ["a", "c", 0]
+        )
+    )
+
+    await created.load()
+    assert created.data == {"a": {"c": [2, 3]}}
+
+
+@pytest.mark.asyncio
+async def test_jsonb_update_connection_codec(codec_db):
+    created = await CodecJSONBTestModel(data=dict(a=1)).save()
+
+    await CodecJSONBTestModel.objects.filter(id=created.id).update(
+        data=ormar_pg_ext.jsonb_merge(
+            ormar_pg_ext.jsonb_set("data", ["b"], dict(c=2)), dict(d=3)
+        )
+    )
+
+    await created.load()
+    assert created.data == {"a": 1, "b": {"c": 2}, "d": 3}
+
+
+async def create_order_models():
+    await JSONBTestModel(
+        data=dict(name="small", items=[dict(price=5), dict(price=8)], paid=True)
+    ).save()
+    await JSONBTestModel(
+        data=dict(name="large", items=[dict(price=20), dict(price=50)], paid=False)
+    ).save()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("$.items[*] ? (@.price > 10)", ["large"]),
+        ("$.items[*] ? (@.price >= 5 && @.price < 8)", ["small"]),
+        ("$.missing", []),
+    ],
+)
+async def test_filter_jsonb_path_exists(db, path, expected):
+    await create_order_models()
+
+    found = await JSONBTestModel.objects.filter(data__jsonb_path_exists=path).all()
+    assert [obj.data["name"] for obj in found] == expected
+
+
+@pytest.mark.asyncio
+async def test_filter_jsonb_path_match(db):
+    await create_order_models()
+
+    found = await JSONBTestModel.objects.filter(
+        JSONBTestModel.data.jsonb_path_match("$.paid == true")
+    ).all()
+    assert [obj.data["name"] for obj in found] == ["small"]
+
+    found = await JSONBTestModel.objects.filter(
+        data__jsonb_path_match="$.items.size() == 2"
+    ).all()
+    assert len(found) == 2
+
+
+@pytest.mark.asyncio
+async def test_jsonb_path_query_projection(db):
+    await create_order_models()
+
+    found = await ormar_pg_ext.project(
+        JSONBTestModel.objects.order_by("id"),
+        prices=ormar_pg_ext.jsonb_path_query_array(
+            "data", "$.items[*].price ? (@ > $min)", dict(min=6)
+        ),
+        first=ormar_pg_ext.jsonb_path_query_first("data", "$.items[0].price"),
+        missing=ormar_pg_ext.jsonb_path_query_first("data", "$.missing"),
+    )
+    assert found == [
+        {"prices": [8], "first": 5, "missing": None},
+        {"prices": [20, 50], "first": 20, "missing": None},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_jsonb_path_query_rows(db):
+    await create_order_models()
+
+    found = await ormar_pg_ext.project(
+        JSONBTestModel.objects.filter(data__jsonb_path_match='$.name == "large"'),
+        price=ormar_pg_ext.jsonb_path_query("data", "$.items[*].price"),
+    )
+    assert found == [{"price": 20}, {"price": 50}]
+
+
+@pytest.mark.asyncio
+async def test_jsonb_path_query_connection_codec(codec_db):
+    await CodecJSONBTestModel(data=dict(items=[1, 2, 3])).save()
+
+    found = await CodecJSONBTestModel.objects.filter(
+        data__jsonb_path_exists="$.items[*] ? (@ > 2)"
+    ).all()
+    assert len(found) == 1
+
+    found = await ormar_pg_ext.project(
+        CodecJSONBTestModel.objects,
+        items=ormar_pg_ext.jsonb_path_query_array("data", "$.items[*] ? (@ > 1)"),
+    )
+    assert found == [{"items": [2, 3]}]
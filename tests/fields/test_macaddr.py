@@ -1,7 +1,10 @@
 from typing import Optional
 
 import ormar
+import pydantic
 import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
 
 import ormar_postgres_extensions as ormar_pg_ext
 from tests.database import (
@@ -28,6 +31,24 @@ class NullableMacAddrTestModel(ormar.Model):
     addr: Optional[str] = ormar_pg_ext.MACADDR(nullable=True)
 
 
+class MacAddr8TestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    addr: str = ormar_pg_ext.MACADDR8(oui_index=True)
+
+
+class OUIIndexMacAddrTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    addr: str = ormar_pg_ext.MACADDR(index=True, oui_index=True)
+
+
 @pytest.mark.asyncio
 async def test_create_model_with_macaddr_specified(db):
     created = await MacAddrTestModel(addr="08:00:2b:01:02:03").save()
@@ -62,3 +83,103 @@ async def test_get_model_with_nullable_macaddr(db):
     # Ensure querying a model with a null UUID works
     found = await NullableMacAddrTestModel.objects.get()
     assert found == created
+
+
+@pytest.mark.parametrize(
+    "addr",
+    [
+        "08:00:2b:01:02:03",
+        "08-00-2B-01-02-03",
+        "08002b:010203",
+        "08002b-010203",
+        "0800.2b01.0203",
+        "0800-2b01-0203",
+        "08002B010203",
+    ],
+)
+def test_macaddr_canonical_format(addr):
+    assert MacAddrTestModel(addr=addr).addr == "08:00:2b:01:02:03"
+    assert MacAddr8TestModel(addr=addr).addr == "08:00:2b:ff:fe:01:02:03"
+
+
+@pytest.mark.parametrize("addr", ["08:00:2b:01:02", "08:00:2b:01:02:0g", "", 1])
+def test_invalid_macaddr(addr):
+    with pytest.raises(pydantic.ValidationError):
+        MacAddrTestModel(addr=addr)
+
+
+@pytest.mark.asyncio
+async def test_macaddr8(db):
+    created = await MacAddr8TestModel(addr="08-00-2B-01-02-03-04-05").save()
+    assert created.addr == "08:00:2b:01:02:03:04:05"
+
+    found = await MacAddr8TestModel.objects.get(addr="08002b0102030405")
+    assert found.addr == created.addr
+
+
+@pytest.mark.asyncio
+async def test_macaddr_oui(db):
+    await MacAddrTestModel(addr="08:00:2b:01:02:03").save()
+    await MacAddrTestModel(addr="08-00-2B-aa-bb-cc").save()
+    await MacAddrTestModel(addr="00:1a:2b:01:02:03").save()
+
+    found = await MacAddrTestModel.objects.filter(addr__macaddr_oui="08:00:2B").all()
+    assert [obj.addr for obj in found] == ["08:00:2b:01:02:03", "08:00:2b:aa:bb:cc"]
+    found = await MacAddrTestModel.objects.filter(
+        addr__macaddr_oui="00:1a:2b:ff:ff:ff"
+    ).all()
+    assert [obj.addr for obj in found] == ["00:1a:2b:01:02:03"]
+    assert (
+        await MacAddrTestModel.objects.filter(
+            MacAddrTestModel.addr.macaddr_oui_in(["08002b", "00-1A-2B"])
+        ).count()
+        == 3
+    )
+
+
+@pytest.mark.asyncio
+async def test_macaddr8_oui(db):
+    await MacAddr8TestModel(addr="08:00:2b:01:02:03:04:05").save()
+    await MacAddr8TestModel(addr="08:00:2c:01:02:03").save()
+
+    found = await MacAddr8TestModel.objects.filter(addr__macaddr_oui="08:00:2b").all()
+    assert [obj.addr for obj in found] == ["08:00:2b:01:02:03:04:05"]
+    found = await MacAddr8TestModel.objects.filter(
+        addr__macaddr_oui_in=["08:00:2c:00:00:00"]
+    ).all()
+    assert [obj.addr for obj in found] == ["08:00:2c:ff:fe:01:02:03"]
+
+
+def test_oui_index():
+    indexes = {
+        index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in OUIIndexMacAddrTestModel.Meta.table.indexes
+    }
+    assert indexes == {
+        "ix_ouiindexmacaddrtestmodels_addr": (
+            "CREATE INDEX ix_ouiindexmacaddrtestmodels_addr "
+            "ON ouiindexmacaddrtestmodels (addr)"
+        ),
+        "ix_ouiindexmacaddrtestmodels_addr_oui": (
+            "CREATE INDEX ix_ouiindexmacaddrtestmodels_addr_oui "
+            "ON ouiindexmacaddrtestmodels (trunc(addr))"
+        ),
+    }
+
+
+@pytest.mark.asyncio
+async def test_oui_filter_uses_index(db):
+    await OUIIndexMacAddrTestModel.objects.bulk_create(
+        [
+            OUIIndexMacAddrTestModel(addr=f"08:00:{i % 256:02x}:00:{i // 256:02x}:01")
+            for i in range(5000)
+        ]
+    )
+    async with database.connection() as connection:
+        await connection.execute("ANALYZE ouiindexmacaddrtestmodels")
+
+    plan = await database.fetch_all(
+        "EXPLAIN SELECT * FROM ouiindexmacaddrtestmodels "
+        "WHERE trunc(addr) = '08:00:2b:00:00:00'"
+    )
+    assert "ix_ouiindexmacaddrtestmodels_addr_oui" in str([row[0] for row in plan])
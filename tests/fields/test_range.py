@@ -0,0 +1,217 @@
+from datetime import (
+    date,
+    datetime,
+    timezone,
+)
+from decimal import Decimal
+from typing import (
+    List,
+    Optional,
+)
+
+import ormar
+import pydantic
+import pytest
+from pydantic.json import ENCODERS_BY_TYPE
+from sqlalchemy.dialects import postgresql
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions import Range
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class RangeTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    ports: Range = ormar_pg_ext.INT4RANGE(index="gist")
+    amount: Optional[Range] = ormar_pg_ext.NUMRANGE(nullable=True)
+    valid: Optional[Range] = ormar_pg_ext.DATERANGE(nullable=True)
+    during: Optional[Range] = ormar_pg_ext.TSTZRANGE(nullable=True)
+
+
+class MultirangeTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    ports: List[Range] = ormar_pg_ext.INT4MULTIRANGE(index="gist")
+    valid: Optional[List[Range]] = ormar_pg_ext.DATEMULTIRANGE(nullable=True)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ((1, 5), Range(1, 5)),
+        ([1, 5], Range(1, 5)),
+        ("[1,5]", Range(1, 6)),
+        ("(1,5)", Range(2, 5)),
+        (" [ 1 , 5 ) ", Range(1, 5)),
+        ("[,5)", Range(None, 5, lower_inc=False)),
+        ({"lower": 1, "upper": 5, "upper_inc": True}, Range(1, 6)),
+        (Range(None, None), Range(None, None, lower_inc=False)),
+        (Range(1, 5, lower_inc=False, upper_inc=True), Range(2, 6)),
+        (Range("1", "5"), Range(1, 5)),
+        ((5, 5), Range(empty=True)),
+        ("empty", Range(empty=True)),
+    ],
+)
+def test_int_range_canonical_form(value, expected):
+    assert RangeTestModel(ports=value).ports == expected
+
+
+def test_continuous_range_canonical_form():
+    model = RangeTestModel(
+        ports=(1, 2),
+        amount=(1, "2.5"),
+        valid=("2020-01-01", "2020-02-01"),
+        during='["2020-01-01 00:00:00+00","2020-01-02 00:00:00+00"]',
+    )
+    assert model.amount == Range(Decimal(1), Decimal("2.5"))
+    assert model.valid == Range(date(2020, 1, 1), date(2020, 2, 1))
+    utc = timezone.utc
+    assert model.during == Range(
+        datetime(2020, 1, 1, tzinfo=utc),
+        datetime(2020, 1, 2, tzinfo=utc),
+        upper_inc=True,
+    )
+
+
+@pytest.mark.parametrize("value", [(5, 1), "[1,5", 1, (1, 2, 3), ("a", "b")])
+def test_invalid_range(value):
+    with pytest.raises(pydantic.ValidationError):
+        RangeTestModel(ports=value)
+
+
+def test_multirange_canonical_form():
+    model = MultirangeTestModel(ports=[(7, 9), "[1,3]", (3, 5), (5, 5), (8, 12)])
+    assert model.ports == [Range(1, 5), Range(7, 12)]
+    assert MultirangeTestModel(ports=(1, 3)).ports == [Range(1, 3)]
+    assert MultirangeTestModel(ports="{[1,3), [5,7)}").ports == [
+        Range(1, 3),
+        Range(5, 7),
+    ]
+    assert MultirangeTestModel(ports=[]).ports == []
+
+
+def test_range_json():
+    model = RangeTestModel(ports=(1, 5), valid=(date(2020, 1, 1), None))
+    data = model.json()
+    assert '"ports": "[1,5)"' in data
+    assert '"valid": "[2020-01-01,)"' in data
+    assert RangeTestModel.parse_raw(data) == model
+
+    multirange = MultirangeTestModel(ports=[(1, 3), (5, 7)])
+    assert MultirangeTestModel.parse_raw(multirange.json()) == multirange
+
+    # The encoder is part of the config of the models, not pydantic's defaults
+    assert RangeTestModel.__config__.json_encoders[Range] is ormar_pg_ext.range_text
+    assert Range not in ENCODERS_BY_TYPE
+
+
+@pytest.mark.asyncio
+async def test_create_model_with_range(db):
+    created = await RangeTestModel(
+        ports="[1,5]",
+        amount=(Decimal("0.5"), None),
+        valid=(date(2020, 1, 1), date(2021, 1, 1)),
+        during=(datetime(2020, 1, 1, tzinfo=timezone.utc), None),
+    ).save()
+
+    found = await RangeTestModel.objects.get()
+    assert found.ports == created.ports == Range(1, 6)
+    assert found.amount == created.amount
+    assert found.valid == created.valid
+    assert found.during == created.during
+
+
+@pytest.mark.asyncio
+async def test_create_model_with_multirange(db):
+    created = await MultirangeTestModel(
+        ports=[(1, 3), (3, 5), (10, 20)], valid=[(date(2020, 1, 1), None)]
+    ).save()
+
+    found = await MultirangeTestModel.objects.get()
+    assert found.ports == created.ports == [Range(1, 5), Range(10, 20)]
+    assert found.valid == created.valid
+
+
+@pytest.mark.asyncio
+async def test_range_operators(db):
+    await RangeTestModel(ports=(1, 10)).save()
+    await RangeTestModel(ports=(10, 20)).save()
+    await RangeTestModel(ports=(20, 30)).save()
+
+    async def ports(**kwargs):
+        found = await RangeTestModel.objects.filter(**kwargs).order_by("id").all()
+        return [(obj.ports.lower, obj.ports.upper) for obj in found]
+
+    assert await ports(ports__range_overlap=(5, 15)) == [(1, 10), (10, 20)]
+    assert await ports(ports__range_contains=(12, 15)) == [(10, 20)]
+    assert await ports(ports__range_contains="[12,15]") == [(10, 20)]
+    assert await ports(ports__range_contains=10) == [(10, 20)]
+    assert await ports(ports__range_contained_by=(0, 20)) == [(1, 10), (10, 20)]
+    assert await ports(ports__range_adjacent=(30, 40)) == [(20, 30)]
+    assert await ports(ports=(1, 10)) == [(1, 10)]
+    assert (
+        await RangeTestModel.objects.filter(
+            RangeTestModel.ports.range_overlap("[0,1]")
+        ).count()
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_date_range_contains_date(db):
+    await RangeTestModel(
+        ports=(1, 2), valid=(date(2020, 1, 1), date(2020, 2, 1))
+    ).save()
+
+    found = RangeTestModel.objects.filter
+    assert await found(valid__range_contains=date(2020, 1, 31)).count() == 1
+    assert await found(valid__range_contains=date(2020, 2, 1)).count() == 0
+    assert await found(valid__range_contains=("2020-01-05", "2020-01-10")).count() == 1
+    assert await found(valid__range_contains="2020-01-15").count() == 1
+    assert await found(valid__range_contains="[2020-01-15,2020-03-01)").count() == 0
+    assert await found(valid__range_contains="empty").count() == 1
+
+
+@pytest.mark.asyncio
+async def test_multirange_operators(db):
+    await MultirangeTestModel(ports=[(1, 3), (10, 20)]).save()
+    await MultirangeTestModel(ports=[(5, 8)]).save()
+
+    async def count(**kwargs):
+        return await MultirangeTestModel.objects.filter(**kwargs).count()
+
+    # Single ranges are compared as a multirange of them
+    assert await count(ports__range_overlap=(2, 6)) == 2
+    assert await count(ports__range_overlap=[(0, 1), (19, 30)]) == 1
+    assert await count(ports__range_contains=(11, 15)) == 1
+    assert await count(ports__range_contains=6) == 1
+    assert await count(ports__range_contained_by=(0, 10)) == 1
+    # Adjacency is to the whole multirange, from its lowest to its highest bound
+    assert await count(ports__range_adjacent=[(3, 5)]) == 1
+    assert await count(ports__range_adjacent=(20, 30)) == 1
+
+
+def test_range_operator_clauses():
+    column = RangeTestModel.Meta.table.columns["valid"]
+    # Strings are elements unless they're in the range text format
+    clause = column.contains("2020-01-01").compile(dialect=postgresql.dialect())
+    assert str(clause) == "rangetestmodels.valid @> CAST(%(param_1)s AS DATE)"
+    clause = column.contains(" [2020-01-01,)").compile(dialect=postgresql.dialect())
+    assert str(clause) == "rangetestmodels.valid @> %(param_1)s"
+
+    column = RangeTestModel.Meta.table.columns["ports"]
+    # Elements are cast, postgres would take them for a range otherwise
+    clause = column.contains(10).compile(dialect=postgresql.dialect())
+    assert str(clause) == "rangetestmodels.ports @> CAST(%(param_1)s AS INTEGER)"
+    clause = column.adjacent_to((1, 2)).compile(dialect=postgresql.dialect())
+    assert str(clause) == "rangetestmodels.ports -|- %(param_1)s"
@@ -0,0 +1,162 @@
+from typing import Optional
+
+import ormar
+import pytest
+import pytest_asyncio
+import sqlalchemy
+from ormar.exceptions import QueryDefinitionError
+from sqlalchemy.dialects.postgresql import pypostgresql
+from sqlalchemy.schema import CreateIndex
+
+import ormar_postgres_extensions as ormar_pg_ext
+from tests.database import (
+    create_extension,
+    database,
+)
+
+# The indexes need the pg_trgm extension, the tables are created separately from
+# the others once it exists
+metadata = sqlalchemy.MetaData()
+
+
+class HostTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    hostname: str = ormar_pg_ext.String(max_length=255, index="gist")
+    description: Optional[str] = ormar_pg_ext.Text(nullable=True, index="gin")
+
+
+@pytest_asyncio.fixture
+async def trgm_db(db):
+    create_extension("pg_trgm", metadata)
+    yield
+
+
+def _dialect():
+    return pypostgresql.dialect(paramstyle="pyformat")
+
+
+def test_trigram_index_ddl():
+    indexes = {
+        index.name: str(CreateIndex(index).compile(dialect=_dialect()))
+        for index in HostTestModel.Meta.table.indexes
+    }
+    assert indexes == {
+        "ix_hosttestmodels_hostname": (
+            "CREATE INDEX ix_hosttestmodels_hostname "
+            "ON hosttestmodels USING gist (hostname gist_trgm_ops)"
+        ),
+        "ix_hosttestmodels_description": (
+            "CREATE INDEX ix_hosttestmodels_description "
+            "ON hosttestmodels USING gin (description gin_trgm_ops)"
+        ),
+    }
+
+
+def test_trigram_column_types():
+    columns = HostTestModel.Meta.table.columns
+    assert str(columns["hostname"].type.compile(dialect=_dialect())) == "VARCHAR(255)"
+    assert str(columns["description"].type.compile(dialect=_dialect())) == "TEXT"
+
+
+def test_trigram_operator_clauses():
+    column = HostTestModel.Meta.table.columns["hostname"]
+    # The percent signs are escaped for the pyformat parameters
+    clause = column.trigram_similar("web-01").compile(dialect=_dialect())
+    assert str(clause) == "hosttestmodels.hostname %% %(param_1)s"
+    clause = column.trigram_word_similar("web").compile(dialect=_dialect())
+    assert str(clause) == "hosttestmodels.hostname %%> %(param_1)s"
+
+    clause = ormar_pg_ext.trgm_distance(column, "web").compile(dialect=_dialect())
+    assert str(clause) == "hosttestmodels.hostname <-> %(param_1)s"
+    clause = ormar_pg_ext.trgm_distance("hostname", "web", word=True)
+    assert str(clause.compile(dialect=_dialect())) == "hostname <->> %(param_1)s"
+
+
+def test_trigram_field_accessor():
+    expr = HostTestModel.objects.filter(
+        HostTestModel.hostname.trgm_similar("web")
+    ).build_select_expression()
+    assert "WHERE (hosttestmodels.hostname %% %(param_1)s)" in str(
+        expr.compile(dialect=_dialect())
+    )
+
+
+def test_trigram_field_validation():
+    assert HostTestModel(hostname="web-01").hostname == "web-01"
+    with pytest.raises(ormar.ModelDefinitionError):
+        ormar_pg_ext.String(max_length=0)
+
+
+@pytest.mark.asyncio
+async def test_trigram_operators(trgm_db):
+    for hostname, description in [
+        ("web-01.example.com", "Frontend web server"),
+        ("web-02.example.com", "Frontend web server, standby"),
+        ("db-01.example.com", "Primary database"),
+    ]:
+        await HostTestModel(hostname=hostname, description=description).save()
+
+    async def ids(**kwargs):
+        found = await HostTestModel.objects.filter(**kwargs).order_by("id").all()
+        return [obj.id for obj in found]
+
+    assert await ids(hostname__trgm_similar="web-01.example.org") == [1, 2]
+    assert await ids(hostname__trgm_similar="mail") == []
+    assert await ids(description__trgm_word_similar="databse") == [3]
+    assert await ids(description__trgm_word_similar="frontend") == [1, 2]
+
+    scores = await ormar_pg_ext.project(
+        HostTestModel.objects.order_by("id"),
+        "id",
+        similarity=ormar_pg_ext.similarity("hostname", "web-01.example.com"),
+        word=ormar_pg_ext.word_similarity("description", "standby"),
+    )
+    assert scores[0] == {"id": 1, "similarity": 1.0, "word": 0.0}
+    assert scores[1]["word"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_nearest(trgm_db):
+    for hostname in ["db-01", "web-01", "web-02", "mail-01"]:
+        await HostTestModel(hostname=hostname).save()
+
+    found = await ormar_pg_ext.nearest(HostTestModel.objects, "hostname", "web-2")
+    assert [obj.hostname for obj in found][:2] == ["web-02", "web-01"]
+
+    found = await ormar_pg_ext.nearest(
+        HostTestModel.objects.filter(hostname__trgm_similar="web").limit(1),
+        "hostname",
+        "web-01",
+    )
+    assert [obj.hostname for obj in found] == ["web-01"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("field", ["id", "missing"])
+async def test_nearest_requires_string_field(field):
+    with pytest.raises(QueryDefinitionError):
+        await ormar_pg_ext.nearest(HostTestModel.objects, field, "1")
+
+
+@pytest.mark.asyncio
+async def test_nearest_uses_index(trgm_db):
+    await ormar_pg_ext.bulk_copy(
+        HostTestModel,
+        (HostTestModel(hostname=f"host-{i}.example.com") for i in range(5000)),
+    )
+    async with database.connection() as connection:
+        await connection.execute("VACUUM ANALYZE hosttestmodels")
+
+    expr = (
+        HostTestModel.objects.limit(5)
+        .build_select_expression()
+        .order_by(None)
+        .order_by(ormar_pg_ext.trgm_distance("hostname", "host-42.example.com"))
+        .compile(dialect=_dialect(), compile_kwargs={"literal_binds": True})
+    )
+    plan = await database.fetch_all(f"EXPLAIN {expr}")
+    assert "ix_hosttestmodels_hostname" in str([row[0] for row in plan])
@@ -0,0 +1,261 @@
+from typing import Optional
+
+import ormar
+import pytest
+from ormar import ModelDefinitionError
+from ormar.exceptions import QueryDefinitionError
+from sqlalchemy.dialects.postgresql import pypostgresql
+from sqlalchemy.schema import CreateTable
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields.tsvector import tsvector_bytes
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class ArticleTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    title: str = ormar.String(max_length=200)
+    body: Optional[str] = ormar.Text(nullable=True)
+    document: Optional[str] = ormar_pg_ext.TSVECTOR(
+        generated_from={"title": "A", "body": "B"}, index="gin"
+    )
+
+
+class TSVectorTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    document: Optional[str] = ormar_pg_ext.TSVECTOR(
+        config="simple", nullable=True, index="gin"
+    )
+
+
+def _dialect():
+    return pypostgresql.dialect(paramstyle="pyformat")
+
+
+def test_generated_column_ddl():
+    ddl = str(CreateTable(ArticleTestModel.Meta.table).compile(dialect=_dialect()))
+    assert (
+        "document TSVECTOR GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(body, '')), 'B')"
+        ") STORED"
+    ) in ddl
+
+
+def test_generated_column_from_list():
+    expression = ormar_pg_ext.tsvector_expression(["title", "body"], config="simple")
+    assert str(expression.compile(compile_kwargs={"literal_binds": True})) == (
+        "to_tsvector('simple'::regconfig, "
+        "coalesce(title, '') || ' ' || coalesce(body, ''))"
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(generated_from=[]),
+        dict(generated_from={"title": "E"}),
+        dict(generated_from=["title"], config="english'; --"),
+        dict(config="bad config"),
+        dict(generated_from=["title"], server_default="x"),
+    ],
+)
+def test_invalid_tsvector_field(kwargs):
+    with pytest.raises(ModelDefinitionError):
+        ormar_pg_ext.TSVECTOR(**kwargs)
+
+
+def test_match_clauses():
+    column = TSVectorTestModel.Meta.table.columns["document"]
+    clause = column.websearch_match("fox").compile(dialect=_dialect())
+    assert str(clause) == (
+        "tsvectortestmodels.document @@ "
+        "websearch_to_tsquery('simple'::regconfig, %(param_1)s)"
+    )
+    clause = column.plain_match("fox").compile(dialect=_dialect())
+    assert str(clause) == (
+        "tsvectortestmodels.document @@ "
+        "plainto_tsquery('simple'::regconfig, %(param_1)s)"
+    )
+
+
+def test_generated_column_not_written():
+    article = ArticleTestModel(id=1, title="a", document="'a':1")
+    values = article.prepare_model_to_update(article.dict())
+    assert values == {"id": 1, "title": "a", "body": None}
+
+
+def test_generated_column_compared_to_value():
+    expr = ArticleTestModel.objects.filter(
+        document="'fox':1A"
+    ).build_select_expression()
+    assert "articletestmodels.document = %(document_1)s" in str(
+        expr.compile(dialect=_dialect())
+    )
+
+
+@pytest.mark.asyncio
+async def test_generated_tsvector(db):
+    article = await ArticleTestModel(title="Quick brown fox", body=None).save()
+    assert article.document == "'brown':2A 'fox':3A 'quick':1A"
+
+    article.body = "jumps over the lazy dog"
+    await article.update()
+    await article.load()
+    assert "'dog':8B" in article.document
+
+    article.title = "Slow"
+    await article.update(_columns=["title"])
+    await article.load()
+    assert article.document == "'dog':6B 'jump':2B 'lazi':5B 'slow':1A"
+
+    found = await ArticleTestModel.objects.get(document=article.document)
+    assert found.id == article.id
+    await ArticleTestModel.objects.filter(id=article.id).update(
+        title="Fast", document="'x':1"
+    )
+    await article.load()
+    assert article.document == "'dog':6B 'fast':1A 'jump':2B 'lazi':5B"
+
+    await ArticleTestModel.objects.bulk_create(
+        [ArticleTestModel(title="Bulk", document="'x':1")]
+    )
+    bulk = await ArticleTestModel.objects.get(title="Bulk")
+    assert bulk.document == "'bulk':1A"
+    bulk.title = "Updated"
+    await ArticleTestModel.objects.bulk_update([bulk])
+    await bulk.load()
+    assert bulk.document == "'updat':1A"
+
+
+@pytest.mark.asyncio
+async def test_tsvector_match(db):
+    await ArticleTestModel(title="Quick brown fox", body="jumps").save()
+    await ArticleTestModel(title="Lazy dog", body="sleeps all day").save()
+    await ArticleTestModel(title="Foxes", body="the fox and the dog").save()
+
+    async def ids(**kwargs):
+        found = await ArticleTestModel.objects.filter(**kwargs).order_by("id").all()
+        return [obj.id for obj in found]
+
+    assert await ids(document__tsvector_match="fox") == [1, 3]
+    assert await ids(document__tsvector_match="foxes") == [1, 3]
+    assert await ids(document__tsvector_match='"brown fox"') == [1]
+    assert await ids(document__tsvector_match="dog -fox") == [2]
+    assert await ids(document__tsvector_match="quick or sleeps") == [1, 2]
+    assert await ids(document__tsvector_match_plain="fox dog") == [3]
+    assert await ids(document__tsvector_match_plain="quick or sleeps") == []
+
+
+@pytest.mark.asyncio
+async def test_tsvector_values(db):
+    await TSVectorTestModel(document="'fox':2 'quick':1").save()
+    await TSVectorTestModel().save()
+
+    found = await TSVectorTestModel.objects.get(document__tsvector_match="quick")
+    assert found.document == "'fox':2 'quick':1"
+    assert await TSVectorTestModel.objects.filter(document__isnull=True).count() == 1
+
+
+@pytest.mark.asyncio
+async def test_search_ranked(db):
+    await ArticleTestModel(title="Dogs", body="a fox chased the dog").save()
+    await ArticleTestModel(title="Fox", body="the fox").save()
+    await ArticleTestModel(title="Cats", body="no match").save()
+    await ArticleTestModel(title="Birds", body="one fox").save()
+
+    found = await ormar_pg_ext.search(ArticleTestModel.objects, "document", "fox")
+    # Matches in the title weigh more than the ones in the body
+    assert [obj.title for obj in found] == ["Fox", "Dogs", "Birds"]
+
+    found = await ormar_pg_ext.search(
+        ArticleTestModel.objects.order_by("-id").limit(2), "document", "fox"
+    )
+    assert [obj.title for obj in found] == ["Fox", "Dogs"]
+
+    found = await ormar_pg_ext.search(
+        ArticleTestModel.objects.filter(title__startswith="B"),
+        "document",
+        "fox",
+        plain=True,
+    )
+    assert [obj.title for obj in found] == ["Birds"]
+
+    ranks = await ormar_pg_ext.project(
+        ArticleTestModel.objects.order_by("id"),
+        "title",
+        rank=ormar_pg_ext.ts_rank(ArticleTestModel.Meta.table.c.document, "fox"),
+    )
+    assert ranks[2] == {"title": "Cats", "rank": 0}
+
+
+@pytest.mark.asyncio
+async def test_match_uses_index(db):
+    await ormar_pg_ext.bulk_copy(
+        ArticleTestModel,
+        (ArticleTestModel(title=f"article {i}", body=f"word{i}") for i in range(5000)),
+    )
+    # Rows added since the last vacuum sit in the pending list of the GIN index,
+    # which makes the planner prefer a sequential scan
+    async with database.connection() as connection:
+        await connection.execute("VACUUM ANALYZE articletestmodels")
+
+    expr = (
+        ArticleTestModel.objects.filter(document__tsvector_match="word42")
+        .build_select_expression()
+        .compile(dialect=_dialect(), compile_kwargs={"literal_binds": True})
+    )
+    plan = await database.fetch_all(f"EXPLAIN {expr}")
+    assert "ix_articletestmodels_document" in str([row[0] for row in plan])
+
+
+@pytest.mark.asyncio
+async def test_search_requires_tsvector_field(db):
+    with pytest.raises(QueryDefinitionError):
+        await ormar_pg_ext.search(ArticleTestModel.objects, "title", "fox")
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_tsvector(db):
+    values = ["'fox':2A 'quick':1", "a fat:2,1C cat:3 a:1B", "'it''s' 'back\\\\slash'"]
+    count = await ormar_pg_ext.bulk_copy(
+        TSVectorTestModel, [TSVectorTestModel(document=value) for value in values]
+    )
+    assert count == 3
+
+    found = await TSVectorTestModel.objects.order_by("id").all()
+    assert [obj.document for obj in found] == [
+        "'fox':2A 'quick':1",
+        "'a':1B 'cat':3 'fat':1C,2",
+        "'back\\\\slash' 'it''s'",
+    ]
+
+
+@pytest.mark.parametrize("value", ["'unterminated", "fox:0", "fox:x"])
+def test_invalid_tsvector_bytes(value):
+    with pytest.raises(ValueError):
+        tsvector_bytes(value)
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_generated_tsvector(db):
+    count = await ormar_pg_ext.bulk_copy(
+        ArticleTestModel,
+        [ArticleTestModel(title=f"title {i}", body="fox") for i in range(5)],
+    )
+    assert count == 5
+    assert (
+        await ArticleTestModel.objects.filter(document__tsvector_match="fox").count()
+        == 5
+    )
@@ -6,8 +6,10 @@ from uuid import (
 
 import ormar
 import pytest
+from ormar import ModelDefinitionError
 
 import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields.deferred import DeferrableFieldFactory
 from tests.database import (
     database,
     metadata,
@@ -32,6 +34,16 @@ class NullableUUIDTestModel(ormar.Model):
     uid: Optional[UUID] = ormar_pg_ext.UUID(nullable=True)
 
 
+class NativeUUIDTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    uid: UUID = ormar_pg_ext.UUID(default=uuid4, uuid_format="native")
+    other: UUID = ormar_pg_ext.UUID(default=uuid4, uuid_format="native")
+
+
 @pytest.mark.asyncio
 async def test_create_model_with_uuid_specified(db):
     created = await UUIDTestModel(uid="2b077a49-0dbe-4dd1-88a1-9aebe3cb7653").save()
@@ -68,3 +80,46 @@ async def test_get_model_with_nullable_uuid(db):
     # Ensure querying a model with a null UUID works
     found = await NullableUUIDTestModel.objects.get()
     assert found == created
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model", [UUIDTestModel, NativeUUIDTestModel])
+async def test_bulk_update_uuid(db, model):
+    await model.objects.bulk_create([model(), model()])
+    created = await model.objects.order_by("id").all()
+    for obj in created:
+        obj.uid = uuid4()
+
+    await model.objects.bulk_update(created, columns=["uid"])
+
+    found = await model.objects.order_by("id").all()
+    assert [obj.uid for obj in found] == [obj.uid for obj in created]
+
+
+@pytest.mark.asyncio
+async def test_native_uuid(db):
+    created = await NativeUUIDTestModel(
+        uid="2b077a49-0dbe-4dd1-88a1-9aebe3cb7653"
+    ).save()
+
+    found = await NativeUUIDTestModel.objects.get(uid=created.uid)
+    assert isinstance(found.uid, UUID)
+    assert found.uid == created.uid
+    assert NativeUUIDTestModel.parse_non_db_fields({"uid": found.uid}) == {
+        "uid": found.uid
+    }
+
+
+def test_unknown_uuid_format():
+    with pytest.raises(ModelDefinitionError):
+        ormar_pg_ext.UUID(uuid_format="bytes")
+
+
+def test_uuid_validation_chained():
+    class DeferrableUUID(ormar_pg_ext.UUID, DeferrableFieldFactory):
+        pass
+
+    with pytest.raises(ModelDefinitionError):
+        DeferrableUUID(uuid_format="bytes")
+    with pytest.raises(ModelDefinitionError):
+        DeferrableUUID(primary_key=True, deferred=True)
@@ -0,0 +1,130 @@
+from ipaddress import ip_interface
+
+import ormar
+import pytest
+import sqlalchemy
+
+import ormar_postgres_extensions as ormar_pg_ext
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class AdvisorTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.JSONB(index="gin", opclass="jsonb_path_ops")
+    tags: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String())
+    network: str = ormar_pg_ext.CIDR(index="gist")
+
+
+async def advise(*args, **kwargs):
+    queryset = AdvisorTestModel.objects.filter(*args, **kwargs)
+    return {
+        advice.operator: advice
+        for advice in await ormar_pg_ext.advise_indexes(queryset)
+    }
+
+
+@pytest.mark.asyncio
+async def test_missing_index(db):
+    advice = await advise(tags__array_overlap=["a"], id__gt=1)
+
+    assert list(advice) == ["array_overlap"]
+    assert advice["array_overlap"].indexes == []
+    assert advice["array_overlap"].plan_index is None
+    assert advice["array_overlap"].create_index == (
+        "CREATE INDEX ix_advisortestmodels_tags_gin ON advisortestmodels "
+        "USING gin (tags array_ops)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_existing_index(db):
+    advice = await advise(
+        AdvisorTestModel.network.contained_by(ip_interface("10.0.0.0/8")),
+        data__jsonb_contains={"a": 1},
+    )
+
+    assert advice["contained_by"].indexes == ["ix_advisortestmodels_network"]
+    assert advice["contained_by"].create_index is None
+    assert advice["jsonb_contains"].indexes == ["ix_advisortestmodels_data"]
+
+
+@pytest.mark.asyncio
+async def test_index_with_wrong_operator_class(db):
+    # jsonb_path_ops doesn't support the key operators
+    advice = await advise(data__jsonb_has_key="a")
+
+    assert advice["jsonb_has_key"].indexes == []
+    assert "USING gin (data jsonb_ops)" in advice["jsonb_has_key"].create_index
+
+
+@pytest.mark.asyncio
+async def test_operator_without_index(db):
+    advice = await advise(data__jsonb_contained_by={"a": 1})
+
+    assert advice["jsonb_contained_by"].indexes == []
+    assert advice["jsonb_contained_by"].create_index is None
+
+
+@pytest.mark.asyncio
+async def test_plan_index(db):
+    await AdvisorTestModel.objects.bulk_create(
+        [
+            AdvisorTestModel(
+                data={"a": i}, tags=[], network=ip_interface(f"10.{i % 256}.0.0/16")
+            )
+            for i in range(2000)
+        ]
+    )
+    async with database.connection() as connection:
+        await connection.execute("ANALYZE advisortestmodels")
+
+    advice = await advise(data__jsonb_contains={"a": 1}, tags__array_contains=["x"])
+
+    assert advice["jsonb_contains"].plan_index == "ix_advisortestmodels_data"
+    assert advice["array_contains"].plan_index is None
+    assert advice["array_contains"].create_index is not None
+
+
+@pytest.mark.asyncio
+async def test_no_extension_operators(db):
+    assert await advise(id=1) == {}
+
+
+class RangeAdvisorTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    ports: ormar_pg_ext.Range = ormar_pg_ext.INT4RANGE()
+    port_sets: list = ormar_pg_ext.INT4MULTIRANGE()
+
+
+@pytest.mark.asyncio
+async def test_index_for_column_type(db):
+    # Ranges and multiranges share the operators but not the operator classes
+    queryset = RangeAdvisorTestModel.objects.filter(
+        ports__range_overlap=(1, 5), port_sets__range_overlap=(1, 5)
+    )
+    advice = {
+        item.column: item.create_index
+        for item in await ormar_pg_ext.advise_indexes(queryset)
+    }
+
+    assert advice == {
+        "ports": (
+            "CREATE INDEX ix_rangeadvisortestmodels_ports_gist "
+            "ON rangeadvisortestmodels USING gist (ports range_ops)"
+        ),
+        "port_sets": (
+            "CREATE INDEX ix_rangeadvisortestmodels_port_sets_gist "
+            "ON rangeadvisortestmodels USING gist (port_sets multirange_ops)"
+        ),
+    }
@@ -0,0 +1,157 @@
+from ipaddress import (
+    IPv4Address,
+    IPv4Interface,
+    ip_address,
+    ip_interface,
+)
+from typing import Optional
+from uuid import (
+    UUID,
+    uuid4,
+)
+
+import asyncpg
+import databases
+import ormar
+import pytest
+import sqlalchemy
+from ormar.exceptions import QueryDefinitionError
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields.macaddr import macaddr_bytes
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class BulkTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    name: str = ormar.String(max_length=20)
+    data: dict = ormar_pg_ext.JSONB()
+    tags: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String())
+    inet: IPv4Address = ormar_pg_ext.INET()
+    cidr: IPv4Interface = ormar_pg_ext.CIDR()
+    mac: str = ormar_pg_ext.MACADDR()
+    mac8: str = ormar_pg_ext.MACADDR8()
+    uid: UUID = ormar_pg_ext.UUID(default=uuid4)
+    note: Optional[dict] = ormar_pg_ext.JSONB(nullable=True)
+
+
+def make_model(i: int, **kwargs) -> BulkTestModel:
+    return BulkTestModel(
+        name=f"row {i}",
+        data={"index": i, "nested": {"even": i % 2 == 0}},
+        tags=[f"tag-{i}", "all"],
+        inet=ip_address(f"10.0.0.{i}"),
+        cidr=ip_interface(f"10.0.{i}.0/24"),
+        mac=f"08:00:2b:01:02:{i:02x}",
+        mac8=f"08-00-2B-01-02-{i:02X}",
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy(db):
+    objects = [make_model(i) for i in range(1, 4)]
+
+    count = await ormar_pg_ext.bulk_copy(BulkTestModel, objects)
+    assert count == 3
+    assert all(obj.saved for obj in objects)
+
+    found = await BulkTestModel.objects.order_by("name").all()
+    assert len(found) == 3
+    for i, (obj, row) in enumerate(zip(objects, found), 1):
+        assert row.name == obj.name
+        assert row.data == obj.data
+        assert row.tags == obj.tags
+        assert row.inet == obj.inet
+        assert row.cidr == obj.cidr
+        assert row.mac == obj.mac
+        assert row.mac8 == obj.mac8 == f"08:00:2b:ff:fe:01:02:{i:02x}"
+        assert row.uid == obj.uid
+        assert row.note is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_generator(db):
+    count = await ormar_pg_ext.bulk_copy(
+        BulkTestModel, (make_model(i, note={"i": i}) for i in range(10))
+    )
+    assert count == 10
+
+    found = await BulkTestModel.objects.filter(
+        data__jsonb_contains={"nested": {"even": True}}
+    ).all()
+    assert len(found) == 5
+    assert (
+        await BulkTestModel.objects.filter(tags__array_contains=["all"]).count() == 10
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_with_primary_keys(db):
+    await ormar_pg_ext.bulk_copy(BulkTestModel, [make_model(1, id=10)])
+
+    found = await BulkTestModel.objects.get()
+    assert found.id == 10
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_empty(db):
+    assert await ormar_pg_ext.bulk_copy(BulkTestModel, []) == 0
+    assert await BulkTestModel.objects.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_mismatched_columns(db):
+    with pytest.raises(QueryDefinitionError):
+        await ormar_pg_ext.bulk_copy(
+            BulkTestModel, [make_model(1), make_model(2, id=10)]
+        )
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_failed_not_saved(db):
+    objects = [make_model(1, id=10), make_model(2, id=10)]
+    with pytest.raises(asyncpg.UniqueViolationError):
+        await ormar_pg_ext.bulk_copy(BulkTestModel, objects)
+    assert not any(obj.saved for obj in objects)
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_keeps_connection_codecs(db):
+    async with database.connection() as connection:
+        raw_connection = connection.raw_connection
+        await raw_connection.set_type_codec(
+            "macaddr",
+            encoder=macaddr_bytes,
+            decoder=lambda value: "decoded by the connection",
+            schema="pg_catalog",
+            format="binary",
+        )
+        try:
+            await ormar_pg_ext.bulk_copy(BulkTestModel, [make_model(1)])
+            # The codec of the connection was used and not reset by the COPY
+            mac = await raw_connection.fetchval("SELECT mac FROM bulktestmodels")
+            assert mac == "decoded by the connection"
+        finally:
+            await raw_connection.reset_type_codec("macaddr", schema="pg_catalog")
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_fallback_without_asyncpg(db, monkeypatch):
+    # Simulate a backend whose driver connection can't do a COPY
+    monkeypatch.setattr(
+        databases.core.Connection, "raw_connection", property(lambda self: object())
+    )
+
+    count = await ormar_pg_ext.bulk_copy(
+        BulkTestModel, [make_model(i) for i in range(5)], chunk_size=2
+    )
+    assert count == 5
+    assert await BulkTestModel.objects.count() == 5
@@ -0,0 +1,136 @@
+from ipaddress import ip_interface
+
+import ormar
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects.postgresql import pypostgresql
+
+import ormar_postgres_extensions as ormar_pg_ext
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class ClauseCacheTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.JSONB()
+    tags: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String())
+    network: str = ormar_pg_ext.CIDR()
+
+
+@pytest.fixture(autouse=True)
+def clause_cache():
+    ormar_pg_ext.clear_clause_cache()
+    yield
+    ormar_pg_ext.set_clause_cache_size(512)
+    ormar_pg_ext.clear_clause_cache()
+
+
+def compile_filter(**kwargs):
+    expr = ClauseCacheTestModel.objects.filter(**kwargs).build_select_expression()
+    return expr.compile(dialect=pypostgresql.dialect(paramstyle="pyformat"))
+
+
+def test_clause_cache_hits():
+    first = compile_filter(data__jsonb_contains={"a": 1})
+    assert ormar_pg_ext.clause_cache_info() == (0, 1, 512, 1)
+
+    second = compile_filter(data__jsonb_contains={"b": 2})
+    assert ormar_pg_ext.clause_cache_info() == (1, 1, 512, 1)
+
+    assert str(first) == str(second)
+    assert list(second.params.values()) == [{"b": 2}]
+
+
+def test_clause_cache_keyed_by_operator_and_shape():
+    compile_filter(tags__array_contains=["a"])
+    compile_filter(tags__array_overlap=["a"])
+    compile_filter(tags__array_overlap=("a", "b"))
+    compile_filter(data__jsonb_has_key="a")
+    assert ormar_pg_ext.clause_cache_info().misses == 4
+
+    compile_filter(tags__array_overlap=["b", "c"])
+    assert ormar_pg_ext.clause_cache_info().hits == 1
+
+
+def test_clause_cache_same_operator_twice():
+    # Warm up the cache so the second statement is built from cached clauses
+    compile_filter(
+        network__contained_by=ip_interface("10.0.0.0/8"),
+        network__contains_or_eq=ip_interface("10.1.0.0/16"),
+    )
+    compiled = compile_filter(
+        network__contained_by=ip_interface("10.0.0.0/8"),
+        network__contains_or_eq=ip_interface("10.1.0.0/16"),
+        tags__array_contains=["a"],
+    )
+    assert sorted(map(str, compiled.params.values())) == [
+        "10.0.0.0/8",
+        "10.1.0.0/16",
+        "['a']",
+    ]
+
+
+def test_clause_cache_skips_other_operators():
+    compile_filter(id=1)
+    compile_filter(tags__array_contains=sqlalchemy.func.array_agg("a"))
+    assert ormar_pg_ext.clause_cache_info() == (0, 0, 512, 0)
+
+
+def test_clause_cache_bounded():
+    ormar_pg_ext.set_clause_cache_size(2)
+    compile_filter(tags__array_contains=["a"])
+    compile_filter(tags__array_overlap=["a"])
+    compile_filter(data__jsonb_contains={"a": 1})
+    assert ormar_pg_ext.clause_cache_info().currsize == 2
+
+    # The least recently used clause was evicted
+    compile_filter(tags__array_contains=["a"])
+    assert ormar_pg_ext.clause_cache_info().hits == 0
+
+
+def test_clause_cache_disabled():
+    ormar_pg_ext.set_clause_cache_size(0)
+    compile_filter(tags__array_contains=["a"])
+    compile_filter(tags__array_contains=["a"])
+    assert ormar_pg_ext.clause_cache_info() == (0, 0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_clause_cache_queries(db):
+    await ClauseCacheTestModel(
+        data={"a": 1}, tags=["a"], network=ip_interface("10.0.0.0/24")
+    ).save()
+    await ClauseCacheTestModel(
+        data={"a": 2}, tags=["b"], network=ip_interface("10.1.0.0/24")
+    ).save()
+
+    for value, tag in [(1, "a"), (2, "b"), (1, "a")]:
+        found = await ClauseCacheTestModel.objects.get(
+            data__jsonb_contains={"a": value}
+        )
+        assert found.tags == [tag]
+
+    found = await ClauseCacheTestModel.objects.filter(
+        network__contained_by=ip_interface("10.1.0.0/16")
+    ).all()
+    assert [obj.data for obj in found] == [{"a": 2}]
+    assert ormar_pg_ext.clause_cache_info().hits == 2
+
+
+def test_clause_cache_removed():
+    ormar_pg_ext.remove_clause_cache()
+    try:
+        compiled = compile_filter(tags__array_contains=["a"])
+        assert list(compiled.params.values()) == [["a"]]
+        assert ormar_pg_ext.clause_cache_info() == (0, 0, 512, 0)
+    finally:
+        ormar_pg_ext.install_clause_cache()
+
+    compile_filter(tags__array_contains=["a"])
+    assert ormar_pg_ext.clause_cache_info() == (0, 1, 512, 1)
@@ -0,0 +1,122 @@
+import ormar
+import pytest
+import sqlalchemy
+from ormar.queryset import QuerySet
+from ormar.queryset.actions.filter_action import FilterAction
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions import instrumentation
+from ormar_postgres_extensions.instrumentation import QUERY_METHODS
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class InstrumentationTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    data: dict = ormar_pg_ext.JSONB()
+    tags: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String())
+
+
+@pytest.fixture()
+def metrics():
+    collector = ormar_pg_ext.MetricsCollector()
+    ormar_pg_ext.set_metrics_callback(collector)
+    yield collector
+    ormar_pg_ext.set_metrics_callback(None)
+
+
+async def create_models():
+    await InstrumentationTestModel(data={"a": 1}, tags=["x"]).save()
+    await InstrumentationTestModel(data={"a": 2}, tags=["x", "y"]).save()
+
+
+def test_operator_calls_counted(metrics):
+    InstrumentationTestModel.objects.filter(
+        data__jsonb_contains={"a": 1}, tags__array_overlap=["x"], id__gt=1
+    ).build_select_expression()
+    InstrumentationTestModel.objects.filter(
+        data__jsonb_contains={"a": 2}
+    ).build_select_expression()
+
+    assert metrics.counts == {
+        ("operator", "jsonb_contains"): 2,
+        ("operator", "array_overlap"): 1,
+    }
+
+
+def test_no_metrics_without_callback(metrics):
+    ormar_pg_ext.set_metrics_callback(None)
+    InstrumentationTestModel.objects.filter(
+        data__jsonb_contains={"a": 1}
+    ).build_select_expression()
+    assert not metrics.counts
+
+
+@pytest.mark.asyncio
+async def test_query_latency_per_operator(db, metrics):
+    await create_models()
+    metrics.clear()
+
+    found = await InstrumentationTestModel.objects.get(
+        data__jsonb_contains={"a": 2}, tags__array_overlap=["y"]
+    )
+    assert found.tags == ["x", "y"]
+    await InstrumentationTestModel.objects.filter(tags__array_contains=["x"]).count()
+    await InstrumentationTestModel.objects.all()
+
+    queries = {
+        name: count for (kind, name), count in metrics.counts.items() if kind == "query"
+    }
+    # The nested get() calls are timed once
+    assert queries == {"jsonb_contains": 1, "array_overlap": 1, "array_contains": 1}
+    assert metrics.durations[("query", "jsonb_contains")] > 0
+
+
+@pytest.mark.asyncio
+async def test_update_latency(db, metrics):
+    await create_models()
+    metrics.clear()
+
+    await InstrumentationTestModel.objects.filter(
+        data__jsonb_has_key="a", tags__array_contains=["y"]
+    ).update(tags=["z"])
+
+    assert metrics.counts[("query", "jsonb_has_key")] == 1
+    assert metrics.counts[("query", "array_contains")] == 1
+
+
+@pytest.mark.asyncio
+async def test_encode_decode_time(db, metrics):
+    await create_models()
+    assert metrics.counts[("encode", "JSONB")] == 2
+    assert metrics.counts[("encode", "ARRAY")] == 2
+
+    await InstrumentationTestModel.objects.all()
+    assert metrics.counts[("decode", "JSONB")] == 2
+    assert metrics.counts[("decode", "ARRAY")] == 2
+    assert metrics.durations[("decode", "JSONB")] > 0
+
+
+def test_queryset_patched_while_callback_set():
+    ormar_pg_ext.set_metrics_callback(None)
+    methods = dict(vars(QuerySet))
+    clause_module = FilterAction.get_text_clause.__module__
+
+    ormar_pg_ext.set_metrics_callback(ormar_pg_ext.MetricsCollector())
+    assert vars(QuerySet)["all"] is not methods["all"]
+    assert FilterAction.get_text_clause.__module__ == instrumentation.__name__
+
+    ormar_pg_ext.set_metrics_callback(None)
+    # Other patches of the same methods, e.g. of update, are chained again
+    assert all(
+        vars(QuerySet)[name].__module__ != instrumentation.__name__
+        for name in QUERY_METHODS
+    )
+    assert vars(QuerySet)["all"] is methods["all"]
+    assert FilterAction.get_text_clause.__module__ == clause_module
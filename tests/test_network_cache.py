@@ -0,0 +1,168 @@
+import random
+from ipaddress import (
+    IPv4Address,
+    IPv6Address,
+    ip_address,
+    ip_network,
+)
+from typing import Optional
+
+import ormar
+import pytest
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions import network_cache
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class NetworkCacheTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    name: str = ormar.String(max_length=100)
+    network: Optional[ormar_pg_ext.CompactIPAddress] = ormar_pg_ext.CIDR(
+        ip_decode="compact", nullable=True
+    )
+    gateway: Optional[str] = ormar_pg_ext.INET(nullable=True)
+
+
+async def create_networks(*networks):
+    await NetworkCacheTestModel.objects.bulk_create(
+        [
+            NetworkCacheTestModel(name=str(network), network=network)
+            for network in networks
+        ]
+    )
+
+
+async def contains_subnet_eq(address):
+    found = await NetworkCacheTestModel.objects.filter(
+        network__contains_subnet_eq=address
+    ).all()
+    return {obj.id for obj in found}
+
+
+@pytest.mark.asyncio
+async def test_longest_prefix_match(db):
+    await create_networks(
+        ip_network("10.0.0.0/8"),
+        ip_network("10.1.0.0/16"),
+        ip_network("10.1.2.0/24"),
+        ip_network("2001:db8::/32"),
+    )
+    cache = ormar_pg_ext.NetworkCache(NetworkCacheTestModel.objects, "network")
+    await cache.refresh()
+
+    assert cache.match(ip_address("10.1.2.3")).name == "10.1.2.0/24"
+    assert cache.match("10.1.3.3").name == "10.1.0.0/16"
+    assert cache.match(ip_address("10.2.0.1")).name == "10.0.0.0/8"
+    assert cache.match(ip_network("10.1.0.0/20")).name == "10.1.0.0/16"
+    assert cache.match(ip_address("2001:db8::1")).name == "2001:db8::/32"
+    assert cache.match(ip_address("192.168.0.1")) is None
+    assert cache.match(ip_address("::ffff:10.1.2.3")) is None
+    assert [obj.name for obj in cache.match_all(ip_address("10.1.2.3"))] == [
+        "10.1.2.0/24",
+        "10.1.0.0/16",
+        "10.0.0.0/8",
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("version", [4, 6])
+async def test_matches_contains_subnet_eq(db, version):
+    rng = random.Random(version)
+    address_class = IPv4Address if version == 4 else IPv6Address
+    max_length = 32 if version == 4 else 128
+    # Prefixes of a few base addresses so that many networks are nested, some of
+    # them more than once
+    bases = [address_class(rng.getrandbits(max_length)) for _ in range(4)]
+    networks = [
+        ip_network(f"{rng.choice(bases)}/{rng.randint(0, max_length)}", strict=False)
+        for _ in range(60)
+    ]
+    await create_networks(*networks)
+    await NetworkCacheTestModel(name="none").save()
+
+    cache = ormar_pg_ext.NetworkCache(NetworkCacheTestModel.objects, "network")
+    await cache.refresh()
+
+    addresses = [
+        *bases,
+        *(address_class(rng.getrandbits(max_length)) for _ in range(20)),
+    ]
+    for base in bases:
+        addresses.extend(
+            address_class(int(base) ^ (1 << rng.randrange(max_length)))
+            for _ in range(10)
+        )
+    for address in addresses:
+        expected = await contains_subnet_eq(address)
+        matches = cache.match_all(address)
+        assert {obj.id for obj in matches} == expected
+
+        best = cache.match(address)
+        if not expected:
+            assert best is None
+            continue
+        assert best.network.prefixlen == max(obj.network.prefixlen for obj in matches)
+
+
+@pytest.mark.asyncio
+async def test_inet_field(db):
+    await NetworkCacheTestModel(name="host", gateway="10.0.0.1/24").save()
+    cache = ormar_pg_ext.NetworkCache(NetworkCacheTestModel.objects, "gateway")
+
+    # Like `>>=` only the network part of an inet value counts
+    assert (await cache.lookup(ip_address("10.0.0.200"))).name == "host"
+    assert await cache.lookup(ip_address("10.0.1.1")) is None
+
+
+@pytest.mark.asyncio
+async def test_explicit_refresh(db):
+    await create_networks(ip_network("10.0.0.0/8"))
+    cache = ormar_pg_ext.NetworkCache(
+        NetworkCacheTestModel.objects.filter(name__startswith="10."), "network"
+    )
+    assert cache.match(ip_address("10.1.2.3")) is None
+
+    assert (await cache.lookup(ip_address("10.1.2.3"))).name == "10.0.0.0/8"
+    await create_networks(ip_network("10.1.0.0/16"), ip_network("192.168.0.0/16"))
+    # Without a ttl the rows are only loaded again on request
+    assert (await cache.lookup(ip_address("10.1.2.3"))).name == "10.0.0.0/8"
+
+    await cache.refresh()
+    assert (await cache.lookup(ip_address("10.1.2.3"))).name == "10.1.0.0/16"
+    # The filters of the queryset are kept
+    assert await cache.lookup(ip_address("192.168.0.1")) is None
+
+
+@pytest.mark.asyncio
+async def test_ttl_refresh(db, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(network_cache, "monotonic", lambda: now)
+    await create_networks(ip_network("10.0.0.0/8"))
+    cache = ormar_pg_ext.NetworkCache(NetworkCacheTestModel.objects, "network", ttl=60)
+
+    assert (await cache.lookup(ip_address("10.1.2.3"))).name == "10.0.0.0/8"
+    await create_networks(ip_network("10.1.0.0/16"))
+
+    now += 59
+    assert not cache.expired
+    assert (await cache.lookup(ip_address("10.1.2.3"))).name == "10.0.0.0/8"
+
+    now += 1
+    assert cache.expired
+    assert (await cache.lookup(ip_address("10.1.2.3"))).name == "10.1.0.0/16"
+    assert cache.loaded_at == now
+
+
+def test_not_a_network_field():
+    with pytest.raises(ormar.exceptions.QueryDefinitionError):
+        ormar_pg_ext.NetworkCache(NetworkCacheTestModel.objects, "name")
+    with pytest.raises(ormar.exceptions.QueryDefinitionError):
+        ormar_pg_ext.NetworkCache(NetworkCacheTestModel.objects, "missing")
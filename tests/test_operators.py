@@ -0,0 +1,128 @@
+import subprocess
+import sys
+from ipaddress import ip_address
+
+import ormar
+import pytest
+import sqlalchemy
+from ormar.queryset.actions.filter_action import FILTER_OPERATORS
+
+import ormar_postgres_extensions as ormar_pg_ext
+from ormar_postgres_extensions.fields import array as array_field
+from ormar_postgres_extensions.operators import (
+    installed_modules,
+    register_operators,
+)
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class OperatorTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    tags: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String())
+    network: str = ormar_pg_ext.CIDR()
+    data: dict = ormar_pg_ext.JSONB(nullable=True)
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+
+def test_operators_registered():
+    operators = ormar_pg_ext.registered_operators()
+    assert operators["array_overlap"].comparator == "overlap"
+    assert operators["jsonb_has_key"].module == "jsonb"
+    assert operators["contains_subnet_eq"].module == "inet"
+
+
+def test_operators_installed_by_fields():
+    assert installed_modules() >= {"array", "inet", "jsonb"}
+    assert FILTER_OPERATORS["array_contains"] == "contains"
+    assert FILTER_OPERATORS["contained_by_eq"] == "contained_by_eq"
+
+
+def test_field_accessor_methods():
+    ormar_pg_ext.install_operators()
+    for name in ormar_pg_ext.registered_operators():
+        group = getattr(OperatorTestModel.tags, name)(["a"])
+        assert group._kwargs_dict == {f"tags__{name}": ["a"]}
+
+
+def test_operators_not_installed_on_import():
+    modules = run_python(
+        "import ormar_postgres_extensions.fields.jsonb;"
+        "from ormar_postgres_extensions.operators import installed_modules;"
+        "print(*sorted(installed_modules()) or ['none'])"
+    )
+    assert modules == ["none"]
+
+
+def test_single_field_import():
+    modules = run_python(
+        "import sys; from ormar_postgres_extensions import UUID;"
+        "print(*sorted(m for m in sys.modules if 'ormar_postgres' in m))"
+    )
+    assert "ormar_postgres_extensions.fields.uuid" in modules
+    assert "ormar_postgres_extensions.fields.jsonb" not in modules
+    assert "ormar_postgres_extensions.bulk" not in modules
+
+
+def test_bulk_import():
+    modules = run_python(
+        "import sys; from ormar_postgres_extensions import bulk_copy;"
+        "print(*sorted(m for m in sys.modules if 'ormar_postgres' in m))"
+    )
+    assert "ormar_postgres_extensions.bulk" in modules
+    assert "ormar_postgres_extensions.fields.hstore" not in modules
+    assert "ormar_postgres_extensions.fields.tsvector" not in modules
+
+
+def test_operator_conflict_between_modules():
+    with pytest.raises(ormar_pg_ext.OperatorConflictError, match="array"):
+        register_operators(
+            "other",
+            [("array_overlap", array_field.array_overlap)],
+            [("array_overlap", "contains")],
+        )
+    assert ormar_pg_ext.registered_operators()["array_overlap"].module == "array"
+
+
+def test_operator_conflict_with_ormar():
+    with pytest.raises(ormar_pg_ext.OperatorConflictError, match="ormar"):
+        register_operators(
+            "other", [("startswith", array_field.array_overlap)], [("startswith", "")]
+        )
+    assert "startswith" not in ormar_pg_ext.registered_operators()
+
+
+def test_same_operator_from_another_module():
+    register_operators(
+        "array_copy",
+        [("array_contains", array_field.array_contains)],
+        [("array_contains", "contains")],
+    )
+    assert ormar_pg_ext.registered_operators()["array_contains"].module == "array"
+
+
+def test_install_unknown_module():
+    with pytest.raises(KeyError):
+        ormar_pg_ext.install_operators("unknown")
+
+
+@pytest.mark.asyncio
+async def test_contains_subnet_field_accessor(db):
+    await OperatorTestModel(tags=[], network="10.0.0.0/24").save()
+    await OperatorTestModel(tags=[], network="10.1.0.0/24").save()
+
+    found = await OperatorTestModel.objects.filter(
+        OperatorTestModel.network.contains_subnet(ip_address("10.1.0.1"))
+    ).all()
+    assert [str(obj.network) for obj in found] == ["10.1.0.0/24"]
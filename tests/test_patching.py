@@ -0,0 +1,62 @@
+from ormar_postgres_extensions.patching import Patch
+
+
+class Target:
+    def method(self):
+        return ["method"]
+
+    @classmethod
+    def build(cls):
+        return ["build"]
+
+
+def _append(name):
+    def wrap(function):
+        def wrapper(*args, **kwargs):
+            return function(*args, **kwargs) + [name]
+
+        return wrapper
+
+    return wrap
+
+
+def test_patch_install_and_remove():
+    original = vars(Target)["method"]
+    patch = Patch(Target, "method", _append("patch"))
+    patch.install()
+    patch.install()
+    assert patch.installed
+    assert Target().method() == ["method", "patch"]
+
+    patch.remove()
+    assert not patch.installed
+    assert vars(Target)["method"] is original
+    assert Target().method() == ["method"]
+
+
+def test_patch_classmethod():
+    patch = Patch(Target, "build", _append("patch"))
+    patch.install()
+    assert Target.build() == ["build", "patch"]
+    patch.remove()
+    assert Target.build() == ["build"]
+    assert isinstance(vars(Target)["build"], classmethod)
+
+
+def test_patches_chained_by_order():
+    original = vars(Target)["method"]
+    outer = Patch(Target, "method", _append("outer"), order=1)
+    inner = Patch(Target, "method", _append("inner"))
+    outer.install()
+    inner.install()
+    assert Target().method() == ["method", "inner", "outer"]
+
+    inner.remove()
+    assert Target().method() == ["method", "outer"]
+    inner.install()
+    assert Target().method() == ["method", "inner", "outer"]
+
+    outer.remove()
+    assert Target().method() == ["method", "inner"]
+    inner.remove()
+    assert vars(Target)["method"] is original
@@ -0,0 +1,228 @@
+from ipaddress import (
+    IPv4Interface,
+    ip_address,
+    ip_interface,
+)
+from typing import Optional
+
+import ormar
+import pytest
+import sqlalchemy
+from ormar.exceptions import QueryDefinitionError
+
+import ormar_postgres_extensions as ormar_pg_ext
+from tests.database import (
+    database,
+    metadata,
+)
+
+
+class ProjectTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    name: str = ormar.String(max_length=20, name="display_name")
+    data: dict = ormar_pg_ext.JSONB()
+    tags: Optional[list] = ormar_pg_ext.ARRAY(
+        item_type=sqlalchemy.String(), nullable=True
+    )
+
+
+class ProjectChildTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    parent: Optional[ProjectTestModel] = ormar.ForeignKey(
+        ProjectTestModel, related_name="children"
+    )
+    tags: list = ormar_pg_ext.ARRAY(item_type=sqlalchemy.String())
+    data: Optional[dict] = ormar_pg_ext.JSONB(nullable=True)
+
+
+class NetworkTestModel(ormar.Model):
+    class Meta:
+        database = database
+        metadata = metadata
+
+    id: int = ormar.Integer(primary_key=True)
+    name: str = ormar.String(max_length=20)
+    network: IPv4Interface = ormar_pg_ext.CIDR(index="gist")
+
+
+@pytest.mark.asyncio
+async def test_project_fields(db):
+    await ProjectTestModel(name="first", data=dict(a=1)).save()
+    await ProjectTestModel(name="second", data=dict(a=2)).save()
+
+    found = await ormar_pg_ext.project(
+        ProjectTestModel.objects.order_by("-id"), "id", "name"
+    )
+    assert found == [{"id": 2, "name": "second"}, {"id": 1, "name": "first"}]
+
+
+@pytest.mark.asyncio
+async def test_project_requires_columns(db):
+    with pytest.raises(ValueError):
+        await ormar_pg_ext.project(ProjectTestModel.objects)
+
+
+@pytest.mark.asyncio
+async def test_project_expressions_with_related(db):
+    parent = await ProjectTestModel(name="parent", data=dict(a="parent")).save()
+    await ProjectChildTestModel(parent=parent, tags=[], data=dict(a="child")).save()
+
+    found = await ormar_pg_ext.project(
+        ProjectTestModel.objects.select_related("children"),
+        "name",
+        a=ormar_pg_ext.jsonb_path("data", "a", as_text=True),
+        merged=ormar_pg_ext.jsonb_merge("data", dict(b=1)),
+    )
+    assert found == [{"name": "parent", "a": "parent", "merged": dict(a="parent", b=1)}]
+
+
+@pytest.mark.asyncio
+async def test_project_array_expressions_with_related(db):
+    parent = await ProjectTestModel(name="parent", data={}, tags=["a", "b"]).save()
+    await ProjectChildTestModel(parent=parent, tags=["c"]).save()
+
+    found = await ormar_pg_ext.project(
+        ProjectTestModel.objects.select_related("children"),
+        count=ormar_pg_ext.cardinality("tags"),
+        position=ormar_pg_ext.array_position("tags", "b"),
+        appended=ormar_pg_ext.array_append("tags", "d"),
+    )
+    assert found == [{"count": 2, "position": 2, "appended": ["a", "b", "d"]}]
+
+
+@pytest.mark.asyncio
+async def test_lookup_networks(db):
+    await NetworkTestModel(name="private", network=ip_interface("10.0.0.0/8")).save()
+    await NetworkTestModel(name="office", network=ip_interface("10.1.0.0/16")).save()
+    await NetworkTestModel(name="other", network=ip_interface("192.168.0.0/16")).save()
+
+    addresses = [ip_address("10.1.2.3"), ip_address("10.2.0.1"), ip_address("8.8.8.8")]
+    found = await ormar_pg_ext.lookup_networks(
+        NetworkTestModel.objects.order_by("id"), "network", addresses
+    )
+
+    assert list(found) == addresses
+    assert [m.name for m in found[addresses[0]]] == ["private", "office"]
+    assert [m.name for m in found[addresses[1]]] == ["private"]
+    assert found[addresses[2]] == []
+
+    # Matches are the same as filtering one address at a time
+    for address, models in found.items():
+        expected = (
+            await NetworkTestModel.objects.order_by("id")
+            .filter(network__contains_subnet_eq=address)
+            .all()
+        )
+        assert models == expected
+
+
+@pytest.mark.asyncio
+async def test_lookup_networks_keeps_filters(db):
+    await NetworkTestModel(name="private", network=ip_interface("10.0.0.0/8")).save()
+    await NetworkTestModel(name="office", network=ip_interface("10.1.0.0/16")).save()
+
+    found = await ormar_pg_ext.lookup_networks(
+        NetworkTestModel.objects.filter(name="office"),
+        "network",
+        ["10.1.0.1", "10.1.0.1", "10.2.0.1"],
+    )
+    assert {address: [m.name for m in models] for address, models in found.items()} == {
+        "10.1.0.1": ["office"],
+        "10.2.0.1": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_lookup_networks_empty(db):
+    assert (
+        await ormar_pg_ext.lookup_networks(NetworkTestModel.objects, "network", [])
+        == {}
+    )
+
+
+async def collect_batches(queryset, batch_size):
+    return [
+        batch
+        async for batch in ormar_pg_ext.iterate_batches(queryset, batch_size=batch_size)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iterate_batches(db):
+    await ProjectTestModel.objects.bulk_create(
+        [ProjectTestModel(name=f"item-{i}", data=dict(i=i)) for i in range(7)]
+    )
+
+    batches = await collect_batches(
+        ProjectTestModel.objects.filter(data__jsonb_has_key="i").order_by("id"), 3
+    )
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [obj.data for batch in batches for obj in batch] == [
+        dict(i=i) for i in range(7)
+    ]
+    assert batches[0][0].name == "item-0"
+
+
+@pytest.mark.asyncio
+async def test_iterate_batches_empty(db):
+    assert await collect_batches(ProjectTestModel.objects, 10) == []
+
+
+@pytest.mark.asyncio
+async def test_iterate_batches_select_related(db):
+    for i in range(3):
+        parent = await ProjectTestModel(name=f"parent-{i}", data={}).save()
+        for j in range(3):
+            await ProjectChildTestModel(parent=parent, tags=[f"{i}-{j}"]).save()
+
+    # A batch of 2 rows never holds all the rows of a parent
+    batches = await collect_batches(
+        ProjectTestModel.objects.select_related("children").order_by(
+            ["id", "children__id"]
+        ),
+        2,
+    )
+    parents = [obj for batch in batches for obj in batch]
+    assert [obj.name for obj in parents] == ["parent-0", "parent-1", "parent-2"]
+    assert [[child.tags for child in obj.children] for obj in parents] == [
+        [[f"{i}-{j}"] for j in range(3)] for i in range(3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iterate_batches_closed_early(db):
+    await ProjectTestModel.objects.bulk_create(
+        [ProjectTestModel(name=f"item-{i}", data={}) for i in range(5)]
+    )
+
+    batches = ormar_pg_ext.iterate_batches(ProjectTestModel.objects.order_by("id"), 2)
+    try:
+        async for batch in batches:
+            break
+    finally:
+        await batches.aclose()
+
+    assert [obj.name for obj in batch] == ["item-0", "item-1"]
+    # The transaction ended and closed the cursor
+    assert (
+        await database.fetch_val(
+            "SELECT count(*) FROM pg_cursors WHERE name LIKE 'ormar_pg_ext_cursor_%'"
+        )
+        == 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_iterate_batches_invalid(db):
+    with pytest.raises(ValueError):
+        await collect_batches(ProjectTestModel.objects, 0)
+    with pytest.raises(QueryDefinitionError):
+        await collect_batches(ProjectTestModel.objects.prefetch_related("children"), 1)